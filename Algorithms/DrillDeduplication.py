@@ -0,0 +1,74 @@
+"""
+Created on 19.10.2026
+"""
+
+import numpy as np
+
+
+def deduplicate(sizes, positions, tolerance):
+    """
+    Merges coincident drills, e.g. stacked vias or holes under pads. Drills are merged into the earliest
+    cluster whose first drill is within the tolerance of the drill's center. Each cluster is
+    replaced by its largest drill, the clusters keep the order of their first drills.
+
+    The drill centers are hashed into a grid with the tolerance as cell size, so only the drills in the
+    3x3 neighboring cells have to be compared. Drills without other drills in their neighboring cells
+    are sorted out beforehand at once.
+
+    :param np.array sizes: (n,) drill sizes
+    :param np.array positions: (n, 2) drill positions
+    :param float tolerance: Maximum distance of coincident drills
+    :returns: drill sizes (m,), drill positions (m, 2) and the number of removed drills (n-m)
+    :rtype: tuple(np.array, np.array, int)
+    """
+    if len(sizes) < 2 or tolerance <= 0:
+        return sizes, positions, 0
+    # cell keys, the cell indices start at 1 so the neighbors of all cells have valid keys
+    cells = np.floor(positions / tolerance).astype(np.int64)
+    cells -= cells.min(axis=0) - 1
+    width = cells[:, 1].max() + 2
+    keys = cells[:, 0]*width + cells[:, 1]
+    # drills sharing their cell or with drills in the neighboring cells (counted on the sorted occupied cells)
+    occupied, inverse, counts = np.unique(keys, return_inverse=True, return_counts=True)
+    crowded = counts > 1
+    for dx in (-1, 0, 1):
+        neighbors = (np.searchsorted(occupied, occupied + dx*width + 2)
+                     - np.searchsorted(occupied, occupied + dx*width - 1))
+        if dx == 0:
+            neighbors -= 1
+        crowded |= neighbors > 0
+    crowded = crowded[inverse.reshape(-1)]
+    candidates = np.nonzero(crowded)[0]
+    if len(candidates) == 0:
+        return sizes, positions, 0
+
+    grid = {}
+    # first drill (cluster center) and largest drill of each cluster
+    firsts = []
+    representatives = []
+    squared = tolerance**2
+    points = positions.tolist()
+    neighbors = [dx*int(width) + dy for dx in (-1, 0, 1) for dy in (-1, 0, 1)]
+    for index, key in zip(candidates.tolist(), keys[candidates].tolist()):
+        x, y = points[index]
+        # the earliest cluster within the tolerance
+        cluster = None
+        for neighbor in neighbors:
+            for candidate in grid.get(key + neighbor, ()):
+                cx, cy = points[firsts[candidate]]
+                if (x-cx)**2 + (y-cy)**2 <= squared and (cluster is None or candidate < cluster):
+                    cluster = candidate
+        if cluster is None:
+            grid.setdefault(key, []).append(len(firsts))
+            firsts.append(index)
+            representatives.append(index)
+        elif sizes[index] > sizes[representatives[cluster]]:
+            representatives[cluster] = index
+    removed = len(candidates) - len(firsts)
+    if removed == 0:
+        return sizes, positions, 0
+    # merge the clusters with the isolated drills in the order of their first drills
+    isolated = np.nonzero(~crowded)[0]
+    order = np.argsort(np.concatenate((isolated, firsts)), kind='stable')
+    keep = np.concatenate((isolated, representatives))[order]
+    return sizes[keep], positions[keep], removed
@@ -0,0 +1,341 @@
+"""
+Created on 19.10.2026
+
+Cycle time estimation for planned g-code programs.
+"""
+
+#initialize logging
+import logging
+logger = logging.getLogger(__name__)
+
+import re
+import numpy as np
+
+
+# g-code word letters (followed by a number, e.g. "x" in "g1f60x-1.25y3") and line breaks
+_LETTER = re.compile(r'[a-z](?=[-+]?\.?\d)|\n')
+# g-code word numbers (preceded by a letter, e.g. "-1.25" in "g1f60x-1.25y3")
+_NUMBER = re.compile(r'(?<=[a-z])[-+]?(?:\d+\.?\d*|\.\d+)')
+
+# g-codes with coordinate words which do not describe a motion (offsets, homing, dwell)
+_SETUPCODES = (4, 10, 28, 28.1, 28.2, 28.3, 30, 92)
+
+# phase identifiers used for the per-phase breakdown
+PHASES = ('drilling', 'milling', 'jogging', 'zmoves')
+
+
+def _forwardFill(values, mask, initial):
+    """
+    Propagates the entries of values where mask is set to the following entries.
+
+    :param np.ndarray values: values to propagate
+    :param np.ndarray mask: positions of valid entries
+    :param initial: value used before the first valid entry
+    :returns: filled array
+    :rtype: np.ndarray
+    """
+    index = np.where(mask, np.arange(len(values)), -1)
+    np.maximum.accumulate(index, out=index)
+    return np.where(index >= 0, values[np.maximum(index, 0)], initial)
+
+
+def parseProgram(program, start=(0, 0, 0)):
+    """
+    Walks a g-code program and extracts all motion segments.
+    Supports the subset of g-code used by the machine planners (G0/G1/G2/G3 in the XY plane,
+    G90/G91 distance modes and modal feed rates). All other commands are skipped.
+
+    The program is tokenized in a single pass, modal states and positions are then
+    propagated for all lines at once.
+
+    :param program: g-code lines
+    :type program: iterable(str)
+    :param start: (x, y, z) start position of the tool
+    :type start: tuple(float, float, float)
+    :returns: Dictionary of arrays with one entry per motion segment:
+              {"start": (n,3) start points, "end": (n,3) end points, "center": (n,2) arc centers,
+              "mode": (n,) motion mode 0-3, "feed": (n,) feed rate in mm/min (inf for rapid moves)}
+    :rtype: dict
+    """
+    text = "\n".join(program).lower().replace(" ", "").replace("\t", "") + "\n"
+    tokens = np.frombuffer("".join(_LETTER.findall(text)).encode('ascii'), dtype=np.uint8)
+    values = np.array(_NUMBER.findall(text), dtype=float)
+    newline = tokens == ord("\n")
+    nlines = int(np.count_nonzero(newline))
+    words = ~newline
+    lines = (np.cumsum(newline) - newline)[words]
+    letters = tokens[words]
+
+    def lineValues(letter, default=np.nan):
+        result = np.full(nlines, default, dtype=float)
+        select = letters == ord(letter)
+        result[lines[select]] = values[select]
+        return result
+
+    gcodes = letters == ord('g')
+    glines = lines[gcodes]
+    gvalues = values[gcodes]
+    # modal motion mode, distance mode and feed rate
+    motion = np.isin(gvalues, (0, 1, 2, 3))
+    modes = np.full(nlines, -1.0)
+    modes[glines[motion]] = gvalues[motion]
+    mode = _forwardFill(modes, modes >= 0, 0).astype(int)
+    distance = np.full(nlines, -1.0)
+    distmodes = np.isin(gvalues, (90, 91))
+    distance[glines[distmodes]] = gvalues[distmodes]
+    absolute = _forwardFill(distance, distance >= 0, 90) == 90
+    setup = np.zeros(nlines, dtype=bool)
+    setup[glines[np.isin(gvalues, _SETUPCODES)]] = True
+    feeds = lineValues('f')
+    feed = _forwardFill(feeds, ~np.isnan(feeds), np.inf)
+    offset = np.stack((lineValues('i', 0), lineValues('j', 0)), axis=1)
+
+    axes = [lineValues(letter) for letter in 'xyz']
+    present = np.stack([~np.isnan(axis) for axis in axes], axis=1)
+    # arcs without end point are full circles
+    fullcircle = (mode >= 2) & np.any(offset != 0, axis=1)
+    moving = (np.any(present, axis=1) | fullcircle) & ~setup
+
+    # absolute coordinates reset an axis, incremental coordinates accumulate
+    position = np.empty((nlines, 3))
+    indices = np.arange(nlines)
+    for i, axis in enumerate(axes):
+        reset = present[:, i] & absolute & moving
+        increments = np.where(present[:, i] & ~absolute & moving, axis, 0)
+        accumulated = np.cumsum(increments)
+        last = np.where(reset, indices, -1)
+        np.maximum.accumulate(last, out=last)
+        lastindex = np.maximum(last, 0)
+        base = np.where(last >= 0, axis[lastindex], float(start[i]))
+        position[:, i] = base + accumulated - np.where(last >= 0, accumulated[lastindex], 0)
+
+    previous = np.vstack((np.array(start, dtype=float).reshape(1, 3), position[:-1]))
+    segmentstart = previous[moving]
+    segmentmode = mode[moving]
+    return {
+        'start':segmentstart,
+        'end':position[moving],
+        'center':segmentstart[:, :2] + offset[moving],
+        'mode':segmentmode,
+        'feed':np.where(segmentmode == 0, np.inf, feed[moving])
+    }
+
+
+def segmentGeometry(segments):
+    """
+    Calculates length and entry/exit tangents of all motion segments.
+
+    :param dict segments: Segments as returned by :func:`parseProgram`
+    :returns: (lengths, entry tangents, exit tangents, axis direction magnitudes),
+              tangents and directions are (n,3) arrays
+    :rtype: tuple(np.ndarray, np.ndarray, np.ndarray, np.ndarray)
+    """
+    start = segments['start']
+    end = segments['end']
+    delta = end - start
+    lengths = np.linalg.norm(delta, axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        tangent = np.where(lengths[:, None] > 0, delta / lengths[:, None], 0)
+    entry = tangent.copy()
+    exit = tangent.copy()
+    direction = np.abs(tangent)
+
+    arcs = np.nonzero(segments['mode'] >= 2)[0]
+    if len(arcs):
+        ccw = segments['mode'][arcs] == 3
+        rs = start[arcs, :2] - segments['center'][arcs]
+        re_ = end[arcs, :2] - segments['center'][arcs]
+        radius = np.linalg.norm(rs, axis=1)
+        a0 = np.arctan2(rs[:, 1], rs[:, 0])
+        a1 = np.arctan2(re_[:, 1], re_[:, 0])
+        sweep = np.where(ccw, a1 - a0, a0 - a1) % (2*np.pi)
+        # identical start and end points describe a full circle
+        sweep[sweep < 1e-9] = 2*np.pi
+        dz = delta[arcs, 2]
+        arclengths = np.hypot(radius*sweep, dz)
+        lengths[arcs] = arclengths
+        # tangents are perpendicular to the radius vectors
+        sign = np.where(ccw, 1.0, -1.0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            planar = np.where(arclengths > 0, radius*sweep/arclengths, 0)
+            vertical = np.where(arclengths > 0, dz/arclengths, 0)
+            for tangents, rvec in ((entry, rs), (exit, re_)):
+                norm = np.where(radius > 0, radius, 1)
+                tangents[arcs, 0] = -sign*rvec[:, 1]/norm*planar
+                tangents[arcs, 1] = sign*rvec[:, 0]/norm*planar
+                tangents[arcs, 2] = vertical
+        # an arc may use the full feed rate of both planar axes
+        direction[arcs, 0] = planar
+        direction[arcs, 1] = planar
+        direction[arcs, 2] = np.abs(vertical)
+    return lengths, entry, exit, direction
+
+
+def axisLimit(direction, limits):
+    """
+    Projects per axis limits (e.g. maximum feed or jerk) onto the given motion directions.
+    The resulting limit is the largest value along the path which does not exceed any axis limit.
+
+    :param direction: (n,3) array of absolute direction components
+    :type direction: np.ndarray(float)
+    :param limits: (x, y, z) axis limits
+    :type limits: tuple(float, float, float)
+    :returns: limit along each path
+    :rtype: np.ndarray(float)
+    """
+    limits = np.asarray(limits, dtype=float)
+    with np.errstate(divide='ignore'):
+        perAxis = np.where(direction > 1e-12, limits / direction, np.inf)
+    return np.min(perAxis, axis=1)
+
+
+def junctionVelocities(exit, entry, cruise, deviation, acceleration):
+    """
+    Calculates the maximal velocities at the junctions between consecutive segments using the
+    junction deviation model (as used by the TinyG and Grbl planners).
+
+    :param np.ndarray exit: (n,3) exit tangents
+    :param np.ndarray entry: (n,3) entry tangents
+    :param np.ndarray cruise: (n,) cruise velocities in mm/s
+    :param float deviation: junction deviation in mm
+    :param float acceleration: junction (centripetal) acceleration in mm/s^2
+    :returns: (n+1,) junction velocities in mm/s, the first and last entries are zero
+    :rtype: np.ndarray(float)
+    """
+    vj = np.zeros(len(cruise)+1)
+    if len(cruise) < 2:
+        return vj
+    cosTheta = -np.sum(exit[:-1] * entry[1:], axis=1)
+    sinHalf = np.sqrt(np.clip((1 - cosTheta)/2, 0, 1))
+    with np.errstate(divide='ignore'):
+        limit = np.where(sinHalf < 1-1e-9,
+                         np.sqrt(acceleration*deviation*sinHalf/np.maximum(1-sinHalf, 1e-12)), np.inf)
+    vj[1:-1] = np.minimum(limit, np.minimum(cruise[:-1], cruise[1:]))
+    return vj
+
+
+def profileTimes(lengths, v0, vc, v1, jerk):
+    """
+    Vectorized calculation of segment durations for jerk limited (S-curve) velocity profiles
+    with constant jerk and without an acceleration limit.
+    Accelerating from v0 to v takes 2*sqrt((v-v0)/jerk) and covers (v+v0)*sqrt((v-v0)/jerk).
+    If a segment is too short to reach its cruise velocity the peak velocity is reduced.
+
+    :param np.ndarray lengths: segment lengths in mm
+    :param np.ndarray v0: entry velocities in mm/s
+    :param np.ndarray vc: cruise velocities in mm/s
+    :param np.ndarray v1: exit velocities in mm/s
+    :param np.ndarray jerk: jerk limits in mm/s^3
+    :returns: segment durations in s
+    :rtype: np.ndarray(float)
+    """
+    v0 = np.minimum(v0, vc)
+    v1 = np.minimum(v1, vc)
+
+    def rampTime(vp, v, j):
+        return 2*np.sqrt(np.maximum(vp - v, 0)/j)
+
+    def rampLength(vp, a, b, j):
+        return (vp+a)*rampTime(vp, a, j)/2 + (vp+b)*rampTime(vp, b, j)/2
+
+    # zero length segments (e.g. repeated rapids) have an infinite cruise velocity, they are dropped below
+    with np.errstate(invalid='ignore', divide='ignore'):
+        ramps = rampLength(vc, v0, v1, jerk)
+        times = rampTime(vc, v0, jerk) + rampTime(vc, v1, jerk) + (lengths - ramps)/vc
+    short = np.nonzero((ramps > lengths) & (lengths > 0))[0]
+    if len(short):
+        # reduce the peak velocity of all short segments at once by bisection
+        length, a, b, j = lengths[short], v0[short], v1[short], jerk[short]
+        lo = np.maximum(a, b)
+        hi = vc[short]
+        unreachable = rampLength(lo, a, b, j) > length
+        for _ in range(30):
+            mid = (lo + hi)/2
+            tooLong = rampLength(mid, a, b, j) > length
+            hi = np.where(tooLong, mid, hi)
+            lo = np.where(tooLong, lo, mid)
+        shorttimes = rampTime(lo, a, j) + rampTime(lo, b, j)
+        # entry and exit velocities cannot be matched within the segment, assume a linear transition
+        times[short] = np.where(unreachable, 2*length/np.maximum(a+b, 1e-12), shorttimes)
+    return np.where(lengths > 0, times, 0)
+
+
+def classifySegments(segments, lengths, jogspeed=None):
+    """
+    Assigns every motion segment to a cycle phase (see :data:`PHASES`).
+
+    - drilling: plunge directly followed by a retract at the same XY position
+    - zmoves: all other Z-only moves
+    - jogging: rapid moves and XY moves at jogging speed or faster
+    - milling: all other XY moves
+
+    :param dict segments: Segments as returned by :func:`parseProgram`
+    :param np.ndarray lengths: Segment lengths
+    :param float jogspeed: XY jogging speed in mm/min
+    :returns: Index into :data:`PHASES` for each segment
+    :rtype: np.ndarray(int)
+    """
+    delta = segments['end'] - segments['start']
+    planar = np.hypot(delta[:, 0], delta[:, 1])
+    zonly = (planar < 1e-9) & (segments['mode'] < 2) & (lengths > 0)
+    phase = np.full(len(lengths), PHASES.index('milling'), dtype=int)
+    rapid = segments['mode'] == 0
+    if jogspeed is not None and jogspeed > 0:
+        rapid |= (segments['mode'] == 1) & (segments['feed'] >= jogspeed)
+    phase[rapid] = PHASES.index('jogging')
+    phase[zonly] = PHASES.index('zmoves')
+    plunge = zonly[:-1] & zonly[1:] & (delta[:-1, 2] < 0) & (delta[1:, 2] > 0)
+    drilling = np.zeros(len(lengths), dtype=bool)
+    drilling[:-1] |= plunge
+    drilling[1:] |= plunge
+    phase[drilling] = PHASES.index('drilling')
+    return phase
+
+
+def estimateCycleTime(program, feedlimits, jerklimits, deviation=0.05, acceleration=50000,
+                      jogspeed=None, start=(0, 0, 0)):
+    """
+    Estimates the duration of a g-code program by simulating jerk limited motion
+    of all segments.
+
+    :param program: g-code lines
+    :type program: iterable(str)
+    :param feedlimits: (x, y, z) maximal feed rates in mm/min
+    :type feedlimits: tuple(float, float, float)
+    :param jerklimits: (x, y, z) maximal jerk in mm/min^3
+    :type jerklimits: tuple(float, float, float)
+    :param float deviation: junction deviation in mm
+    :param float acceleration: junction acceleration in mm/min^2
+    :param float jogspeed: XY jogging speed in mm/min (used to separate jogging from milling)
+    :param start: (x, y, z) start position of the tool
+    :type start: tuple(float, float, float)
+    :returns: Dictionary {"total": estimated time in s, "phases": {phase: time in s},
+              "segments": number of motion segments}
+    :rtype: dict
+    """
+    segments = parseProgram(program, start)
+    n = len(segments['mode'])
+    result = {'total':0.0, 'phases':{phase:0.0 for phase in PHASES}, 'segments':n}
+    if n == 0:
+        return result
+    lengths, entry, exit, direction = segmentGeometry(segments)
+    # convert to mm and s
+    cruise = np.minimum(segments['feed'], axisLimit(direction, feedlimits)) / 60
+    jerk = axisLimit(direction, jerklimits) / 60**3
+    vj = junctionVelocities(exit, entry, cruise, deviation, acceleration / 60**2)
+    times = profileTimes(lengths, vj[:-1], cruise, vj[1:], jerk)
+    phases = classifySegments(segments, lengths, jogspeed)
+    sums = np.bincount(phases, weights=times, minlength=len(PHASES))
+    result['total'] = float(np.sum(times))
+    result['phases'] = {phase:float(sums[i]) for i, phase in enumerate(PHASES)}
+    return result
+
+
+def formatDuration(seconds):
+    """
+    :param float seconds: duration in s
+    :returns: duration formatted as h:mm:ss
+    :rtype: str
+    """
+    seconds = int(round(seconds))
+    return "{}:{:02d}:{:02d}".format(seconds // 3600, (seconds // 60) % 60, seconds % 60)
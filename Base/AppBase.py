@@ -10,12 +10,17 @@ logger = logging.getLogger(__name__)
 import os
 from pathlib import Path
 import copy
+import json
 import sys
+import time
 
 from PyQt5 import QtWidgets
 
 import Base.Errors as errs
 from Base.AppSettings import AppSettings
+from Base.Dispatcher import JobDispatcher
+from Base.ImportCache import ImportCache
+from Base.ImportFactory import ImportFactory
 from Base.MachineBase import MachineBase
 
 #from Machines import TinyG
@@ -31,6 +36,7 @@ class AppBase(object):
     mainwindow = None
     settings = AppSettings()
     machine = MachineBase()
+    dispatcher = None
     workpiece = None
     workpieceOriginal = None
     workpieceMirrored = False
@@ -47,6 +53,7 @@ class AppBase(object):
         cls.appdata /= "ESCMillPCB"
         if not cls.appdata.exists():
             cls.appdata.mkdir()
+        ImportFactory.setCache(ImportCache(cls.appdata / "importcache"))
             
         # load application settings
         settingsfile = cls.appdata / "settings.json"
@@ -264,6 +271,95 @@ class AppBase(object):
             cls.getSettings().sigMachineChanged.emit()
             
     
+    @classmethod
+    def getDispatcher(cls):
+        """
+        :returns: Job dispatcher for additional machines (created on first use)
+        :rtype: Base.Dispatcher.JobDispatcher
+        """
+        if cls.dispatcher is None:
+            cls.dispatcher = JobDispatcher()
+        return cls.dispatcher
+    
+    
+    @classmethod
+    def addDispatcherMachine(cls, name, machinetype, comparams=None, setup=True):
+        """
+        Creates, initializes and sets up a machine and adds it to the job dispatcher.
+        Machines of the same type need separate communication parameters (e.g. different ports).
+
+        :param str name: Unique machine name
+        :param str machinetype: Machine type (see :attr:`Base.AppSettings.AppSettings.machines`)
+        :param pyqtgraph.GroupParameter comparams: Communication parameters, defaults to the settings of the type
+        :param bool setup: Apply machine parameters after initialization
+        :returns: Machine
+        :rtype: Base.MachineBase.MachineBase
+        """
+        settings = cls.getSettings()
+        machine = cls.getMachineType(machinetype)()
+        if comparams is None:
+            comparams = settings.child('MachineCom', machinetype)
+        logger.info("Initializing dispatcher machine %s (%s)...", name, machinetype)
+        machine.initialize(comparams)
+        if setup:
+            machine.applyBasicParameters(settings.child('MachineBase'), settings.child('MachineBaseHidden'))
+            machine.applyParameters(settings.child('MachineParams', machinetype),
+                                    settings.child('MachineHidden', machinetype))
+        cls.getDispatcher().addMachine(name, machine)
+        return machine
+    
+    
+    @classmethod
+    def closeDispatcher(cls):
+        """
+        Finalizes all machines of the job dispatcher (running cycles are stopped).
+        """
+        if cls.dispatcher is None:
+            return
+        for name in cls.dispatcher.getMachineNames():
+            machine = cls.dispatcher.getMachine(name)
+            if machine.isInitialized():
+                logger.info("Closing dispatcher machine %s", name)
+                machine.finalize()
+            
+    
+    @classmethod
+    def saveCheckpoint(cls, checkpoint):
+        """
+        Persists a cycle checkpoint (see :attr:`Base.MachineBase.MachineBase.sigCheckpoint`), so an interrupted
+        cycle can be resumed after a connection loss or a restart. The checkpoint of a completed cycle is removed.
+
+        :param dict checkpoint: Checkpoint
+        """
+        filepath = cls.appdata / "checkpoint.json"
+        try:
+            if checkpoint.get('completed', False):
+                if filepath.exists():
+                    filepath.unlink()
+                return
+            with open(filepath, 'w') as file:
+                json.dump({**checkpoint, 'time':time.strftime("%Y-%m-%d %H:%M:%S")}, file)
+        except OSError as e:
+            logger.error("Saving checkpoint failed: %s", e)
+    
+    
+    @classmethod
+    def loadCheckpoint(cls):
+        """
+        :returns: Checkpoint of the last interrupted cycle or None
+        :rtype: dict
+        """
+        filepath = cls.appdata / "checkpoint.json"
+        if not filepath.exists():
+            return None
+        try:
+            with open(filepath, 'r') as file:
+                return json.load(file)
+        except (OSError, ValueError) as e:
+            logger.error("Loading checkpoint failed: %s", e)
+            return None
+            
+    
     @classmethod        
     def setParkPosition(cls, position):
         """
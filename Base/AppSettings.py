@@ -9,12 +9,16 @@ logger = logging.getLogger(__name__)
 
 import json
 import binascii
+import os
 from PyQt5 import QtCore
 import pyqtgraph.parametertree.parameterTypes as ptypes
 
 import Base.BaseOptimizers as bo
 from Base.MachineBase import MachineBase
 from Machines import TinyG
+from Machines import TinyGSimulator
+from Machines import Grbl
+from Machines import GrblSimulator
 
 
 class AppSettings(QtCore.QObject):
@@ -22,6 +26,10 @@ class AppSettings(QtCore.QObject):
     This class handles application settings.
     It acts as a settings database and stores/restores settings when exiting/starting the application.
     The application settings are stored in a pyqtgraph.parametertree.parameterTypes.GroupParameter object.
+    The tree is built once by :meth:`loadDefaults`, afterwards only values change. The values are also
+    accessible flat by their path (tuple of names), see :meth:`values`. Changes are applied as change sets
+    {path: value} (see :meth:`applyChanges`), the subscribers of the changed paths are notified (see
+    :meth:`subscribe`). The settings file contains the flat values and is only written if a value changed.
 
     This class derives from QObject to support Qt signals.
 
@@ -30,27 +38,39 @@ class AppSettings(QtCore.QObject):
     ======================  ==========================================================================
     sigSettingsChanged      Emitted when a setting has changed.
                             Carries a list with the names of the root setting nodes which are affected
+    sigValuesChanged        Emitted when a setting has changed.
+                            Carries the change set {path: value}
     sigMachineChanged       Emitted when the active machine has changed
     ======================  ==========================================================================
     """
     
     # Qt signals
     sigSettingsChanged = QtCore.pyqtSignal(list)
+    sigValuesChanged = QtCore.pyqtSignal(dict)
     sigMachineChanged = QtCore.pyqtSignal()
     
     # available optimizers
     optimizers = [bo.HoleOrderOptimizer, bo.MillingCombinationOptimizer, bo.BreakoutOptimizer, bo.MillingOrderOptimizer]
     
     # available machines
-    machines = {'None':MachineBase, 'TinyG':TinyG.TinyG}
+    machines = {'None':MachineBase, 'TinyG':TinyG.TinyG, 'TinyGSimulator':TinyGSimulator.TinyGSimulator,
+                'Grbl':Grbl.Grbl, 'GrblSimulator':GrblSimulator.GrblSimulator}
     
     settings = ptypes.GroupParameter(name='Settings')
+    
+    # conversion of the values by parameter type
+    types = {'float':float, 'int':int, 'bool':bool, 'str':str}
 
     def __init__(self):
         """
         Constructor
         """
         super().__init__(None)
+        # value parameters by path
+        self.leaves = {}
+        self.subscriptions = []
+        # values changed since the settings were loaded or saved
+        self.dirty = False
         
     
     def child(self, *names):
@@ -76,14 +96,96 @@ class AppSettings(QtCore.QObject):
     
     def setValue(self, value, *names):
         """
-        Set parameter values, equivalent to AppSettings.settings.child(\*names).setValue(value)
-        See pyqtgrapgh.parametertree.Parameter.child(), pyqtgrapgh.parametertree.Parameter.value()
+        Set parameter values, equivalent to AppSettings.applyChanges({names: value})
 
         :param value: Value of the parameter
         :param \*names: path, to, child
         :type \*names: str
         """
-        return self.settings.child(*names).setValue(value)
+        if not names in self.leaves:
+            return self.settings.child(*names).setValue(value)
+        self.applyChanges({names: value})
+    
+    
+    def values(self, *prefix):
+        """
+        :param str \*prefix: path, to, group (all values if empty)
+        :returns: values {path: value} of all settings below the group
+        :rtype: dict
+        """
+        return {path: param.value() for path, param in self.leaves.items() if path[:len(prefix)] == prefix}
+    
+    
+    def applyChanges(self, changes, signal=True):
+        """
+        Sets the values of a change set. The values are converted to the type of their parameter, unknown
+        paths are ignored. Only values which differ from the current ones are set.
+
+        :param dict changes: {path: value}
+        :param bool signal: Can be used to suppress the notification (see :meth:`notifyChanges`)
+        :returns: change set of the values which were actually changed
+        :rtype: dict
+        """
+        changed = {}
+        for path, value in changes.items():
+            param = self.leaves.get(tuple(path))
+            if param is None:
+                logger.debug("Ignored unknown setting %s", "/".join(path))
+                continue
+            convert = self.types.get(param.type())
+            if convert is not None and value is not None:
+                value = convert(value)
+            if param.value() != value:
+                param.setValue(value)
+                changed[tuple(path)] = param.value()
+        if signal:
+            self.notifyChanges(changed)
+        return changed
+    
+    
+    def notifyChanges(self, changes):
+        """
+        Notifies the subscribers of changed settings, e.g. after the parameters were edited in a
+        ParameterTree. Emits sigValuesChanged and sigSettingsChanged.
+
+        :param dict changes: {path: value}
+        """
+        if len(changes) == 0:
+            return
+        self.dirty = True
+        for paths, callback in list(self.subscriptions):
+            if any(path[:len(prefix)] == prefix for path in changes for prefix in paths):
+                try:
+                    callback(changes)
+                except Exception as e:
+                    logger.error("Settings subscriber %s failed: %s", callback, e)
+        self.sigValuesChanged.emit(changes)
+        self.sigSettingsChanged.emit(list(dict.fromkeys(path[0] for path in changes)))
+    
+    
+    def subscribe(self, paths, callback):
+        """
+        Subscribes a callback to settings. The callback is called with the change set {path: value} when a
+        setting below one of the paths has changed.
+        Subscribing a callback to the same paths again has no effect.
+
+        :param paths: paths of settings or groups, e.g. [('MachineBase', 'laser_offset_x')]
+        :type paths: iterable(tuple(str))
+        :param callable callback: callback function
+        """
+        paths = frozenset(tuple(path) for path in paths)
+        if (paths, callback) in self.subscriptions:
+            return
+        self.subscriptions.append((paths, callback))
+    
+    
+    def unsubscribe(self, callback):
+        """
+        Removes all subscriptions of a callback.
+
+        :param callable callback: callback function
+        """
+        self.subscriptions = [(paths, cb) for paths, cb in self.subscriptions if cb != callback]
     
     
     def storeQtState(self, qobject, *names):
@@ -193,58 +295,78 @@ class AppSettings(QtCore.QObject):
             self.child('MachineParams').addChild(mparams)
             self.child('MachineCom').addChild(comparams)
             self.child('MachineHidden').addChild(hiddenparams)
+        
+        self.leaves = {}
+        self._indexLeaves(self.settings, ())
+        self.dirty = False
             
         if signal:
             self.sigSettingsChanged.emit([ch.name() for ch in self.settings.children()])
             
             
+    def _indexLeaves(self, param, path):
+        """
+        Adds the value parameters below a parameter to the flat index.
+        """
+        for child in param.children():
+            childpath = path + (child.name(),)
+            if child.type() == 'group' or len(child.children()) > 0:
+                self._indexLeaves(child, childpath)
+            else:
+                self.leaves[childpath] = child
+            
+            
     def loadSettings(self, file):
         """
         Load settings from a previously saved JSON file.
+        Files containing the state of the parameter tree (written by former versions) are read as well.
 
         :param str file: Path to the settings file
         """
         # read settings from file
         with open(file, 'r') as fhnd:
-            newsettings = json.load(fhnd)
+            data = json.load(fhnd)
+        if 'values' in data:
+            changes = {tuple(key.split('/')): value for key, value in data['values'].items()}
+        else:
+            changes = {}
+            self._flattenState(data, (), changes)
         # revert current settings to default
         self.loadDefaults(signal=False)
         # store read settings
-        self.settings.restoreState(newsettings, addChildren=False, removeChildren=False)
-        self.sigSettingsChanged.emit([ch.name() for ch in self.settings.children()])
-    
+        self.notifyChanges(self.applyChanges(changes, signal=False))
+        self.dirty = False
         
-    def saveSettings(self, file):
-        """
-        Save settings as JSON file.
-
-        :param str file: Path to the settings file
-        """
-        with open(file, "w") as fhnd:
-            tosave = self.settings.saveState()
-            json.dump(tosave, fhnd, indent=2)
-            
-            
-    def copySettings(self):
+        
+    @classmethod
+    def _flattenState(cls, state, path, values):
         """
-        :returns: a copy of the settings
-        :rtype: AppSettings
+        Collects the values of a saved parameter tree state.
         """
-        copy = ptypes.GroupParameter(name='Settings')
-        copy.restoreState(self.settings.saveState())
-        return copy
-    
+        children = state.get('children') or {}
+        if state.get('type') != 'group' and len(children) == 0 and len(path) > 0:
+            values[path] = state.get('value')
+        for name, child in children.items():
+            cls._flattenState(child, path + (name,), values)
     
-    def updateSettings(self, newsettings, settingsChanged):
+        
+    def saveSettings(self, file):
         """
-        Update current application settings.
+        Save settings as JSON file. The file is only written if a setting was changed since the settings were
+        loaded or saved.
 
-        :param pyqtgraph.GroupParameter newsettigns: Parameter containing new settings
-        :param settingsChanged: List with names of parameters which have changed
-        :type settingsChanged: list[str]
+        :param str file: Path to the settings file
         """
-        self.settings = newsettings
-        self.sigSettingsChanged.emit(settingsChanged)
+        if not self.dirty and os.path.exists(file):
+            logger.debug("Settings unchanged, not saving %s", file)
+            return
+        values = {"/".join(path): value for path, value in self.values().items()}
+        # write to a temporary file first, the settings must not get lost on errors
+        tempfile = str(file) + ".tmp"
+        with open(tempfile, "w") as fhnd:
+            json.dump({'version':2, 'values':values}, fhnd, indent=2)
+        os.replace(tempfile, file)
+        self.dirty = False
     
     
     @staticmethod
@@ -0,0 +1,203 @@
+"""
+Created on 19.10.2026
+"""
+
+import logging
+logger = logging.getLogger(__name__)
+
+import asyncio
+
+import Base.Errors as errs
+
+
+class AsyncMachine(object):
+    """
+    Awaitable interface to a :class:`Base.MachineBase.MachineBase` object.
+
+    Queries return asyncio futures, so several queries can be outstanding at the same time and scripted
+    routines can overlap machine I/O instead of blocking on each step. Timeouts and cancellation of
+    awaited operations are passed on to the machine (see :meth:`Base.MachineBase.MachineBase.cancelQueries`).
+
+    The machine signals are delivered by the Qt event loop, therefore the asyncio event loop has to run in
+    the Qt main thread, e.g. by using a qasync.QEventLoop::
+
+        loop = qasync.QEventLoop(app)
+        asyncio.set_event_loop(loop)
+        machine = AsyncMachine(AppBase.getMachine())
+        loop.run_until_complete(machine.goTo((10, 10, 5)))
+    """
+
+    def __init__(self, machine, timeout=None):
+        """
+        Constructor
+
+        :param Base.MachineBase.MachineBase machine: Machine to control
+        :param float timeout: Default timeout (in s) for awaited operations, None to wait forever
+        """
+        self.machine = machine
+        self.timeout = timeout
+        self.statusWaiters = []
+        self.machine.sigStatusUpdate.connect(self.machine_sigStatusUpdate)
+
+
+    def close(self):
+        """
+        Disconnects from the machine and cancels all pending status waits.
+        """
+        self.machine.sigStatusUpdate.disconnect(self.machine_sigStatusUpdate)
+        for future, _ in self.statusWaiters:
+            future.cancel()
+        self.statusWaiters.clear()
+
+
+    def queryFuture(self, commands):
+        """
+        Submits several commands (pipelined) and returns a future for the responses.
+        Cancelling the future cancels the query on the machine.
+
+        :param list commands: Machine specific commands
+        :returns: Future resolving to the list of responses (in the order of the commands)
+        :rtype: asyncio.Future
+        """
+        loop = asyncio.get_event_loop()
+        future = loop.create_future()
+
+        def finished(responses):
+            # may be called from the Qt event loop, hand over to the asyncio loop
+            loop.call_soon_threadsafe(self._setResult, future, responses)
+
+        queryid = self.machine.submitQueries(commands, finished)
+
+        def done(future):
+            if future.cancelled():
+                self.machine.cancelQueries(queryid)
+
+        future.add_done_callback(done)
+        return future
+
+
+    async def queries(self, commands, timeout=None):
+        """
+        Executes several commands pipelined and waits for the responses.
+
+        :param list commands: Machine specific commands
+        :param float timeout: Timeout (in s), defaults to the timeout given to the constructor
+        :returns: Responses in the order of the commands
+        :rtype: list
+        :raises Base.Errors.CommunicationError: on timeout
+        """
+        try:
+            return await asyncio.wait_for(self.queryFuture(commands), self._timeout(timeout))
+        except asyncio.TimeoutError:
+            raise errs.CommunicationError(commands, "Timeout")
+
+
+    async def query(self, command, timeout=None):
+        """
+        Executes a single command and waits for the response.
+
+        :param command: Machine specific command
+        :param float timeout: Timeout (in s), defaults to the timeout given to the constructor
+        :returns: Response
+        :raises Base.Errors.CommunicationError: on timeout
+        """
+        return (await self.queries([command], timeout))[0]
+
+
+    async def waitIdle(self, timeout=None, starttimeout=0.5):
+        """
+        Waits until the machine has finished moving (see :meth:`Base.MachineBase.MachineBase.isIdle`).
+
+        After a motion command the machine may still report idle until the motion starts, therefore
+        this first waits up to starttimeout seconds for the machine to become busy.
+
+        :param float timeout: Timeout (in s), defaults to the timeout given to the constructor
+        :param float starttimeout: Time (in s) to wait for the motion to start
+        :raises Base.Errors.CommunicationError: on timeout
+        """
+        if self.machine.isIdle():
+            try:
+                await asyncio.wait_for(self._waitStatus(False), starttimeout)
+            except asyncio.TimeoutError:
+                # motion already finished or nothing to do
+                return
+        try:
+            await asyncio.wait_for(self._waitStatus(True), self._timeout(timeout))
+        except asyncio.TimeoutError:
+            raise errs.CommunicationError("waitIdle", "Timeout")
+
+
+    async def goTo(self, position, absolute=True, timeout=None):
+        """
+        Moves to the given position and waits until the motion is finished.
+        See :meth:`Base.MachineBase.MachineBase.goTo`.
+
+        :param position: (x, y) or (x, y, z) coordinates
+        :type position: tuple(float, float, float)
+        :param bool absolute: Use absolute (machine) coordinates, otherwise workpiece coordinates
+        :param float timeout: Timeout (in s), defaults to the timeout given to the constructor
+        """
+        self.machine.goTo(position, absolute)
+        await self.waitIdle(timeout)
+
+
+    async def jog(self, directions, stepsize, timeout=None):
+        """
+        Jogs one step and waits until the motion is finished.
+        See :meth:`Base.MachineBase.MachineBase.jog`.
+
+        :param directions: Tuple of directions (1: positive, -1: negative, 0: not included) for (x, y, z) axis
+        :type directions: tuple(int, int, int)
+        :param float stepsize: Step size (in mm)
+        :param float timeout: Timeout (in s), defaults to the timeout given to the constructor
+        """
+        if stepsize is None:
+            raise errs.InvalidArgument("stepsize", "continuous jogging can not be awaited")
+        self.machine.jog(directions, stepsize)
+        await self.waitIdle(timeout)
+
+
+    def machine_sigStatusUpdate(self, status):
+        """
+        Slot triggered when the machine status changes. Resolves pending status waits.
+
+        :param str status: status message
+        """
+        idle = self.machine.isIdle()
+        waiters = []
+        for future, target in self.statusWaiters:
+            if future.done():
+                continue
+            if target == idle:
+                future.get_loop().call_soon_threadsafe(self._setResult, future, idle)
+            else:
+                waiters.append((future, target))
+        self.statusWaiters = waiters
+
+
+    def _waitStatus(self, idle):
+        """
+        :param bool idle: idle status to wait for
+        :returns: Future resolving when the machine's idle status equals the given status
+        :rtype: asyncio.Future
+        """
+        future = asyncio.get_event_loop().create_future()
+        self.statusWaiters.append((future, idle))
+        return future
+
+
+    def _timeout(self, timeout):
+        """
+        :returns: given timeout or the default timeout
+        :rtype: float
+        """
+        return self.timeout if timeout is None else timeout
+
+
+    @staticmethod
+    def _setResult(future, result):
+        """
+        Sets the result of a future unless it is already done (e.g. cancelled).
+        """
+        if not future.done():
+            future.set_result(result)
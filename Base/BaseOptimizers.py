@@ -10,9 +10,23 @@ logger = logging.getLogger(__name__)
 
 import math
 import numpy as np
-import pyqtgraph.parametertree.parameterTypes as ptypes
-from Algorithms import TSPOptimizer as tsp
-from Algorithms import NXUtilities as nxutil
+from Base.LazyImport import lazyImport
+# networkx is only imported when optimizing
+tsp = lazyImport('Algorithms.TSPOptimizer')
+nxutil = lazyImport('Algorithms.NXUtilities')
+
+
+def _groupParameter(params):
+    """
+    Creates the pyqtgraph GroupParameter of an optimizer. pyqtgraph is only imported here, so the optimizers
+    can be used without Qt (see :mod:`Base.Batch`).
+
+    :param dict params: Parameter definition
+    :rtype: pyqtgraph.GroupParameter
+    """
+    import pyqtgraph.parametertree.parameterTypes as ptypes
+    return ptypes.GroupParameter(**params)
+
 
 
 class MachiningOptimizer(object):
@@ -137,7 +151,7 @@ class HoleOrderOptimizer(MachiningOptimizer):
                 {'name':'Iterations', 'type':'int', 'min':1, 'default':20, 'value':20}
             ]
         }
-        return ptypes.GroupParameter(**params)
+        return _groupParameter(params)
     
     
 
@@ -217,7 +231,7 @@ class MillingCombinationOptimizer(MachiningOptimizer):
                 {'name':'Active', 'type':'bool', 'default':True, 'value':True}
             ]
         }
-        return ptypes.GroupParameter(**params)
+        return _groupParameter(params)
     
     
 class BreakoutOptimizer(MachiningOptimizer):
@@ -333,7 +347,7 @@ class BreakoutOptimizer(MachiningOptimizer):
                 }
             ]
         }
-        return ptypes.GroupParameter(**params)
+        return _groupParameter(params)
     
 
 class MillingOrderOptimizer(MachiningOptimizer):
@@ -386,5 +400,5 @@ class MillingOrderOptimizer(MachiningOptimizer):
                 {'name':'Active', 'type':'bool', 'value':True, 'default':True}
             ]
         }
-        return ptypes.GroupParameter(**params)
+        return _groupParameter(params)
         
\ No newline at end of file
@@ -0,0 +1,419 @@
+"""
+Created on 19.10.2026
+"""
+
+import logging
+logger = logging.getLogger(__name__)
+
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import importlib
+import json
+import os
+from pathlib import Path
+import time
+
+import Base.Errors as errs
+from Base.ImportCache import ImportCache
+from Base.ImportFactory import ImportFactory
+
+
+# planners of the machines which can export programs, (module, class) by machine name
+# (see :attr:`Base.AppSettings.AppSettings.machines`)
+planners = {
+    'TinyG':('Machines.TinyGPlanner', 'TinyGPlanner'),
+    'TinyGSimulator':('Machines.TinyGPlanner', 'TinyGPlanner'),
+    'Grbl':('Machines.GrblPlanner', 'GrblPlanner'),
+    'GrblSimulator':('Machines.GrblPlanner', 'GrblPlanner')
+}
+
+
+class SettingsNode(object):
+    """
+    Read-only view of a settings file saved by :meth:`Base.AppSettings.AppSettings.saveSettings`.
+
+    The file contains the flat values of the settings (or the state of the settings GroupParameter written by
+    former versions). This class offers the methods of
+    pyqtgraph.Parameter used to read parameters (child(), children(), value() and param[name]), e.g. by
+    :meth:`Base.BaseOptimizers.MachiningOptimizer.updateParameters`, without creating the parameter tree.
+
+    Files of older versions may lack settings. When a missing setting is accessed, the defaults of
+    :class:`Base.AppSettings.AppSettings` are merged below the loaded values once, like the GUI does when
+    loading the settings. The defaults are only created then, as they need Qt and the machine drivers.
+    """
+
+    def __init__(self, state, name='Settings', root=None):
+        """
+        Constructor
+
+        :param dict state: Saved parameter state
+        :param str name: Parameter name
+        :param SettingsNode root: Root node of the settings, None for the root node itself
+        """
+        self.state = state
+        self.nodename = name
+        self.root = root if root is not None else self
+        self.merged = False
+
+
+    @classmethod
+    def load(cls, filepath):
+        """
+        :param str filepath: Path to the settings file
+        :returns: Root node of the settings
+        :rtype: SettingsNode
+        """
+        with open(filepath, 'r') as fhnd:
+            state = json.load(fhnd)
+        if 'values' in state:
+            # build the tree of the flat values {"path/to/child": value}
+            values = state['values']
+            state = {'children':{}}
+            for key, value in values.items():
+                node = state
+                for name in key.split('/'):
+                    node = node['children'].setdefault(name, {'children':{}})
+                node['value'] = value
+        return cls(state)
+
+
+    def name(self):
+        """
+        :returns: Parameter name
+        :rtype: str
+        """
+        return self.nodename
+
+
+    def children(self):
+        """
+        :returns: Child nodes
+        :rtype: list(SettingsNode)
+        """
+        return [SettingsNode(state, name, self.root) for name, state in self.state.get('children', {}).items()]
+
+
+    def child(self, *names):
+        """
+        :param str names: Path of child names
+        :returns: Child node
+        :rtype: SettingsNode
+        """
+        node = self
+        for name in names:
+            if not name in node.state.get('children', {}):
+                self.root.mergeDefaults()
+            children = node.state.get('children', {})
+            if not name in children:
+                raise errs.InvalidArgument('names', 'Setting {} not found in {}.'.format(name, node.name()))
+            node = SettingsNode(children[name], name, self.root)
+        return node
+
+
+    def mergeDefaults(self):
+        """
+        Adds the default values of the settings missing in the loaded state (only once).
+        """
+        if self.merged:
+            return
+        self.merged = True
+        from Base.AppSettings import AppSettings
+        defaults = AppSettings()
+        defaults.loadDefaults(signal=False)
+        logger.info("Settings missing in the settings file, using the default values.")
+        self._mergeState(self.state, defaults.settings.saveState())
+
+
+    @classmethod
+    def _mergeState(cls, state, defaults):
+        """
+        Adds the children of the default state missing in the state, the state is modified in place so
+        existing nodes stay valid.
+        """
+        children = state.setdefault('children', {})
+        for name, default in (defaults.get('children') or {}).items():
+            if name in children:
+                cls._mergeState(children[name], default)
+            else:
+                children[name] = default
+
+
+    def value(self, *names):
+        """
+        :param str names: Path of child names
+        :returns: Value of the parameter
+        """
+        return self.child(*names).state.get('value')
+
+
+    def __getitem__(self, names):
+        if not isinstance(names, tuple):
+            names = (names,)
+        return self.value(*names)
+
+
+
+def getAppData():
+    """
+    :returns: Data directory of the application (see :meth:`Base.AppBase.AppBase.initialize`)
+    :rtype: pathlib.Path
+    """
+    return Path(os.getenv("LOCALAPPDATA", os.getenv("APPDATA", str(Path.home())))) / "ESCMillPCB"
+
+
+def createPlanner(machine, settings):
+    """
+    Creates the planner of a machine and applies the basic machine settings (feeds, infeed depth and tool
+    diameter).
+
+    :param str machine: Machine name (see :data:`planners`)
+    :param SettingsNode settings: Settings
+    :returns: Planner offering the planXXX and exportProgram methods of :class:`Base.MachineBase.MachineBase`
+    """
+    if not machine in planners:
+        raise errs.InvalidArgument('machine', 'Machine {} cannot export programs.'.format(machine))
+    module, name = planners[machine]
+    planner = getattr(importlib.import_module(module), name)()
+    params = settings.child('MachineBase')
+    planner.jogspeedXY = params.value('jog_speed_xy')
+    planner.jogspeedZ = params.value('jog_speed_z')
+    planner.millspeedXY = params.value('mill_speed_xy')
+    planner.infeedspeed = params.value('infeed_speed')
+    planner.outfeedspeed = params.value('outfeed_speed')
+    planner.infeeddepth = params.value('infeed_depth')
+    planner.tooldiameter = params.value('tool_diameter')
+    return planner
+
+
+def prepareWorkpiece(filepath, filetype, settings, mirror=None, panel=None):
+    """
+    Imports and optimizes a board the way the GUI does (see :meth:`Base.AppBase.AppBase.setWorkpiece`).
+
+    :param str filepath: Path to the board file
+    :param str filetype: File type (see :meth:`Base.ImportFactory.ImportFactory.importFile`)
+    :param SettingsNode settings: Settings
+    :param bool mirror: Mirror the board, None to use the setting of the GUI
+    :param panel: (rows, columns, spacing x, spacing y) to mill a panel of boards
+                  (see :meth:`Base.Workpiece.Workpiece.panelize`), None for a single board
+    :type panel: tuple(int, int, float, float)
+    :returns: Workpiece
+    :rtype: Base.Workpiece.Workpiece
+    """
+    workpiece = ImportFactory.importFile(str(filepath), filetype)
+    workpiece.setSize((settings.value('UI', 'board_size_x'), settings.value('UI', 'board_size_y')))
+    workpiece.updateOptimizers(settings.child('Optimizers'))
+    if panel is None:
+        workpiece.optimize()
+    else:
+        rows, columns, *spacing = panel
+        workpiece.panelize(rows, columns, spacing)
+    workpiece.holeList.active = settings.value('UI', 'holes_active')
+    workpiece.millingList.active = settings.value('UI', 'millings_active')
+    if mirror is None:
+        mirror = settings.value('UI', 'board_mirrored')
+    if mirror:
+        workpiece.mirror()
+    return workpiece
+
+
+class PreparedBoard(object):
+    """
+    Result of :func:`prepareWorkpieces` for a single board file, picklable
+    """
+
+    def __init__(self, filepath, workpiece, duration, error=None):
+        """
+        Constructor
+
+        :param str filepath: Path to the board file
+        :param Base.Workpiece.Workpiece workpiece: Prepared workpiece, None if the board failed
+        :param float duration: Duration of import and optimization in s
+        :param str error: Error message if the board failed
+        """
+        self.filepath = filepath
+        self.workpiece = workpiece
+        self.duration = duration
+        self.error = error
+
+
+def _initWorker(cachedir):
+    """
+    Sets the import cache of a pool process, the class attributes of the parent process are not
+    inherited by spawned processes.
+    """
+    ImportFactory.setCache(None if cachedir is None else ImportCache(cachedir))
+
+
+def _prepareBoard(filepath, filetype, settings, mirror, panel):
+    """
+    Pool job of :func:`prepareWorkpieces`
+
+    :rtype: PreparedBoard
+    """
+    start = time.perf_counter()
+    try:
+        workpiece = prepareWorkpiece(filepath, filetype, settings, mirror, panel)
+    except Exception as e:
+        # any broken board must not abort the whole batch
+        return PreparedBoard(filepath, None, time.perf_counter() - start, "{}: {}".format(type(e).__name__, e))
+    return PreparedBoard(filepath, workpiece, time.perf_counter() - start)
+
+
+def prepareWorkpieces(filepaths, filetype, settings, mirror=None, panel=None, processes=None):
+    """
+    Imports and optimizes several boards concurrently in a process pool (see :func:`prepareWorkpiece`).
+    The pool processes use the import cache of the calling process.
+
+    :param list(str) filepaths: Paths to the board files
+    :param str filetype: File type (see :meth:`Base.ImportFactory.ImportFactory.importFile`)
+    :param SettingsNode settings: Settings
+    :param bool mirror: Mirror the boards, None to use the setting of the GUI
+    :param panel: (rows, columns, spacing x, spacing y) to mill panels of boards, None for single boards
+    :type panel: tuple(int, int, float, float)
+    :param int processes: Number of processes, defaults to the number of CPUs, 1 prepares the boards in the
+                          calling process
+    :returns: Results in the order of the files, failed boards contain the error instead of the workpiece
+    :rtype: list(PreparedBoard)
+    """
+    if processes == 1:
+        results = [_prepareBoard(str(filepath), filetype, settings, mirror, panel) for filepath in filepaths]
+    else:
+        cachedir = None if ImportFactory.cache is None else ImportFactory.cache.directory
+        with ProcessPoolExecutor(processes, initializer=_initWorker, initargs=(cachedir,)) as executor:
+            futures = [executor.submit(_prepareBoard, str(filepath), filetype, settings, mirror, panel)
+                       for filepath in filepaths]
+            results = [future.result() for future in futures]
+    for result in results:
+        if result.error is None:
+            logger.info("Prepared %s in %.3f s.", result.filepath, result.duration)
+        else:
+            logger.error("Preparing %s failed: %s", result.filepath, result.error)
+    return results
+
+
+def exportWorkpiece(workpiece, outfile, machine, settings):
+    """
+    Plans a prepared workpiece and writes the g-code program.
+
+    :param Base.Workpiece.Workpiece workpiece: Prepared workpiece (see :func:`prepareWorkpiece`)
+    :param str outfile: Path to the g-code file
+    :param str machine: Machine name (see :data:`planners`)
+    :param SettingsNode settings: Settings
+    :returns: Durations of the steps in s {"plan", "export"}
+    :rtype: dict
+    """
+    timing = {}
+    start = time.perf_counter()
+    planner = createPlanner(machine, settings)
+    workpiece.planMachining(planner)
+    timing['plan'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    planner.exportProgram(str(outfile))
+    timing['export'] = time.perf_counter() - start
+    return timing
+
+
+def run(filepath, outfile, filetype="eagle", settingsfile=None, machine=None, mirror=None, panel=None):
+    """
+    Imports, optimizes and plans a board and writes the g-code program.
+
+    :param str filepath: Path to the board file
+    :param str outfile: Path to the g-code file
+    :param str filetype: File type (see :meth:`Base.ImportFactory.ImportFactory.importFile`)
+    :param str settingsfile: Settings file, defaults to the settings of the application
+    :param str machine: Machine name, defaults to the active machine of the settings
+    :param bool mirror: Mirror the board, None to use the setting of the GUI
+    :param panel: (rows, columns, spacing x, spacing y) to mill a panel of boards, None for a single board
+    :type panel: tuple(int, int, float, float)
+    :returns: Durations of the steps in s {"settings", "import", "plan", "export"}
+    :rtype: dict
+    """
+    timing = {}
+    start = time.perf_counter()
+    if settingsfile is None:
+        settingsfile = getAppData() / "settings.json"
+    settings = SettingsNode.load(settingsfile)
+    if machine is None:
+        machine = settings.value('MachineBaseHidden', 'machine_name')
+    timing['settings'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    workpiece = prepareWorkpiece(filepath, filetype, settings, mirror, panel)
+    timing['import'] = time.perf_counter() - start
+
+    timing.update(exportWorkpiece(workpiece, outfile, machine, settings))
+    logger.info("Processed %s for %s (%s).", filepath, machine,
+                ", ".join("{} {:.3f} s".format(step, duration) for step, duration in timing.items()))
+    return timing
+
+
+def main(argv=None):
+    """
+    Command line entry point, see --help.
+
+    :param list(str) argv: Arguments, defaults to sys.argv
+    :returns: Exit code
+    :rtype: int
+    """
+    parser = argparse.ArgumentParser(description="Converts boards to g-code programs without GUI.")
+    parser.add_argument('boards', nargs='+', help="board files")
+    parser.add_argument('-t', '--type', default="eagle", choices=sorted(ImportFactory.versions),
+                        help="board file type (default: eagle)")
+    parser.add_argument('-s', '--settings', help="settings file (default: settings of the application)")
+    parser.add_argument('-m', '--machine', help="machine (default: active machine of the settings)")
+    parser.add_argument('-o', '--output', help="g-code file (single board) or directory (default: next to the board)")
+    parser.add_argument('--mirror', action='store_true', default=None, help="mirror the boards")
+    parser.add_argument('--no-mirror', action='store_false', dest='mirror', help="do not mirror the boards")
+    parser.add_argument('--panel', nargs=2, type=int, metavar=('ROWS', 'COLUMNS'),
+                        help="mill a panel of rows x columns boards")
+    parser.add_argument('--spacing', nargs=2, type=float, default=(0, 0), metavar=('X', 'Y'),
+                        help="spacing between the boards of a panel in mm (default: 0 0)")
+    parser.add_argument('--no-cache', action='store_true', help="do not use the import cache of the application")
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help="number of boards processed in parallel, 0 for the number of CPUs (default: 1)")
+    args = parser.parse_args(argv)
+
+    if not args.no_cache:
+        ImportFactory.setCache(ImportCache(getAppData() / "importcache"))
+
+    panel = None if args.panel is None else (*args.panel, *args.spacing)
+    outfiles = []
+    for board in args.boards:
+        outfile = Path(board).with_suffix(".nc")
+        if args.output is not None:
+            output = Path(args.output)
+            if output.is_dir():
+                outfile = output / outfile.name
+            elif len(args.boards) == 1:
+                outfile = output
+            else:
+                parser.error("--output has to be a directory for several boards")
+        outfiles.append(outfile)
+
+    try:
+        settings = SettingsNode.load(args.settings or getAppData() / "settings.json")
+        machine = args.machine or settings.value('MachineBaseHidden', 'machine_name')
+        if not machine in planners:
+            raise errs.InvalidArgument('machine', 'Machine {} cannot export programs.'.format(machine))
+    except (OSError, ValueError, errs.ESCError) as e:
+        logger.error("Loading the settings failed: %s", e)
+        return 1
+
+    results = prepareWorkpieces(args.boards, args.type, settings, args.mirror, panel, args.jobs or None)
+    failed = 0
+    for result, outfile in zip(results, outfiles):
+        if result.error is not None:
+            # already reported by prepareWorkpieces
+            failed += 1
+            continue
+        try:
+            timing = exportWorkpiece(result.workpiece, outfile, machine, settings)
+        except Exception as e:
+            # any broken board must not abort the whole batch
+            logger.error("Processing %s failed: %s: %s", result.filepath, type(e).__name__, e)
+            failed += 1
+            continue
+        logger.info("Processed %s for %s (prepare %.3f s, %s).", result.filepath, machine, result.duration,
+                    ", ".join("{} {:.3f} s".format(step, duration) for step, duration in timing.items()))
+    return 1 if failed else 0
@@ -0,0 +1,375 @@
+"""
+Created on 19.10.2026
+"""
+
+import logging
+logger = logging.getLogger(__name__)
+
+import copy
+import itertools
+import time
+
+from PyQt5 import QtCore
+
+import Base.Errors as errs
+from Base.StatusStore import StatusStore
+
+
+# job states
+QUEUED = 'queued'
+RUNNING = 'running'
+COMPLETED = 'completed'
+INTERRUPTED = 'interrupted'
+FAILED = 'failed'
+CANCELED = 'canceled'
+
+
+class Job(object):
+    """
+    Machining job: a workpiece waiting for or being machined by one of the machines of a :class:`JobDispatcher`.
+    """
+
+    _ids = itertools.count(1)
+
+    def __init__(self, workpiece, name=None, machine=None, start=0):
+        """
+        Constructor
+
+        :param Base.Workpiece.Workpiece workpiece: Workpiece to machine (the job keeps a copy)
+        :param str name: Job name, defaults to "Job <id>"
+        :param str machine: Name of the machine the job has to run on, None for any machine
+        :param int start: Index of the first machining object (see :meth:`Base.Workpiece.Workpiece.planMachining`)
+        """
+        self.id = next(Job._ids)
+        self.name = name if name is not None else "Job {}".format(self.id)
+        self.workpiece = copy.deepcopy(workpiece)
+        self.machine = machine
+        self.start = start
+        self.state = QUEUED
+        self.assigned = None
+        self.checkpoint = None
+        self.error = None
+        self.queued = time.time()
+        self.started = None
+        self.finished = None
+
+
+    def __str__(self):
+        return "{} ({})".format(self.name, self.state)
+
+
+
+class JobDispatcher(QtCore.QObject):
+    """
+    Distributes machining jobs to several machines.
+
+    Jobs are queued and assigned in submission order to machines which are ready, idle and not running another
+    job. Each machine spools its cycle with its own communication threads, so all machines run concurrently
+    while the dispatcher itself only reacts to the machines' signals in the GUI thread.
+
+    A machine has to be marked ready (:meth:`setMachineReady`) by the operator once a blank is loaded and the
+    board origin is set. The ready flag is cleared when a job is finished, so every job needs a new blank.
+    Interrupted jobs keep their last checkpoint and can be requeued to resume at the interrupted machining
+    object.
+
+    The aggregated state is kept in :attr:`status` (see :class:`Base.StatusStore.StatusStore`): one field per
+    machine ({"state": "offline" | "waiting" | "idle" | "busy", "job": job name, "checkpoint": last checkpoint})
+    and the field "queue" with the number of queued jobs.
+
+    ===================  ===================================================================================
+    **Signals**
+    ===================  ===================================================================================
+    sigJobChanged        Emitted when a job is queued, started or finished.
+                         Carries the :class:`Job`.
+    ===================  ===================================================================================
+    """
+
+    sigJobChanged = QtCore.pyqtSignal(object)
+
+    def __init__(self, parent=None):
+        """
+        Constructor
+        """
+        super().__init__(parent)
+        self.machines = {}
+        self.ready = {}
+        self.running = {}
+        self.connections = {}
+        self.jobs = []
+        self.status = StatusStore(parent=self)
+
+
+    def addMachine(self, name, machine):
+        """
+        Adds a machine. The machine has to be initialized and set up by the caller.
+
+        :param str name: Unique machine name
+        :param Base.MachineBase.MachineBase machine: Machine
+        """
+        if name in self.machines:
+            raise errs.InvalidArgument('name', 'Machine {} already exists.'.format(name))
+        self.machines[name] = machine
+        self.ready[name] = False
+        connections = (
+            (machine.sigCycleCompleted, lambda: self.machine_cycleCompleted(name)),
+            (machine.sigCheckpoint, lambda checkpoint: self.machine_checkpoint(name, checkpoint))
+        )
+        for signal, slot in connections:
+            signal.connect(slot)
+        self.connections[name] = connections
+        logger.info("Dispatcher machine %s (%s) added.", name, machine.getName())
+        self._updateStatus(name)
+
+
+    def removeMachine(self, name):
+        """
+        Removes a machine which is not running a job.
+
+        :param str name: Machine name
+        :returns: the removed machine
+        :rtype: Base.MachineBase.MachineBase
+        """
+        if name in self.running:
+            raise errs.InvalidArgument('name', 'Machine {} is running {}.'.format(name, self.running[name].name))
+        machine = self.machines.pop(name)
+        for signal, slot in self.connections.pop(name):
+            signal.disconnect(slot)
+        del self.ready[name]
+        self.status.update({name:None})
+        logger.info("Dispatcher machine %s removed.", name)
+        return machine
+
+
+    def getMachine(self, name):
+        """
+        :param str name: Machine name
+        :returns: Machine
+        :rtype: Base.MachineBase.MachineBase
+        """
+        return self.machines[name]
+
+
+    def getMachineNames(self):
+        """
+        :returns: Names of all machines
+        :rtype: list(str)
+        """
+        return list(self.machines.keys())
+
+
+    def setMachineReady(self, name, ready=True):
+        """
+        Marks a machine as ready for the next job (blank loaded, board origin set) and dispatches queued jobs.
+
+        :param str name: Machine name
+        :param bool ready: Ready state
+        """
+        if not name in self.machines:
+            raise errs.InvalidArgument('name', 'Unknown machine {}.'.format(name))
+        self.ready[name] = ready
+        self._updateStatus(name)
+        self.dispatch()
+
+
+    def getJobs(self, state=None):
+        """
+        :param str state: Only return jobs in this state (e.g. :data:`QUEUED`), None for all jobs
+        :returns: Jobs in submission order
+        :rtype: list(Job)
+        """
+        return [job for job in self.jobs if state is None or job.state == state]
+
+
+    def submitJob(self, workpiece, name=None, machine=None, start=0):
+        """
+        Queues a job and dispatches it if a machine is available.
+
+        :param Base.Workpiece.Workpiece workpiece: Workpiece to machine (the job keeps a copy)
+        :param str name: Job name
+        :param str machine: Name of the machine the job has to run on, None for any machine
+        :param int start: Index of the first machining object
+        :returns: Job
+        :rtype: Job
+        """
+        if machine is not None and not machine in self.machines:
+            raise errs.InvalidArgument('machine', 'Unknown machine {}.'.format(machine))
+        job = Job(workpiece, name, machine, start)
+        self.jobs.append(job)
+        logger.info("Job %s queued%s.", job.name, "" if machine is None else " for machine " + machine)
+        self.sigJobChanged.emit(job)
+        self.dispatch()
+        return job
+
+
+    def cancelJob(self, job):
+        """
+        Removes a queued job from the queue. Running jobs have to be stopped on their machine.
+
+        :param Job job: Job
+        """
+        if job.state != QUEUED:
+            raise errs.InvalidArgument('job', 'Job {} is not queued.'.format(job.name))
+        job.state = CANCELED
+        job.finished = time.time()
+        logger.info("Job %s canceled.", job.name)
+        self.sigJobChanged.emit(job)
+        self._updateQueue()
+
+
+    def requeueJob(self, job):
+        """
+        Queues an interrupted or failed job again. An interrupted job resumes at the machining object it was
+        interrupted at.
+
+        :param Job job: Job
+        """
+        if not job.state in (INTERRUPTED, FAILED, CANCELED):
+            raise errs.InvalidArgument('job', 'Job {} is {}.'.format(job.name, job.state))
+        if job.state == INTERRUPTED and job.checkpoint is not None:
+            job.start = job.checkpoint['index']
+        job.state = QUEUED
+        job.error = None
+        job.assigned = None
+        # move to the end of the queue
+        self.jobs.remove(job)
+        self.jobs.append(job)
+        logger.info("Job %s requeued at machining object %s.", job.name, job.start+1)
+        self.sigJobChanged.emit(job)
+        self.dispatch()
+
+
+    def isAvailable(self, name):
+        """
+        :param str name: Machine name
+        :returns: True if the machine can start a job
+        :rtype: bool
+        """
+        machine = self.machines[name]
+        return self.ready[name] and not name in self.running and machine.isInitialized() and machine.isIdle()
+
+
+    def dispatch(self):
+        """
+        Assigns queued jobs to available machines.
+        Called automatically when jobs are queued, machines are marked ready and jobs are finished.
+
+        :returns: Number of started jobs
+        :rtype: int
+        """
+        started = 0
+        for job in self.getJobs(QUEUED):
+            candidates = [job.machine] if job.machine is not None else self.machines.keys()
+            for name in candidates:
+                if self.isAvailable(name):
+                    started += self._startJob(name, job)
+                    break
+        self._updateQueue()
+        return started
+
+
+    def _startJob(self, name, job):
+        """
+        Plans the job on the machine and starts the cycle.
+
+        :returns: 1 if the job was started, 0 if it failed
+        :rtype: int
+        """
+        machine = self.machines[name]
+        job.assigned = name
+        job.checkpoint = None
+        job.started = time.time()
+        try:
+            job.workpiece.planMachining(machine, job.start)
+            self.running[name] = job
+            job.state = RUNNING
+            machine.executeCycle()
+        except Exception as e:
+            self.running.pop(name, None)
+            job.state = FAILED
+            job.error = str(e)
+            job.finished = time.time()
+            logger.error("Job %s failed on machine %s: %s", job.name, name, e)
+            self.sigJobChanged.emit(job)
+            self._updateStatus(name)
+            return 0
+        logger.info("Job %s started on machine %s.", job.name, name)
+        self.sigJobChanged.emit(job)
+        self._updateStatus(name)
+        return 1
+
+
+    def machine_checkpoint(self, name, checkpoint):
+        """
+        Slot triggered when a machine passes a checkpoint.
+
+        :param str name: Machine name
+        :param dict checkpoint: Checkpoint
+        """
+        job = self.running.get(name)
+        if job is not None:
+            job.checkpoint = checkpoint
+            self._updateStatus(name)
+
+
+    def machine_cycleCompleted(self, name):
+        """
+        Slot triggered when a machine finished (or stopped) its cycle.
+
+        :param str name: Machine name
+        """
+        job = self.running.pop(name, None)
+        if job is None:
+            # cycle not started by the dispatcher
+            return
+        job.finished = time.time()
+        if job.checkpoint is None or job.checkpoint['completed']:
+            job.state = COMPLETED
+            logger.info("Job %s completed on machine %s (%.0f s).", job.name, name, job.finished-job.started)
+        else:
+            job.state = INTERRUPTED
+            logger.warning("Job %s interrupted on machine %s at %s/%s.", job.name, name,
+                           job.checkpoint['index']+1, job.checkpoint['count'])
+        # the next job needs a new blank
+        self.ready[name] = False
+        self.sigJobChanged.emit(job)
+        self._updateStatus(name)
+        self.dispatch()
+
+
+    def _updateStatus(self, name):
+        """
+        Updates the aggregated status of a machine.
+        """
+        machine = self.machines[name]
+        job = self.running.get(name)
+        if not machine.isInitialized():
+            state = "offline"
+        elif job is not None:
+            state = "busy"
+        elif not self.ready[name]:
+            state = "waiting"
+        else:
+            state = "idle"
+        self.status.update({name:{
+            'state':state,
+            'job':job.name if job is not None else None,
+            'checkpoint':job.checkpoint if job is not None else None
+        }})
+
+
+    def _updateQueue(self):
+        """
+        Updates the number of queued jobs in the aggregated status.
+        """
+        self.status.update({'queue':len(self.getJobs(QUEUED))})
+
+
+    def getStatus(self):
+        """
+        :returns: Aggregated status {machine name: {"state", "job", "checkpoint"}, "queue": queued jobs}
+        :rtype: dict
+        """
+        for name in self.machines:
+            self._updateStatus(name)
+        self._updateQueue()
+        return {key:value for key, value in self.status.snapshot().items() if value is not None}
@@ -0,0 +1,121 @@
+"""
+Created on 19.10.2026
+"""
+
+import logging
+logger = logging.getLogger(__name__)
+
+import io
+import time
+
+
+def normalizeLine(line):
+    """
+    Normalizes a single g-code line to the compact form used by the planners:
+    Comments ("(...)" and "; ..."), block delete markers, line numbers and whitespace are
+    removed and the line is converted to lower case.
+
+    :param str line: Raw g-code line
+    :returns: Normalized g-code line (empty if the line contains no code)
+    :rtype: str
+    """
+    if ';' in line:
+        line = line[:line.index(';')]
+    while '(' in line:
+        start = line.index('(')
+        end = line.find(')', start)
+        if end < 0:
+            line = line[:start]
+        else:
+            line = line[:start] + line[end+1:]
+    line = "".join(line.split()).lower()
+    if line == "%" or line == "/":
+        return ""
+    if line.startswith('/'):
+        line = line[1:]
+    if line.startswith('n'):
+        # strip line number
+        end = 1
+        while end < len(line) and line[end].isdigit():
+            end += 1
+        line = line[end:]
+    return line
+
+
+def readProgram(filepath, buffersize=io.DEFAULT_BUFFER_SIZE):
+    """
+    Generator which reads a g-code file line by line and yields the normalized
+    (see :func:`normalizeLine`) non-empty lines.
+
+    The file is read through a line buffer, so the file is never loaded completely into memory.
+
+    :param str filepath: Path to the g-code file
+    :param int buffersize: Size of the read buffer in bytes
+    :returns: Generator yielding g-code lines
+    :rtype: generator(str)
+    """
+    with open(filepath, 'r', encoding='ascii', errors='replace', buffering=buffersize) as file:
+        for line in file:
+            line = normalizeLine(line)
+            if line != "":
+                yield line
+
+
+def writeProgram(filepath, program, comments=()):
+    """
+    Writes a g-code program to a file.
+
+    :param str filepath: Path to the g-code file
+    :param program: g-code lines
+    :type program: iterable(str)
+    :param comments: Comment lines to put in the file header
+    :type comments: iterable(str)
+    :returns: Number of written g-code lines
+    :rtype: int
+    """
+    count = 0
+    with open(filepath, 'w', encoding='ascii', newline='\n') as file:
+        for comment in comments:
+            file.write("({})\n".format(comment.replace('(', '[').replace(')', ']')))
+        for line in program:
+            file.write(line)
+            file.write("\n")
+            count += 1
+    logger.debug("Wrote %s g-code lines to %s", count, filepath)
+    return count
+
+
+class ProgramFile(object):
+    """
+    A g-code program stored in a file.
+
+    The object can be used like the planner buffer of a machine (iterating, len) but the lines are streamed
+    from the file (see :func:`readProgram`) each time the program is iterated.
+    """
+
+    def __init__(self, filepath):
+        """
+        Constructor
+
+        :param str filepath: Path to the g-code file
+        """
+        self.filepath = str(filepath)
+        self.lines = None
+
+
+    def __iter__(self):
+        return readProgram(self.filepath)
+
+
+    def __len__(self):
+        # count lines once, the file is assumed not to change while loaded
+        if self.lines is None:
+            start = time.perf_counter()
+            self.lines = sum(1 for _ in self)
+            logger.debug("Counted %s g-code lines in %s (%.3f s)", self.lines, self.filepath,
+                         time.perf_counter()-start)
+        return self.lines
+
+
+    def __str__(self):
+        return self.filepath
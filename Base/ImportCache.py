@@ -0,0 +1,135 @@
+"""
+Created on 19.10.2026
+"""
+
+import logging
+logger = logging.getLogger(__name__)
+
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+import numpy as np
+
+from Base.Workpiece import Workpiece
+
+
+class ImportCache(object):
+    """
+    Cache of imported workpieces (see :meth:`Base.ImportFactory.ImportFactory.importFile`).
+
+    The holes and millings of an imported workpiece are stored as numpy arrays (see
+    :meth:`Base.Workpiece.Workpiece.getArrays`) in a \\*.npz file named by the hash of the board file contents,
+    the file type, the importer version and the drill deduplication tolerance. An unchanged board is therefore
+    restored without parsing it again, a changed board, importer or tolerance never hits an outdated entry.
+    """
+
+    def __init__(self, directory, maxentries=50):
+        """
+        Constructor
+
+        :param directory: Cache directory, created when the first entry is stored
+        :type directory: str or pathlib.Path
+        :param int maxentries: Number of entries to keep, the least recently used entries are removed
+        """
+        self.directory = Path(directory)
+        self.maxentries = maxentries
+
+
+    @staticmethod
+    def getKey(data, filetype, version, tolerance):
+        """
+        :param bytes data: Contents of the board file
+        :param str filetype: File type
+        :param int version: Importer version
+        :param float tolerance: Drill deduplication tolerance in mm
+        :returns: Cache key
+        :rtype: str
+        """
+        return "{}-{}-v{}-t{}".format(hashlib.sha1(data).hexdigest(), filetype, version, tolerance)
+
+
+    def getPath(self, key):
+        """
+        :param str key: Cache key
+        :returns: Path of the cache entry
+        :rtype: pathlib.Path
+        """
+        return self.directory / (key + ".npz")
+
+
+    def load(self, key):
+        """
+        :param str key: Cache key
+        :returns: Cached workpiece or None if there is no valid entry
+        :rtype: Base.Workpiece.Workpiece
+        """
+        path = self.getPath(key)
+        if not path.exists():
+            return None
+        try:
+            with np.load(path) as data:
+                workpiece = Workpiece.fromArrays(data['holes'], data['paths'])
+            # mark as recently used
+            os.utime(path)
+        except FileNotFoundError:
+            # removed by a concurrent import meanwhile
+            return None
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning("Invalid import cache entry %s: %s", path.name, e)
+            return None
+        logger.debug("Loaded workpiece from import cache entry %s.", path.name)
+        return workpiece
+
+
+    def store(self, key, workpiece):
+        """
+        :param str key: Cache key
+        :param Base.Workpiece.Workpiece workpiece: Imported workpiece
+        """
+        path = self.getPath(key)
+        holes, paths = workpiece.getArrays()
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            # write to a unique temporary file first, concurrent imports (of the same board) must not see
+            # partial entries or write to the same file
+            fd, temppath = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, 'wb') as fhnd:
+                    np.savez(fhnd, holes=holes, paths=paths)
+                os.replace(temppath, path)
+            except OSError:
+                os.unlink(temppath)
+                raise
+        except OSError as e:
+            logger.warning("Could not store import cache entry %s: %s", path.name, e)
+            return
+        logger.debug("Stored workpiece in import cache entry %s.", path.name)
+        self.prune()
+
+
+    def prune(self):
+        """
+        Removes the least recently used entries exceeding the maximum number of entries.
+        """
+        # entries may be removed by concurrent imports meanwhile
+        entries = []
+        for path in self.directory.glob("*.npz"):
+            try:
+                entries.append((path.stat().st_mtime, path))
+            except OSError:
+                pass
+        entries.sort(reverse=True)
+        for mtime, path in entries[self.maxentries:]:
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+
+    def clear(self):
+        """
+        Removes all entries.
+        """
+        for path in self.directory.glob("*.npz"):
+            path.unlink()
@@ -9,17 +9,34 @@ logger = logging.getLogger(__name__)
 
 import math
 
-from Base.AppBase import AppBase
 from Base import Utility
 from Base import MachiningObjects as mo
+from Base.LazyImport import lazyImport
 from Base.Workpiece import Workpiece
 
-from EagleImport.EagleBrd import EagleBrd
+# the importers are only imported when a file of their type is imported
+DrillDeduplication = lazyImport('Algorithms.DrillDeduplication')
+EagleBrd = lazyImport('EagleImport.EagleBrd')
+Excellon = lazyImport('GerberImport.Excellon')
+Gerber = lazyImport('GerberImport.Gerber')
 
 class ImportFactory(object):
     """
     Static class that imports boards into ESCMillPCB classes
+
+    Imported workpieces are kept in the import cache if one is set (see :meth:`setCache`). The importer
+    versions are part of the cache keys and have to be increased whenever an importer produces different
+    workpieces.
     """
+    
+    # importer versions by file type
+    versions = {'eagle':2, 'excellon':2, 'gerber':1}
+    
+    # drills closer than this distance (mm) are merged into the largest of them
+    drillTolerance = 0.01
+    
+    # import cache, see setCache()
+    cache = None
 
     def __init__(self):
         """
@@ -42,19 +59,88 @@ class ImportFactory(object):
         **Value**      **Description**
         =============  ===================================================================
         "eagle"        Eagle \*.brd files
+        "excellon"     Excellon drill files (holes only)
+        "gerber"       Gerber outline files, e.g. \*.gko, \*.gm1 (millings only)
         =============  ===================================================================
         """
+        if not filetype in cls.versions:
+            raise ValueError("Invalid type.")
+        key = None
+        if cls.cache is not None:
+            with open(filepath, 'rb') as fhnd:
+                key = cls.cache.getKey(fhnd.read(), filetype, cls.versions[filetype], cls.drillTolerance)
+            workpiece = cls.cache.load(key)
+            if workpiece is not None:
+                logger.info("Imported %s from the import cache.", filepath)
+                return workpiece
         if filetype == "eagle":
             logger.debug("Importing file %s as Eagle Board.", filepath)
-            brd = EagleBrd()
+            brd = EagleBrd.EagleBrd()
             brd.importBrd(filepath)
-            return cls._importEagleBrd(brd)
-        else:
-            raise ValueError("Invalid type.")
+            workpiece = cls._importEagleBrd(brd)
+        elif filetype == "excellon":
+            logger.debug("Importing file %s as Excellon drill file.", filepath)
+            drl = Excellon.ExcellonDrill()
+            drl.importDrl(filepath)
+            workpiece = Workpiece()
+            workpiece.appendHoles(*cls._deduplicateDrills(*drl.getDrills()))
+        elif filetype == "gerber":
+            logger.debug("Importing file %s as Gerber outline.", filepath)
+            gbr = Gerber.GerberOutline()
+            gbr.importGbr(filepath)
+            workpiece = cls._importGerberOutline(gbr)
+        if key is not None:
+            cls.cache.store(key, workpiece)
+        return workpiece
+    
+    
+    @classmethod
+    def importFiles(cls, files):
+        """
+        Imports several files of a board, e.g. an Excellon drill file and a Gerber outline, and returns a
+        workpiece containing the holes and millings of all files.
+
+        :param files: (filepath, filetype) of the files (see :meth:`importFile`)
+        :type files: list(tuple(str, str))
+        """
+        workpiece = Workpiece()
+        for filepath, filetype in files:
+            imported = cls.importFile(filepath, filetype)
+            for hole in imported.holeList:
+                workpiece.appendHole(hole)
+            for milling in imported.millingList:
+                workpiece.appendMilling(milling)
+        return workpiece
+    
+    
+    @classmethod
+    def setCache(cls, cache):
+        """
+        Sets the import cache used by :meth:`importFile`.
+
+        :param Base.ImportCache.ImportCache cache: Import cache or None to disable caching
+        """
+        cls.cache = cache
         
         
-    @staticmethod
-    def _importEagleBrd(brd):
+    @classmethod
+    def _deduplicateDrills(cls, sizes, positions):
+        """
+        Merges coincident drills (see :func:`Algorithms.DrillDeduplication.deduplicate`).
+
+        :param np.array sizes: (n,) drill sizes
+        :param np.array positions: (n, 2) drill positions
+        :returns: remaining drill sizes and positions
+        :rtype: tuple(np.array, np.array)
+        """
+        sizes, positions, removed = DrillDeduplication.deduplicate(sizes, positions, cls.drillTolerance)
+        if removed:
+            logger.info("Removed %s coincident drills.", removed)
+        return sizes, positions
+    
+    
+    @classmethod
+    def _importEagleBrd(cls, brd):
         """
         Imports an EagleBrd class.
 
@@ -62,9 +148,7 @@ class ImportFactory(object):
         """
         workpiece = Workpiece()
         # import holes
-        for eaglehole in brd.getDrillsAbsolute():
-            hole = mo.Hole(eaglehole.drillsize, eaglehole.position[:])
-            workpiece.appendHole(hole)
+        workpiece.appendHoles(*cls._deduplicateDrills(*brd.getDrillsAbsolute()))
         # import millings
         for linemill in brd.lineMillings:
             milling = mo.Milling()
@@ -81,4 +165,23 @@ class ImportFactory(object):
             path = mo.ArcPath.createCircle(circlemill.radius, circlemill.center)
             milling.append(path)
             workpiece.appendMilling(milling)
+        return workpiece
+    
+    
+    @staticmethod
+    def _importGerberOutline(gbr):
+        """
+        Imports a GerberOutline class.
+
+        :param GerberImport.Gerber.GerberOutline gbr: Object to import from
+        """
+        workpiece = Workpiece()
+        for start, end in gbr.lineMillings:
+            milling = mo.Milling()
+            milling.append(mo.StraightPath(start, end))
+            workpiece.appendMilling(milling)
+        for start, end, center, angle, ccw in gbr.arcMillings:
+            milling = mo.Milling()
+            milling.append(mo.ArcPath(start, end, center, angle, ccw))
+            workpiece.appendMilling(milling)
         return workpiece
\ No newline at end of file
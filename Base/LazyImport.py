@@ -0,0 +1,155 @@
+"""
+Created on 19.10.2026
+"""
+
+import logging
+logger = logging.getLogger(__name__)
+
+import importlib.util
+import sys
+import time
+
+
+def lazyImport(name):
+    """
+    Imports a module on first attribute access. Used for modules with expensive imports (e.g. networkx,
+    widgets and importers) which are not needed to show the main window.
+
+    Only the optimizer algorithms, the importers, the cycle control and testpanel dialogs and
+    pyqtgraph.CustomWidgets are deferred. pyqtgraph itself (graphics items, widgets and exporters),
+    the machine drivers (including serial, their parameter definitions are part of the default settings)
+    and ui.Resources are still imported at startup.
+
+    :param str name: Absolute module name, e.g. "Algorithms.TSPOptimizer"
+    :returns: Module, executed as soon as one of its attributes is accessed
+    :rtype: module
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ImportError("No module named {}".format(name), name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+
+class _TimedLoader(object):
+    """
+    Loader wrapper measuring the execution time of a module (see :class:`ImportTimer`)
+    """
+
+    def __init__(self, loader, timer, name):
+        self.loader = loader
+        self.timer = timer
+        self.name = name
+
+
+    def __getattr__(self, name):
+        return getattr(self.loader, name)
+
+
+    def create_module(self, spec):
+        return self.loader.create_module(spec)
+
+
+    def exec_module(self, module):
+        self.timer.enter(self.name)
+        try:
+            self.loader.exec_module(module)
+        finally:
+            self.timer.leave(self.name)
+
+
+class ImportTimer(object):
+    """
+    Measures the import time of each module imported while installed, similar to "python -X importtime".
+    The self time of a module excludes the modules imported by it, the cumulative time includes them.
+
+    Installed at startup (see ESCMillPCB.py), :meth:`logReport` lists the most expensive imports.
+    """
+
+    def __init__(self):
+        """
+        Constructor
+        """
+        # (self time, cumulative time) in s by module name
+        self.timings = {}
+        self.stack = []
+        self.start = None
+
+
+    def install(self):
+        """
+        Starts measuring imports.
+        """
+        if not self in sys.meta_path:
+            sys.meta_path.insert(0, self)
+        self.start = time.perf_counter()
+
+
+    def uninstall(self):
+        """
+        Stops measuring imports.
+        """
+        if self in sys.meta_path:
+            sys.meta_path.remove(self)
+
+
+    def find_spec(self, name, path, target=None):
+        """
+        Meta path finder protocol, wraps the loader of the spec found by the other finders.
+        """
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, 'find_spec'):
+                continue
+            spec = finder.find_spec(name, path, target)
+            if spec is not None:
+                if spec.loader is not None and hasattr(spec.loader, 'exec_module'):
+                    spec.loader = _TimedLoader(spec.loader, self, name)
+                return spec
+        return None
+
+
+    def enter(self, name):
+        """
+        Called before a module is executed.
+        """
+        self.stack.append([name, time.perf_counter(), 0])
+
+
+    def leave(self, name):
+        """
+        Called after a module is executed.
+        """
+        name, start, children = self.stack.pop()
+        cumulative = time.perf_counter() - start
+        self.timings[name] = (cumulative - children, cumulative)
+        if self.stack:
+            self.stack[-1][2] += cumulative
+
+
+    def getReport(self, count=20):
+        """
+        :param int count: Number of modules
+        :returns: (module, self time, cumulative time) of the modules with the highest self time
+        :rtype: list(tuple(str, float, float))
+        """
+        report = sorted(self.timings.items(), key=lambda item: item[1][0], reverse=True)[:count]
+        return [(name, selftime, cumulative) for name, (selftime, cumulative) in report]
+
+
+    def logReport(self, count=20):
+        """
+        Logs the total time since :meth:`install` and the most expensive imports.
+
+        :param int count: Number of modules
+        """
+        total = time.perf_counter() - self.start
+        imports = sum(selftime for selftime, cumulative in self.timings.values())
+        logger.info("Startup took %.3f s, %.3f s importing %s modules.", total, imports, len(self.timings))
+        for name, selftime, cumulative in self.getReport(count):
+            logger.debug("Import %-50s self %7.1f ms, cumulative %7.1f ms", name, selftime*1e3, cumulative*1e3)
@@ -13,6 +13,7 @@ import pyqtgraph.parametertree.parameterTypes as ptypes
 
 import Base.Utility as util
 import Base.Errors as errs
+from Base.StatusStore import StatusStore
 
 
 class MachineBase(QtCore.QObject):
@@ -35,17 +36,28 @@ class MachineBase(QtCore.QObject):
     ==========================  ===================================================================================
     **Signals**
     ==========================  ===================================================================================
-    sigNewCoordinates           Emitted when new coordinates are present. Carries a dictionary
+    sigNewCoordinates           Emitted when new coordinates are present (at most once per publication interval
+                                of the status store). Carries a dictionary
                                 {"absolute":(x,y,z) absolute position of the machine,
                                 "workpiece":(x,y,z) position of the machine on the board}
     sigStatusUpdate             Emitted when the machine status changed. Carries a string with the status message.
     sigCycleCompleted           Emitted when the machining cycle is finished.
+    sigCheckpoint               Emitted during a cycle when the execution reaches another machining object and at
+                                the end of the cycle. Carries a checkpoint dictionary
+                                {"index": index of the machining object, "count": number of machining objects,
+                                "description": description of the machining object,
+                                "completed": True if the cycle ran to its end}
     ==========================  ===================================================================================
+
+    The machine state displayed by the GUI is collected in the :attr:`status` store
+    (see :class:`Base.StatusStore.StatusStore`). GUI elements subscribe to the fields they display, e.g.
+    "absolute" and "workpiece" for the coordinates, and are updated at a bounded rate.
     """
     
     sigNewCoordinates = QtCore.pyqtSignal(dict)
     sigStatusUpdate = QtCore.pyqtSignal(str)
     sigCycleCompleted = QtCore.pyqtSignal()
+    sigCheckpoint = QtCore.pyqtSignal(dict)
     
 
     def __init__(self):
@@ -64,6 +76,9 @@ class MachineBase(QtCore.QObject):
         self.defaultOrigin = [0, 0, 0]
         self.laseroffset = [0, 0]
         self.coordinateInterval = 500
+        # coalescing store for the displayed machine state
+        self.status = StatusStore(parent=self)
+        self.status.subscribe(('absolute', 'workpiece'), self.status_coordinatesChanged)
         # initialize coordinate update timer
         self.coordinateTimer = QtCore.QTimer(self)
         self.coordinateTimer.setInterval(self.coordinateInterval)
@@ -244,6 +259,16 @@ class MachineBase(QtCore.QObject):
         return False;
     
     
+    def isIdle(self):
+        """
+        (abstract, optional)
+
+        Returns if the machine is not moving. The status is expected to change together with
+        the :attr:`sigStatusUpdate` signal.
+        """
+        return True
+    
+    
     def preparePlanner(self):
         """
         (abstract)
@@ -262,6 +287,21 @@ class MachineBase(QtCore.QObject):
         raise errs.ImplementationMissing("MachineBase.finalizePlanner")
     
     
+    def planCheckpoint(self, index, count, description):
+        """
+        (abstract, optional)
+
+        Marks the start of a machining object in the planned program. Machines supporting checkpoints
+        track which machining object is executed and emit :attr:`sigCheckpoint`, so an interrupted cycle
+        can be resumed from that object.
+
+        :param int index: Index of the machining object (see :meth:`Base.Workpiece.Workpiece.getMachiningObjects`)
+        :param int count: Number of machining objects
+        :param str description: Description of the machining object
+        """
+        pass
+    
+    
     def planJog(self, position):
         """
         (abstract)
@@ -331,6 +371,71 @@ class MachineBase(QtCore.QObject):
         raise errs.ImplementationMissing("MachineBase.executeCycle")
     
     
+    def estimateCycleTime(self):
+        """
+        (abstract, optional)
+
+        Estimates the duration of the planned work cycle.
+
+        :returns: Dictionary {"total": estimated time in s, "phases": {phase: time in s}, "segments": number
+                  of motion segments} (see :func:`Algorithms.MotionEstimator.estimateCycleTime`)
+                  or None if not available
+        :rtype: dict
+        """
+        return None
+    
+    
+    def submitQueries(self, commands, callback):
+        """
+        (abstract, optional)
+
+        Sends several commands without waiting for the responses.
+        The callback is called with the list of responses (in the order of the commands) when all
+        responses are received.
+
+        :param list commands: Machine specific commands
+        :param callable callback: Function called with the list of responses
+        :returns: Query id (see :meth:`cancelQueries`)
+        :rtype: int
+        """
+        raise errs.ImplementationMissing("MachineBase.submitQueries")
+    
+    
+    def cancelQueries(self, queryid):
+        """
+        (abstract, optional)
+
+        Cancels a query submitted by :meth:`submitQueries`. Commands which are not sent yet are discarded
+        and the callback is not called anymore.
+
+        :param int queryid: Query id returned by :meth:`submitQueries`
+        """
+        raise errs.ImplementationMissing("MachineBase.cancelQueries")
+    
+    
+    def exportProgram(self, filepath):
+        """
+        (abstract, optional)
+
+        Writes the planned work cycle to a g-code file.
+
+        :param str filepath: Path to the g-code file
+        """
+        raise errs.ImplementationMissing("MachineBase.exportProgram")
+    
+    
+    def loadProgram(self, filepath):
+        """
+        (abstract, optional)
+
+        Loads a g-code file as work cycle which can then be run by :meth:`executeCycle`.
+        The file should be streamed while spooling and not be loaded into memory at once.
+
+        :param str filepath: Path to the g-code file
+        """
+        raise errs.ImplementationMissing("MachineBase.loadProgram")
+
+
     def setWorkpieceOrigin(self, offset=(0, 0)):
         """
         (abstract)
@@ -512,7 +617,16 @@ class MachineBase(QtCore.QObject):
     @QtCore.pyqtSlot()
     def coordinateTimer_timeout(self):
         if self.isInitialized():
-            self.sigNewCoordinates.emit({'absolute':self.getPosition(True), 'workpiece':self.getPosition(False)})
+            self.status.update({'absolute':self.getPosition(True), 'workpiece':self.getPosition(False)})
+    
+    
+    def status_coordinatesChanged(self, status):
+        """
+        Status store subscription, emits the sigNewCoordinates signal.
+
+        :param dict status: status snapshot
+        """
+        self.sigNewCoordinates.emit({'absolute':status['absolute'], 'workpiece':status['workpiece']})
     
     
     @staticmethod
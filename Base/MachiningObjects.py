@@ -128,6 +128,16 @@ class HoleList(MachiningObject):
         """
         self.holes.append(hole)
         
+        
+    def appendHoles(self, diameters, centers):
+        """
+        Add holes to the HoleList
+
+        :param np.array diameters: (n,) hole diameters
+        :param np.array centers: (n, 2) hole center coordinates
+        """
+        self.holes.extend(Hole(diameter, center) for diameter, center in zip(diameters.tolist(), centers))
+        
     
     def reorder(self, order):
         """
@@ -231,6 +241,10 @@ class Hole(MachiningObject):
             machine.planOutfeed()
             
             
+    def __str__(self):
+        return "Hole {:.2f} mm at ({:.3f}, {:.3f})".format(self.diameter, *self.center)
+            
+            
     def translate(self, offset):
         """
         See :meth:`MachiningObject.translate`
@@ -575,6 +589,12 @@ class Milling(MachiningObject):
         machine.planOutfeed()
         
         
+    def __str__(self):
+        if not len(self):
+            return "Milling (empty)"
+        return "Milling with {} paths from ({:.3f}, {:.3f})".format(len(self), *self.getStart())
+        
+        
     def translate(self, offset):
         """
         See :meth:`MachiningObject.translate`
@@ -0,0 +1,145 @@
+"""
+Created on 19.10.2026
+"""
+
+import logging
+logger = logging.getLogger(__name__)
+
+import math
+import time
+
+from PyQt5 import QtCore
+
+
+class StatusStore(QtCore.QObject):
+    """
+    Coalescing store for the machine state displayed by the GUI.
+
+    Status updates (e.g. the deltas of status reports, buffer states, coordinates) are merged into a single
+    state dictionary as they arrive. Snapshots of the state are published at most once per interval, and
+    only to the subscribers of fields which changed since the last publication. This keeps the GUI load
+    bounded no matter how often the machine reports.
+
+    The current state is always available by :meth:`value` and :meth:`snapshot`, e.g. for control logic
+    which must not miss updates.
+
+    The store lives in the GUI thread; updates from worker threads have to be passed by (queued) signals
+    connected to :meth:`update`.
+
+    ===================  ===================================================================================
+    **Signals**
+    ===================  ===================================================================================
+    sigPublished         Emitted when a snapshot is published.
+                         Carries the snapshot and the list of changed fields.
+    ===================  ===================================================================================
+    """
+
+    sigPublished = QtCore.pyqtSignal(dict, list)
+
+    def __init__(self, interval=100, parent=None):
+        """
+        Constructor
+
+        :param int interval: Minimal interval between two publications in ms
+        """
+        super().__init__(parent)
+        self.state = {}
+        self.changed = set()
+        self.subscriptions = []
+        self.interval = interval
+        self.lastPublished = 0.0
+        self.timer = QtCore.QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.publish)
+
+
+    @QtCore.pyqtSlot(dict)
+    def update(self, fields):
+        """
+        Merges changed fields into the state and schedules a publication.
+
+        :param dict fields: {field: value}
+        """
+        for field, value in fields.items():
+            if not field in self.state or self.state[field] != value:
+                self.state[field] = value
+                self.changed.add(field)
+        if len(self.changed) > 0 and not self.timer.isActive():
+            wait = self.lastPublished + self.interval/1000 - time.perf_counter()
+            self.timer.start(max(0, math.ceil(wait*1000)))
+
+
+    def value(self, field, default=None):
+        """
+        :param str field: field name
+        :param default: value returned if the field is not present
+        :returns: current (not yet published) value of the field
+        """
+        return self.state.get(field, default)
+
+
+    def snapshot(self):
+        """
+        :returns: copy of the current state
+        :rtype: dict
+        """
+        return dict(self.state)
+
+
+    def clear(self):
+        """
+        Clears the state without publishing (e.g. when the machine is reinitialized).
+        """
+        self.state.clear()
+        self.changed.clear()
+        self.timer.stop()
+
+
+    def subscribe(self, fields, callback):
+        """
+        Subscribes a callback to fields. The callback is called with a snapshot (dict) of the state when at least
+        one of the fields has changed. The current state is published to the callback immediately if one of the
+        fields is present.
+        Subscribing a callback to the same fields again has no effect.
+
+        :param fields: field names
+        :type fields: iterable(str)
+        :param callable callback: callback function
+        """
+        fields = frozenset(fields)
+        if (fields, callback) in self.subscriptions:
+            return
+        self.subscriptions.append((fields, callback))
+        if not fields.isdisjoint(self.state.keys()):
+            callback(self.snapshot())
+
+
+    def unsubscribe(self, callback):
+        """
+        Removes all subscriptions of a callback.
+
+        :param callable callback: callback function
+        """
+        self.subscriptions = [(fields, cb) for fields, cb in self.subscriptions if cb != callback]
+
+
+    @QtCore.pyqtSlot()
+    def publish(self):
+        """
+        Publishes a snapshot of the state to the subscribers of the changed fields.
+        Called by the publication timer, there is no need to call it directly.
+        """
+        self.timer.stop()
+        if len(self.changed) == 0:
+            return
+        changed = self.changed
+        self.changed = set()
+        self.lastPublished = time.perf_counter()
+        snapshot = self.snapshot()
+        for fields, callback in list(self.subscriptions):
+            if not fields.isdisjoint(changed):
+                try:
+                    callback(snapshot)
+                except Exception as e:
+                    logger.error("Status subscriber %s failed: %s", callback, e)
+        self.sigPublished.emit(snapshot, list(changed))
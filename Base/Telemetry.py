@@ -0,0 +1,216 @@
+"""
+Created on 19.10.2026
+"""
+
+import logging
+logger = logging.getLogger(__name__)
+
+import heapq
+import threading
+import time
+
+import numpy as np
+
+
+# event kinds
+LINEBUFFER = 1      # value: lines sent without response, extra: characters sent without response
+PLANNER = 2         # value: planner queue depth (used slots), extra: planner queue size
+SEND = 3            # value: bytes written, extra: number of lines written
+ACK = 4             # value: latency between sending a line and receiving its response in s
+STATUS = 5          # value: machine state, extra: velocity
+CYCLE = 6           # value: 1 at the start, 0 at the end of a cycle
+
+KINDS = {LINEBUFFER:'linebuffer', PLANNER:'planner', SEND:'send', ACK:'ack', STATUS:'status', CYCLE:'cycle'}
+
+# record layout of the ring buffer and the telemetry file (17 bytes, little endian, no padding)
+RECORD = np.dtype([('time', '<f8'), ('kind', 'u1'), ('value', '<f4'), ('extra', '<f4')])
+
+
+def readFile(filepath):
+    """
+    Reads a telemetry file written by :class:`TelemetryRecorder`.
+
+    :param str filepath: Path to the telemetry file
+    :returns: Records with the fields time (s), kind, value and extra
+    :rtype: np.ndarray(RECORD)
+    """
+    return np.fromfile(str(filepath), dtype=RECORD)
+
+
+class TelemetryRecorder(object):
+    """
+    Records timestamped spooling events (linebuffer occupancy, planner queue depth, send and acknowledge
+    latency, status reports) into a binary ring buffer. Records are appended to a file in chunks if a file
+    is given.
+
+    Between :meth:`startCycle` and :meth:`endCycle` throughput and planner starvation are accumulated, so
+    the cycle summary is available even if the ring buffer has wrapped around.
+    Events are recorded from the communication threads, all methods are thread safe.
+    """
+
+    def __init__(self, filepath=None, capacity=65536, stalls=5):
+        """
+        Constructor
+
+        :param str filepath: File to append the records to, None to keep the records in memory only
+        :param int capacity: Number of records held by the ring buffer
+        :param int stalls: Number of worst stalls reported in the cycle summary
+        """
+        self.filepath = None if filepath is None else str(filepath)
+        self.buffer = np.zeros(capacity, dtype=RECORD)
+        self.count = 0          # total number of records
+        self.flushed = 0        # number of records written to the file
+        self.stalls = stalls
+        self.lock = threading.Lock()
+        self.cycle = None
+        self.lastSummary = None
+
+
+    def record(self, kind, value, extra=0):
+        """
+        Records an event.
+
+        :param int kind: Event kind (e.g. :data:`PLANNER`)
+        :param float value: Event value
+        :param float extra: Additional event value
+        """
+        now = time.perf_counter()
+        with self.lock:
+            self.buffer[self.count % len(self.buffer)] = (now, kind, value, extra)
+            self.count += 1
+            if self.cycle is not None:
+                self._accumulate(now, kind, value)
+            if self.count - self.flushed >= len(self.buffer)//2:
+                self._flush()
+
+
+    def _accumulate(self, now, kind, value):
+        """
+        Updates the cycle statistics with an event. Must be called with the lock held.
+        """
+        cycle = self.cycle
+        if kind == ACK:
+            cycle['lines'] += 1
+            cycle['latency'] += value
+            cycle['maxLatency'] = max(cycle['maxLatency'], value)
+        elif kind == PLANNER:
+            if value == 0:
+                # planner ran empty, starvation counts only after the planner has been filled once
+                if cycle['emptySince'] is None and cycle['filled']:
+                    cycle['emptySince'] = now
+            else:
+                cycle['filled'] = True
+                if cycle['emptySince'] is not None:
+                    duration = now - cycle['emptySince']
+                    cycle['starved'] += duration
+                    stall = (duration, cycle['emptySince'] - cycle['start'])
+                    if len(cycle['stalls']) < self.stalls:
+                        heapq.heappush(cycle['stalls'], stall)
+                    else:
+                        heapq.heappushpop(cycle['stalls'], stall)
+                    cycle['emptySince'] = None
+
+
+    def startCycle(self):
+        """
+        Marks the start of a cycle and resets the cycle statistics.
+        """
+        self.record(CYCLE, 1)
+        with self.lock:
+            self.cycle = {
+                'start':time.perf_counter(), 'lines':0, 'latency':0.0, 'maxLatency':0.0,
+                'filled':False, 'emptySince':None, 'starved':0.0, 'stalls':[]
+            }
+
+
+    def endCycle(self):
+        """
+        Marks the end of a cycle, logs and returns the cycle summary.
+        A planner running empty at the end of the cycle is not counted as starvation.
+
+        :returns: Summary {"duration": s, "lines": acknowledged lines, "linesPerSecond",
+                  "starved": s, "starvedPercent", "meanLatency": s, "maxLatency": s,
+                  "stalls": [(duration in s, offset from cycle start in s), ...] longest first}
+                  or None if no cycle was started
+        :rtype: dict
+        """
+        with self.lock:
+            cycle = self.cycle
+            self.cycle = None
+        if cycle is None:
+            return None
+        self.record(CYCLE, 0)
+        duration = time.perf_counter() - cycle['start']
+        summary = {
+            'duration':duration,
+            'lines':cycle['lines'],
+            'linesPerSecond':cycle['lines']/duration if duration > 0 else 0.0,
+            'starved':cycle['starved'],
+            'starvedPercent':100*cycle['starved']/duration if duration > 0 else 0.0,
+            'meanLatency':cycle['latency']/cycle['lines'] if cycle['lines'] > 0 else 0.0,
+            'maxLatency':cycle['maxLatency'],
+            'stalls':sorted(cycle['stalls'], reverse=True)
+        }
+        self.lastSummary = summary
+        logger.info("Cycle telemetry: %.1f s, %s lines (%.1f lines/s), planner starved %.2f s (%.1f %%), "
+                    "ack latency %.1f ms mean / %.1f ms max, worst stalls: %s",
+                    duration, summary['lines'], summary['linesPerSecond'], summary['starved'],
+                    summary['starvedPercent'], summary['meanLatency']*1000, summary['maxLatency']*1000,
+                    ", ".join("{:.0f} ms at {:.1f} s".format(d*1000, t) for d, t in summary['stalls']) or "none")
+        self.flush()
+        return summary
+
+
+    def getRecords(self):
+        """
+        :returns: Records held by the ring buffer in chronological order
+        :rtype: np.ndarray(RECORD)
+        """
+        with self.lock:
+            size = len(self.buffer)
+            if self.count <= size:
+                return self.buffer[:self.count].copy()
+            start = self.count % size
+            return np.concatenate((self.buffer[start:], self.buffer[:start]))
+
+
+    def flush(self):
+        """
+        Appends all records not yet written to the file.
+        """
+        with self.lock:
+            self._flush()
+
+
+    def _flush(self):
+        """
+        Appends all records not yet written to the file. Must be called with the lock held.
+        """
+        if self.filepath is None:
+            self.flushed = self.count
+            return
+        size = len(self.buffer)
+        # records overwritten before they could be written are lost
+        first = max(self.flushed, self.count - size)
+        if first >= self.count:
+            return
+        start = first % size
+        end = self.count % size
+        try:
+            with open(self.filepath, 'ab') as file:
+                if end > start:
+                    self.buffer[start:end].tofile(file)
+                else:
+                    self.buffer[start:].tofile(file)
+                    self.buffer[:end].tofile(file)
+        except OSError as e:
+            logger.error("Writing telemetry to %s failed: %s", self.filepath, e)
+        self.flushed = self.count
+
+
+    def close(self):
+        """
+        Ends a running cycle and writes the remaining records.
+        """
+        self.endCycle()
+        self.flush()
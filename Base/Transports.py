@@ -0,0 +1,421 @@
+"""
+Created on 19.10.2026
+"""
+
+import logging
+logger = logging.getLogger(__name__)
+
+import select
+import socket
+import threading
+import serial
+
+import Base.Errors as errs
+
+
+class Transport(object):
+    """
+    Base class for byte stream connections to a machine.
+
+    Writes are passed to the (buffered) operating system or peer without waiting for the machine.
+    Reads block at most for the given timeout and return all data available at once.
+    """
+
+    def __init__(self):
+        """
+        Constructor
+        """
+        pass
+
+
+    def open(self):
+        """
+        (abstract)
+
+        Opens the connection.
+        """
+        raise errs.ImplementationMissing("Transport.open")
+
+
+    def close(self):
+        """
+        (abstract)
+
+        Closes the connection.
+        """
+        raise errs.ImplementationMissing("Transport.close")
+
+
+    def isOpen(self):
+        """
+        (abstract)
+
+        :returns: True if the connection is open
+        :rtype: bool
+        """
+        return False
+
+
+    def write(self, data):
+        """
+        (abstract)
+
+        :param bytes data: Data to write
+        """
+        raise errs.ImplementationMissing("Transport.write")
+
+
+    def read(self, timeout):
+        """
+        (abstract)
+
+        Waits up to timeout seconds for data and returns all available data.
+
+        :param float timeout: Timeout in s
+        :returns: Received data (empty on timeout)
+        :rtype: bytes
+        """
+        raise errs.ImplementationMissing("Transport.read")
+
+
+    def resetInputBuffer(self):
+        """
+        (abstract, optional)
+
+        Discards all received but not yet read data.
+        """
+        pass
+
+
+    def resetOutputBuffer(self):
+        """
+        (abstract, optional)
+
+        Discards all written but not yet transmitted data.
+        """
+        pass
+
+
+
+class SerialTransport(Transport):
+    """
+    Connection via a serial port (pyserial).
+    """
+
+    def __init__(self, port, baudrate=115200, flowctrl=0):
+        """
+        Constructor
+
+        :param str port: Serial port (e.g. "COM3" or "/dev/ttyUSB0")
+        :param int baudrate: Baud rate
+        :param int flowctrl: Flow control (0: none, 1: XON/XOFF, 2: RTS/CTS)
+        """
+        super().__init__()
+        self.port = port
+        self.baudrate = baudrate
+        self.flowctrl = flowctrl
+        self.serial = None
+
+
+    def open(self):
+        """
+        See :meth:`Transport.open`
+        """
+        self.serial = serial.Serial(
+            port=self.port,
+            baudrate=self.baudrate,
+            timeout=0,
+            xonxoff=self.flowctrl==1,
+            rtscts=self.flowctrl==2
+        )
+
+
+    def close(self):
+        """
+        See :meth:`Transport.close`
+        """
+        if self.serial is not None:
+            self.serial.close()
+            self.serial = None
+
+
+    def isOpen(self):
+        """
+        See :meth:`Transport.isOpen`
+        """
+        return self.serial is not None
+
+
+    def write(self, data):
+        """
+        See :meth:`Transport.write`
+        """
+        self.serial.write(data)
+
+
+    def read(self, timeout):
+        """
+        See :meth:`Transport.read`
+        """
+        port = self.serial
+        if port is None:
+            raise errs.CommunicationError("read", "Port closed")
+        if port.timeout != timeout:
+            # changing the timeout reconfigures the port
+            port.timeout = timeout
+        return port.read(max(1, port.in_waiting))
+
+
+    def resetInputBuffer(self):
+        """
+        See :meth:`Transport.resetInputBuffer`
+        """
+        self.serial.reset_input_buffer()
+
+
+    def resetOutputBuffer(self):
+        """
+        See :meth:`Transport.resetOutputBuffer`
+        """
+        self.serial.reset_output_buffer()
+
+
+    def __str__(self):
+        return "{} ({} baud)".format(self.port, self.baudrate)
+
+
+
+class TCPTransport(Transport):
+    """
+    Connection via a raw TCP socket, e.g. to a serial port shared by ser2net.
+    """
+
+    def __init__(self, host, port, connecttimeout=5):
+        """
+        Constructor
+
+        :param str host: Host name or address
+        :param int port: TCP port
+        :param float connecttimeout: Timeout for establishing the connection in s
+        """
+        super().__init__()
+        self.host = host
+        self.port = port
+        self.connecttimeout = connecttimeout
+        self.socket = None
+
+
+    def open(self):
+        """
+        See :meth:`Transport.open`
+        """
+        self.socket = socket.create_connection((self.host, self.port), self.connecttimeout)
+        # send short command lines immediately
+        self.socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.socket.settimeout(None)
+
+
+    def close(self):
+        """
+        See :meth:`Transport.close`
+        """
+        if self.socket is not None:
+            try:
+                self.socket.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            self.socket.close()
+            self.socket = None
+
+
+    def isOpen(self):
+        """
+        See :meth:`Transport.isOpen`
+        """
+        return self.socket is not None
+
+
+    def write(self, data):
+        """
+        See :meth:`Transport.write`
+        """
+        self.socket.sendall(data)
+
+
+    def read(self, timeout):
+        """
+        See :meth:`Transport.read`
+        """
+        sock = self.socket
+        if sock is None:
+            raise errs.CommunicationError("read", "Socket closed")
+        readable, _, _ = select.select([sock], [], [], timeout)
+        if len(readable) == 0:
+            return b""
+        data = sock.recv(65536)
+        if len(data) == 0:
+            raise errs.CommunicationError("read", "Connection closed by peer")
+        return data
+
+
+    def resetInputBuffer(self):
+        """
+        See :meth:`Transport.resetInputBuffer`
+        """
+        while len(select.select([self.socket], [], [], 0)[0]) > 0:
+            if len(self.socket.recv(65536)) == 0:
+                break
+
+
+    def __str__(self):
+        return "{}:{}".format(self.host, self.port)
+
+
+
+class PipeTransport(Transport):
+    """
+    In-memory connection, e.g. to a simulated machine or for tests and benchmarks without hardware.
+    Use :meth:`createPair` to create two connected ends.
+    """
+
+    def __init__(self):
+        """
+        Constructor
+        """
+        super().__init__()
+        self.buffer = bytearray()
+        self.condition = threading.Condition()
+        self.peer = None
+        self.opened = False
+
+
+    @classmethod
+    def createPair(cls):
+        """
+        :returns: Two connected pipe ends
+        :rtype: tuple(PipeTransport, PipeTransport)
+        """
+        first = cls()
+        second = cls()
+        first.peer = second
+        second.peer = first
+        return first, second
+
+
+    def open(self):
+        """
+        See :meth:`Transport.open`
+        """
+        self.opened = True
+
+
+    def close(self):
+        """
+        See :meth:`Transport.close`
+        """
+        with self.condition:
+            self.opened = False
+            self.condition.notify_all()
+
+
+    def isOpen(self):
+        """
+        See :meth:`Transport.isOpen`
+        """
+        return self.opened
+
+
+    def write(self, data):
+        """
+        See :meth:`Transport.write`
+        """
+        self.peer.feed(data)
+
+
+    def feed(self, data):
+        """
+        Appends data to the receive buffer of this end.
+
+        :param bytes data: Received data
+        """
+        with self.condition:
+            self.buffer += data
+            self.condition.notify_all()
+
+
+    def read(self, timeout):
+        """
+        See :meth:`Transport.read`
+        """
+        with self.condition:
+            if len(self.buffer) == 0 and self.opened:
+                self.condition.wait(timeout)
+            if not self.opened:
+                raise errs.CommunicationError("read", "Pipe closed")
+            data = bytes(self.buffer)
+            self.buffer.clear()
+        return data
+
+
+    def resetInputBuffer(self):
+        """
+        See :meth:`Transport.resetInputBuffer`
+        """
+        with self.condition:
+            self.buffer.clear()
+
+
+    def __str__(self):
+        return "in-memory pipe"
+
+
+def createTransport(comparams):
+    """
+    Creates a (not opened) transport from the transport communication parameters
+    (see :func:`getTransportParameters`).
+
+    :param pyqtgraph.GroupParameter comparams: GroupParameter containing the communication parameters
+    :returns: Transport
+    :rtype: Transport
+    """
+    transport = comparams.child('transport').value()
+    if transport == 0:
+        return SerialTransport(
+            comparams.child('com').value(),
+            comparams.child('baud').value(),
+            comparams.child('flowctrl').value()
+        )
+    elif transport == 1:
+        return TCPTransport(comparams.child('host').value(), comparams.child('tcpport').value())
+    raise errs.InvalidArgument('transport', 'Invalid transport.')
+
+
+def getTransportParameters():
+    """
+    :returns: Parameters for selecting the transport, to be added to a machine's communication parameters.
+              Serial parameters ("com", "baud", "flowctrl") are machine specific.
+    :rtype: list(dict)
+    """
+    return [
+        {
+            'name':'transport',
+            'title':'Connection',
+            'type':'list',
+            'values':{'Serial Port':0, 'TCP (ser2net)':1},
+            'value':'Serial Port'
+        },
+        {
+            'name':'host',
+            'title':'TCP Host',
+            'type':'str',
+            'value':'localhost'
+        },
+        {
+            'name':'tcpport',
+            'title':'TCP Port',
+            'type':'int',
+            'limits':(1, 65535),
+            'default':2000,
+            'value':2000
+        }
+    ]
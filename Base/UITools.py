@@ -10,21 +10,54 @@ import logging
 logger = logging.getLogger(__name__)
 
 import glob
+import hashlib
+import json
 import os
+import subprocess
 import sys
+import xml.etree.ElementTree as ET
 #import re
 
+
+# manifest of the generated files, hash of the inputs by output path
+manifestPath = os.path.join('ui', 'build_manifest.json')
+
+
 def convertUI():
     """
     Converts Qt *.ui files to python files.
+    Only outdated files are converted (see :func:`convertOutdated`).
+    """
+    convertOutdated(_uiJobs())
+
+
+def convertResources():
+    """
+    Converts Qt *.qrc files to python files.
+    Only outdated files are converted (see :func:`convertOutdated`).
+    """
+    convertOutdated(_resourceJobs())
+
+
+def convertAll():
+    """
+    Converts all outdated Qt *.ui and *.qrc files at once.
+    """
+    convertOutdated(_uiJobs() + _resourceJobs())
+
+
+def _uiJobs():
+    """
+    :returns: conversion jobs of the Qt *.ui files (see :func:`convertOutdated`)
+    :rtype: list(tuple(list(str), str, list(str)))
     """
-    for ui_path in glob.iglob(r'resources\ui\*.ui'):
-        base_path=r'ui\templates'
-        class_name = ui_path.split('\\')[-1][:-3]
+    jobs = []
+    base_path = os.path.join('ui', 'templates')
+    for ui_path in glob.iglob(os.path.join('resources', 'ui', '*.ui')):
+        class_name = os.path.splitext(os.path.basename(ui_path))[0]
         ui_class_name = "Ui_" + class_name
-        ui_class_path = os.path.join(base_path, ui_class_name + '.py')
-        logger.info('Converting "{}" to "{}"'.format(ui_path, ui_class_path))
-        os.system('{} -m PyQt5.uic.pyuic {} -o {}'.format(sys.executable, ui_path, ui_class_path))
+        ui_class_path = _existingPath(os.path.join(base_path, ui_class_name + '.py'))
+        jobs.append(([ui_path], ui_class_path, [sys.executable, '-m', 'PyQt5.uic.pyuic', ui_path, '-o', ui_class_path]))
         #         if not os.path.exists(os.path.join(base_path, class_name + '.py')):
         #             with open(ui_path, 'r') as ui_file:
         #                 print(class_name)
@@ -45,15 +78,97 @@ def convertUI():
         #                      '\n',
         #                      '        super({}, self).__init__(parent)\n'.format(class_name),
         #                      '        self.setupUi(self)\n'])
-        
+    return jobs
 
-def convertResources():
+
+def _resourceJobs():
     """
-    Converts Qt *.qrc files to python files.
+    :returns: conversion jobs of the Qt *.qrc files, the inputs include the referenced files
+              (see :func:`convertOutdated`)
+    :rtype: list(tuple(list(str), str, list(str)))
     """
-    for qrc_path in glob.iglob(r'resources\*.qrc'):
-        base_path=r'ui'
+    jobs = []
+    base_path = 'ui'
+    for qrc_path in glob.iglob(os.path.join('resources', '*.qrc')):
         module_name, _ = os.path.splitext(os.path.basename(qrc_path))
-        module_path = os.path.join(base_path, module_name + '.py')
-        logger.info('Converting "{}" to "{}"'.format(qrc_path, module_path))
-        os.system('{} -m PyQt5.pyrcc_main {} -o {}'.format(sys.executable, qrc_path, module_path))
\ No newline at end of file
+        module_path = _existingPath(os.path.join(base_path, module_name + '.py'))
+        inputs = [qrc_path]
+        try:
+            for element in ET.parse(qrc_path).iter('file'):
+                inputs.append(os.path.join(os.path.dirname(qrc_path), element.text.strip()))
+        except ET.ParseError as e:
+            logger.warning('Invalid resource file "{}": {}'.format(qrc_path, e))
+        jobs.append((inputs, module_path, [sys.executable, '-m', 'PyQt5.pyrcc_main', qrc_path, '-o', module_path]))
+    return jobs
+
+
+def _existingPath(path):
+    """
+    :returns: path of an existing file matching the path case-insensitively (the names of the *.ui files
+              differ in case from the generated files), otherwise the path itself
+    :rtype: str
+    """
+    directory, name = os.path.split(path)
+    if os.path.isdir(directory) and not os.path.exists(path):
+        for existing in os.listdir(directory):
+            if existing.lower() == name.lower():
+                return os.path.join(directory, existing)
+    return path
+
+
+def hashInputs(inputs, command):
+    """
+    :param list(str) inputs: Input files
+    :param list(str) command: Conversion command, the generator is part of the hash
+    :returns: Hash of the names and contents of the input files, None if an input file is missing
+    :rtype: str
+    """
+    sha = hashlib.sha1(' '.join(command[1:3]).encode())
+    for path in inputs:
+        try:
+            with open(path, 'rb') as fhnd:
+                content = fhnd.read()
+        except OSError:
+            return None
+        sha.update(path.replace('\\', '/').encode())
+        sha.update(hashlib.sha1(content).digest())
+    return sha.hexdigest()
+
+
+def convertOutdated(jobs):
+    """
+    Runs the conversions whose outputs are missing or whose inputs changed since the last conversion,
+    the conversions run in parallel. The hashes of the inputs are kept in the manifest (:data:`manifestPath`).
+
+    :param jobs: (input files, output file, command) of the conversions
+    :type jobs: list(tuple(list(str), str, list(str)))
+    """
+    try:
+        with open(manifestPath, 'r') as fhnd:
+            manifest = json.load(fhnd)
+    except (OSError, ValueError):
+        manifest = {}
+    processes = []
+    for inputs, output, command in jobs:
+        key = output.replace('\\', '/')
+        inputhash = hashInputs(inputs, command)
+        if inputhash is not None and manifest.get(key) == inputhash and os.path.exists(output):
+            continue
+        logger.info('Converting "{}" to "{}"'.format(inputs[0], output))
+        try:
+            processes.append((key, inputhash, output, subprocess.Popen(command)))
+        except OSError as e:
+            logger.warning('Converting "{}" failed: {}'.format(inputs[0], e))
+    if not processes:
+        return
+    for key, inputhash, output, process in processes:
+        if process.wait() == 0 and inputhash is not None:
+            manifest[key] = inputhash
+        else:
+            manifest.pop(key, None)
+            logger.warning('Converting to "{}" failed.'.format(output))
+    try:
+        with open(manifestPath, 'w') as fhnd:
+            json.dump(manifest, fhnd, indent=2, sort_keys=True)
+    except OSError as e:
+        logger.warning('Could not write "{}": {}'.format(manifestPath, e))
@@ -5,7 +5,6 @@ Created on 13.02.2018
 """
 
 import numpy as np
-from PyQt5 import QtGui, QtCore
 
 import Base.Errors as errs
 
@@ -20,6 +19,8 @@ def createSimpleTriangle(center, width, height, orientation="up"):
     :param str orientation: Orientation of the triangle (tip direction)
                             Valid values are "up", "down"
     """
+    # imported on demand, the other helpers are also used without Qt
+    from PyQt5 import QtGui, QtCore
     polygon = QtGui.QPolygonF()
     if orientation == "up":
         polygon.append(QtCore.QPointF(center[0]-width/2, center[1]-height/2))
@@ -8,6 +8,16 @@ import numpy as np
 
 from Base import MachiningObjects as mo
 from Base import BaseOptimizers as bo
+import Base.Errors as errs
+
+
+# path types in the path array (see Workpiece.getArrays)
+STRAIGHT = 0
+ARC = 1
+# columns of the hole and path arrays
+HOLE_CENTER = slice(1, 3)
+PATH_MILLING = 0
+PATH_POINTS = slice(2, 8)
 
 
 class Workpiece(object):
@@ -64,6 +74,16 @@ class Workpiece(object):
         self.holeList.append(hole)
         
         
+    def appendHoles(self, diameters, centers):
+        """
+        Add holes to the workpiece's hole list
+
+        :param np.array diameters: (n,) hole diameters
+        :param np.array centers: (n, 2) hole center coordinates
+        """
+        self.holeList.appendHoles(diameters, centers)
+        
+        
     def appendMilling(self, milling):
         """
         Add milling to the workpiece's hole list
@@ -81,15 +101,127 @@ class Workpiece(object):
         self.millingList.optimize()
         
         
-    def planMachining(self, machine):
+    def getArrays(self):
+        """
+        Returns the holes and millings as compact arrays, e.g. to store or replicate them
+        (see :meth:`fromArrays`).
+
+        ===========  ===================================================================================
+        **Array**
+        ===========  ===================================================================================
+        holes        (n, 3) diameter, center x, center y
+        paths        (m, 10) milling index, path type (:data:`STRAIGHT`, :data:`ARC`), start x, start y,
+                     end x, end y, center x, center y, angle, ccw (arc paths only)
+        ===========  ===================================================================================
+
+        :returns: hole and path arrays
+        :rtype: tuple(np.array, np.array)
+        """
+        holes = np.array([(hole.diameter, *hole.center) for hole in self.holeList], dtype=float).reshape(-1, 3)
+        paths = []
+        for index, milling in enumerate(self.millingList):
+            for path in milling:
+                if isinstance(path, mo.ArcPath):
+                    paths.append((index, ARC, *path.start, *path.end, *path.center, path.angle, path.ccw))
+                else:
+                    paths.append((index, STRAIGHT, *path.start, *path.end, 0, 0, 0, 0))
+        return holes, np.array(paths, dtype=float).reshape(-1, 10)
+    
+    
+    @classmethod
+    def fromArrays(cls, holes, paths):
+        """
+        :param np.array holes: Hole array (see :meth:`getArrays`)
+        :param np.array paths: Path array (see :meth:`getArrays`)
+        :returns: Workpiece containing the holes and millings of the arrays
+        :rtype: Workpiece
+        """
+        workpiece = cls()
+        workpiece._appendArrays(holes, paths)
+        return workpiece
+    
+    
+    def _appendArrays(self, holes, paths):
+        """
+        Adds the holes and millings of the arrays (see :meth:`getArrays`).
+        """
+        self.appendHoles(holes[:, 0], holes[:, HOLE_CENTER])
+        milling = None
+        current = None
+        for index, pathtype, *coords, angle, ccw in paths.tolist():
+            if index != current:
+                milling = mo.Milling()
+                self.appendMilling(milling)
+                current = index
+            if pathtype == ARC:
+                milling.append(mo.ArcPath(coords[0:2], coords[2:4], coords[4:6], angle, bool(ccw)))
+            else:
+                milling.append(mo.StraightPath(coords[0:2], coords[2:4]))
+        
+        
+    def panelize(self, rows, columns, spacing=(0, 0)):
+        """
+        Replicates all machining objects in a grid of rows x columns boards (step and repeat) and optimizes
+        the whole panel, so a single job mills all copies.
+        The copies are placed with the board size plus spacing as pitch, the original board is the lower
+        left one. The size of the workpiece is set to the size of the panel.
+
+        :param int rows: Number of boards in y direction
+        :param int columns: Number of boards in x direction
+        :param spacing: (x, y) spacing between the board outlines
+        :type spacing: tuple(float, float)
+        """
+        if rows < 1 or columns < 1:
+            raise errs.InvalidArgument('rows, columns', 'The panel needs at least one board.')
+        size = np.asarray(self.getSize(), dtype=float)
+        if np.any(size <= 0):
+            raise errs.InvalidArgument('size', 'The board size has to be set for panelization.')
+        pitch = size + spacing
+        offsets = np.stack(np.meshgrid(np.arange(columns), np.arange(rows)), axis=-1).reshape(-1, 2) * pitch
+        # replicate the compact geometry by broadcasting over the offsets of the copies
+        holes, paths = self.getArrays()
+        holes = np.repeat(holes[None], len(offsets), axis=0)
+        holes[:, :, HOLE_CENTER] += offsets[:, None]
+        paths = np.repeat(paths[None], len(offsets), axis=0)
+        paths[:, :, PATH_MILLING] += np.arange(len(offsets))[:, None] * len(self.millingList)
+        # start, end and center points
+        paths[:, :, PATH_POINTS] += np.tile(offsets, 3)[:, None]
+        self.holeList.holes = []
+        self.millingList.millings = []
+        self._appendArrays(holes.reshape(-1, holes.shape[-1]), paths.reshape(-1, paths.shape[-1]))
+        self.setSize(size*(columns, rows) + np.multiply(spacing, (columns-1, rows-1)))
+        self.optimize()
+        
+        
+    def getMachiningObjects(self):
+        """
+        :returns: holes and millings of the active lists in machining order
+        :rtype: list(Base.MachiningObjects.MachiningObject)
+        """
+        objects = []
+        if self.holeList.active:
+            objects.extend(self.holeList)
+        if self.millingList.active:
+            objects.extend(self.millingList)
+        return objects
+        
+        
+    def planMachining(self, machine, start=0):
         """
         Plan machining.
+        The start of each machining object is marked as checkpoint (see
+        :meth:`Base.MachineBase.MachineBase.planCheckpoint`), machining can be resumed at any of them.
+        The planner preamble moves the tool to working distance before the first jog, which is the
+        re-entry move when resuming.
 
         :param Base.MachineBase.MachineBase machine: Active machine
+        :param int start: Index of the first machining object to plan (see :meth:`getMachiningObjects`)
         """
+        objects = self.getMachiningObjects()
         machine.preparePlanner()
-        self.holeList.planMotion(machine)
-        self.millingList.planMotion(machine)
+        for index in range(start, len(objects)):
+            machine.planCheckpoint(index, len(objects), str(objects[index]))
+            objects[index].planMotion(machine)
         machine.finalizePlanner()
         
         
@@ -15,6 +15,13 @@ handler.setLevel(logging.DEBUG)
 handler.setFormatter(formatter)
 logger.addHandler(handler)
 
+# measure the import time of the modules until the main window is shown
+# (most of it is spent in pyqtgraph, which imports all its graphics items and widgets eagerly,
+# the machine drivers are imported for their default parameters, see Base.LazyImport)
+from Base.LazyImport import ImportTimer
+importtimer = ImportTimer()
+importtimer.install()
+
 from PyQt5 import QtWidgets, QtGui
 import sys
 import traceback
@@ -23,10 +30,9 @@ import ctypes
 import pyqtgraph as pg
 
 # convert UI files if not in frozen environment
-from Base.UITools import convertUI, convertResources
+from Base.UITools import convertAll
 if not getattr(sys, 'frozen', False):
-    convertUI()
-    convertResources()
+    convertAll()
 
 # from Base.AppSettings import AppSettings
 from Base.AppBase import AppBase
@@ -82,6 +88,8 @@ if __name__ == '__main__':
     logger.info("ESCMillPCB Version {}".format(AppBase.version))
     AppBase.setMainwindow(mainwindow)
     mainwindow.show()
+    importtimer.uninstall()
+    importtimer.logReport()
     app.exec_()
     
     AppBase.finalize()
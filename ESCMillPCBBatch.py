@@ -0,0 +1,24 @@
+"""
+Created on 19.10.2026
+
+Command line batch conversion of boards to g-code programs (see :mod:`Base.Batch`).
+Does not need Qt, e.g. to prepare boards on a build server::
+
+    python ESCMillPCBBatch.py -s settings.json -m TinyG -o programs board1.brd board2.brd
+"""
+
+# initialize logging
+import logging
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+handler = logging.StreamHandler()
+handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s:%(name)s: %(message)s"))
+logger.addHandler(handler)
+
+import sys
+
+from Base import Batch
+
+
+if __name__ == '__main__':
+    sys.exit(Batch.main())
@@ -8,7 +8,8 @@ Created on 31.01.2018
 import logging
 logger = logging.getLogger(__name__)
 
-import math, copy
+import math
+import numpy as np
 import xml.etree.ElementTree as et
 
 from EagleImport import EagleObjects as eo
@@ -29,23 +30,44 @@ class EagleBrd(object):
         self.vias = []
         self.lineMillings = []
         self.circleMillings = []
+        # library and package being read
+        self._library = None
+        self._package = None
     
     
     def importBrd(self, filepath):
         """
         Import Eagle \*.brd XML file, the file contents will be added to the EagleBrd object
 
+        The file is read in a single pass with iterparse. Each element is passed to the handler of its tag
+        (see :attr:`_startHandlers` and :attr:`_endHandlers`) together with the tags of its ancestors and
+        is discarded afterwards, so the memory usage does not grow with the size of the board.
+
         :param str filepath: Absolute path to the brd file
         """
         logger.info("Parsing Eagle board file %s", filepath)
-        xmltree = et.parse(filepath)
-        if str.lower(xmltree.getroot().tag) != 'eagle':
-            raise ValueError("EagleBrd.importBrd: Invalid file.")
-        self._buildDeviceLibraries(xmltree.find(".//libraries"))
-        self._readDevicePositions(xmltree.find(".//elements"))
-        self._readHoles(xmltree.find(".//plain"))
-        self._readVias(xmltree.find(".//signals"))
-        self._readMillings(xmltree.find(".//plain"))
+        # open elements and their tags
+        elements = []
+        context = []
+        for event, element in et.iterparse(filepath, events=('start', 'end')):
+            if event == 'start':
+                if not elements and str.lower(element.tag) != 'eagle':
+                    raise ValueError("EagleBrd.importBrd: Invalid file.")
+                handler = self._startHandlers.get(element.tag)
+                if handler is not None:
+                    handler(self, element, context)
+                elements.append(element)
+                context.append(element.tag)
+            else:
+                elements.pop()
+                context.pop()
+                handler = self._endHandlers.get(element.tag)
+                if handler is not None:
+                    handler(self, element, context)
+                # discard the processed element
+                element.clear()
+                if elements:
+                    elements[-1].remove(element)
         logger.info("Found %s libraries with %s packages, %s devices, %s stand-alone holes, %s vias, %s millings",
                     len(self.deviceLibraries), sum([len(lib) for lib in self.deviceLibraries.values()]),
                     len(self.devicePositions), len(self.holes), len(self.vias), 
@@ -69,153 +91,233 @@ class EagleBrd(object):
     
     def getDrillsAbsolute(self):
         """
-        :returns list of EagleDrill objects with all drills on the board (devices, stand-alone drills and vias)
-        with absolute positions
-        :rtype: list(EagleImport.EagleObjects.EagleDrill)
+        Calculates all drills on the board (devices, stand-alone drills and vias) with absolute positions.
+        The drills of the devices are placed (rotation, mirroring and translation) at once for all
+        placements of each package. The drills are ordered by devices, stand-alone holes and vias.
+
+        :returns: drill sizes (n,) and absolute drill positions (n, 2)
+        :rtype: tuple(np.array, np.array)
         """
-        drills = []
-        # iterate through devices
+        # group placements by package: device, result rows of the first drills, rotations, mirroring, positions
+        groups = {}
+        start = 0
         for devpos in self.devicePositions:
-            dev = self.getDevice(devpos.libraryName, devpos.deviceName)
-            # calculate absolute drill positions (including rotation)
-            for drill in dev.drills:
-                rot = devpos.rotation
-                posx = drill.position[0]*math.cos(rot) - drill.position[1]*math.sin(rot)
-                posy = drill.position[0]*math.sin(rot) + drill.position[1]*math.cos(rot)
-                if devpos.mirrored:
-                    posx = -posx
-                newdrill = eo.EagleDrill(
-                    drill.drillsize,
-                    (devpos.position[0]+posx, devpos.position[1]+posy)
-                )
-                drills.append(newdrill)
-        # iterate through stand-alone holes
-        for hole in self.holes:
-            drills.append(copy.deepcopy(hole))
-        # iterate through vias
-        for via in self.vias:
-            drills.append(copy.deepcopy(via))
-        return drills
+            key = (devpos.libraryName, devpos.deviceName)
+            group = groups.get(key)
+            if group is None:
+                group = groups[key] = (self.getDevice(*key), [], [], [], [])
+            group[1].append(start)
+            group[2].append(devpos.rotation)
+            group[3].append(devpos.mirrored)
+            group[4].append(devpos.position)
+            start += len(group[0].drills)
+        total = start + len(self.holes) + len(self.vias)
+        sizes = np.empty(total)
+        positions = np.empty((total, 2))
+        for device, starts, rotation, mirrored, origin in groups.values():
+            drillsizes, offsets = device.getDrillArrays()
+            if len(drillsizes) == 0:
+                continue
+            rotation = np.array(rotation)[:, np.newaxis]
+            mirrored = np.array(mirrored)[:, np.newaxis]
+            origin = np.array(origin, dtype=float)
+            cos = np.cos(rotation)
+            sin = np.sin(rotation)
+            # (placements, drills) coordinates relative to the device positions
+            posx = offsets[:, 0]*cos - offsets[:, 1]*sin
+            posy = offsets[:, 0]*sin + offsets[:, 1]*cos
+            posx = np.where(mirrored, -posx, posx)
+            rows = np.array(starts)[:, np.newaxis] + np.arange(len(drillsizes))
+            sizes[rows] = drillsizes
+            positions[rows, 0] = origin[:, 0:1] + posx
+            positions[rows, 1] = origin[:, 1:2] + posy
+        # append stand-alone holes and vias
+        for index, drill in enumerate(self.holes + self.vias, start):
+            sizes[index] = drill.drillsize
+            positions[index] = drill.position
+        return sizes, positions
     
     
-    def _buildDeviceLibraries(self, librariestag):
+    def _startLibrary(self, librarytag, context):
         """
-        Adds libraries and containing packages to the EagleBrd object
+        Starts a library of the board
 
-        :param librariestag: XML tag object pointing to the <libraries> tag
+        :param librarytag: XML tag object of the <library> tag
+        :param list(str) context: Tags of the enclosing elements
         """
-        libs = librariestag.findall(".//library")
-        # find all libraries
-        for lib in libs:
-            libname = lib.attrib["name"]
+        if 'libraries' in context:
+            libname = librarytag.attrib["name"]
             logger.debug("Found library %s", libname)
-            eagledevlib = eo.EagleDeviceLibrary(libname)
-            devs = lib.findall(".//package")
-            
-            # find all packages
-            for dev in devs:
-                devname = dev.attrib["name"]
-                eagledev = eo.EagleDevice(devname)
-                pads = dev.findall(".//pad")
-                # find all pads (drills)
-                for pad in pads:
-                    eagledev.addDrill(
-                        float(pad.attrib["drill"]), 
-                        (float(pad.attrib["x"]), float(pad.attrib["y"]))
-                    )
-                logger.debug("Found package %s containing %s pads", devname, len(pads))
-                eagledevlib.addDevice(eagledev)
-                
-            # add to deviceLibraries
+            self._library = eo.EagleDeviceLibrary(libname)
+
+
+    def _endLibrary(self, librarytag, context):
+        """
+        Adds the finished library to the EagleBrd object
+
+        :param librarytag: XML tag object of the <library> tag
+        :param list(str) context: Tags of the enclosing elements
+        """
+        if 'libraries' in context:
+            libname = self._library.name
             if libname in self.deviceLibraries.keys():
-                self.deviceLibraries[libname].append(eagledevlib)
-            else:        
-                self.deviceLibraries[libname] = eagledevlib
-    
-    
-    def _readDevicePositions(self, elementstag):
-        """
-        Adds device positions to the EagleBrd object
-
-        :param elementstag: XML tag object pointing to the <elements> tag
-        """
-        devs = elementstag.findall(".//element")
-        for dev in devs:
-            rotation = 0
-            mirrored = False
-            if "rot" in dev.attrib.keys():
-                mirrored = (dev.attrib["rot"][0] == "M")
-                rotation = float(dev.attrib["rot"].lstrip("MR")) * math.pi/180
-            devpos = eo.EagleDevicePosition(
-                dev.attrib["library"],
-                dev.attrib["package"],
-                (float(dev.attrib["x"]), float(dev.attrib["y"])),
-                rotation,
-                mirrored
-            )
-            logger.debug("Found device %s", devpos)
-            self.devicePositions.append(devpos)
-    
-    
-    def _readHoles(self, plaintag):
+                self.deviceLibraries[libname].append(self._library)
+            else:
+                self.deviceLibraries[libname] = self._library
+            self._library = None
+
+
+    def _startPackage(self, packagetag, context):
         """
-        Adds stand-alone holes to the EagleBrd object
+        Starts a package of the current library
 
-        :param plaintag: XML tag object pointing to the <plain> tag
+        :param packagetag: XML tag object of the <package> tag
+        :param list(str) context: Tags of the enclosing elements
         """
-        holes = plaintag.findall(".//hole")
-        for hole in holes:
-            drill = eo.EagleDrill(
-                float(hole.attrib["drill"]),
-                (float(hole.attrib["x"]), float(hole.attrib["y"]))
-            )
-            logger.debug("Found stand-alone hole %s", drill)
-            self.holes.append(drill)
-        
-        
-    def _readVias(self, signalstag):
+        if 'libraries' in context:
+            self._package = eo.EagleDevice(packagetag.attrib["name"])
+
+
+    def _endPackage(self, packagetag, context):
         """
-        Adds via drills to the EagleBrd object
+        Adds the finished package to the current library
+
+        :param packagetag: XML tag object of the <package> tag
+        :param list(str) context: Tags of the enclosing elements
+        """
+        if 'libraries' in context:
+            logger.debug("Found package %s containing %s pads", self._package.name, len(self._package.drills))
+            self._library.addDevice(self._package)
+            self._package = None
+
 
-        :param signalstag: XML tag object pointing to the <signals> tag
+    def _readPad(self, padtag, context):
         """
-        vias = signalstag.findall(".//via")
-        for via in vias:
-            drill = eo.EagleDrill(
-                float(via.attrib["drill"]),
-                (float(via.attrib["x"]), float(via.attrib["y"]))
+        Adds a pad (drill) to the current package
+
+        :param padtag: XML tag object of the <pad> tag
+        :param list(str) context: Tags of the enclosing elements
+        """
+        if 'libraries' in context and 'package' in context:
+            self._package.addDrill(
+                float(padtag.attrib["drill"]),
+                (float(padtag.attrib["x"]), float(padtag.attrib["y"]))
             )
-            logger.debug("Found via %s", drill)
-            self.vias.append(drill)
-            
-            
-            
-    def _readMillings(self, plaintag):
-        """
-        Adds millings to the EagleBrd object.
+
+
+    def _readDevicePosition(self, elementtag, context):
+        """
+        Adds a device position to the EagleBrd object
+
+        :param elementtag: XML tag object of the <element> tag
+        :param list(str) context: Tags of the enclosing elements
+        """
+        if not 'elements' in context:
+            return
+        rotation = 0
+        mirrored = False
+        if "rot" in elementtag.attrib.keys():
+            mirrored = (elementtag.attrib["rot"][0] == "M")
+            rotation = float(elementtag.attrib["rot"].lstrip("MR")) * math.pi/180
+        devpos = eo.EagleDevicePosition(
+            elementtag.attrib["library"],
+            elementtag.attrib["package"],
+            (float(elementtag.attrib["x"]), float(elementtag.attrib["y"])),
+            rotation,
+            mirrored
+        )
+        logger.debug("Found device %s", devpos)
+        self.devicePositions.append(devpos)
+
+
+    def _readHole(self, holetag, context):
+        """
+        Adds a stand-alone hole to the EagleBrd object
+
+        :param holetag: XML tag object of the <hole> tag
+        :param list(str) context: Tags of the enclosing elements
+        """
+        if not 'plain' in context:
+            return
+        drill = eo.EagleDrill(
+            float(holetag.attrib["drill"]),
+            (float(holetag.attrib["x"]), float(holetag.attrib["y"]))
+        )
+        logger.debug("Found stand-alone hole %s", drill)
+        self.holes.append(drill)
+
+
+    def _readVia(self, viatag, context):
+        """
+        Adds a via drill to the EagleBrd object
+
+        :param viatag: XML tag object of the <via> tag
+        :param list(str) context: Tags of the enclosing elements
+        """
+        if not 'signals' in context:
+            return
+        drill = eo.EagleDrill(
+            float(viatag.attrib["drill"]),
+            (float(viatag.attrib["x"]), float(viatag.attrib["y"]))
+        )
+        logger.debug("Found via %s", drill)
+        self.vias.append(drill)
+
+
+    def _readLineMilling(self, wiretag, context):
+        """
+        Adds a line milling to the EagleBrd object.
         Millings are wires in the milling layer (46)
 
-        :param plaintag: XML tag object pointing to the <plain> tag
-        """
-        # find line millings
-        wires = plaintag.findall('.//wire[@layer="46"]')
-        for wire in wires:
-            curve = 0
-            if "curve" in wire.attrib.keys():
-                curve = float(wire.attrib["curve"])
-            milling = eo.EagleLineMilling(
-                (float(wire.attrib["x1"]), float(wire.attrib["y1"])),
-                (float(wire.attrib["x2"]), float(wire.attrib["y2"])),
-                curve
-            )
-            logger.debug("Found line milling %s", milling)
-            self.lineMillings.append(milling)
-        # find circle millings
-        circles = plaintag.findall('.//circle[@layer="46"]')
-        for circle in circles:
-            milling = eo.EagleCircleMilling(
-                float(circle.attrib["radius"]),
-                (float(circle.attrib["x"]), float(circle.attrib["y"]))
-            )
-            logger.debug("Found circle milling %s", milling)
-            self.circleMillings.append(milling)
\ No newline at end of file
+        :param wiretag: XML tag object of the <wire> tag
+        :param list(str) context: Tags of the enclosing elements
+        """
+        if not 'plain' in context or wiretag.attrib.get("layer") != "46":
+            return
+        curve = 0
+        if "curve" in wiretag.attrib.keys():
+            curve = float(wiretag.attrib["curve"])
+        milling = eo.EagleLineMilling(
+            (float(wiretag.attrib["x1"]), float(wiretag.attrib["y1"])),
+            (float(wiretag.attrib["x2"]), float(wiretag.attrib["y2"])),
+            curve
+        )
+        logger.debug("Found line milling %s", milling)
+        self.lineMillings.append(milling)
+
+
+    def _readCircleMilling(self, circletag, context):
+        """
+        Adds a circle milling to the EagleBrd object.
+        Millings are circles in the milling layer (46)
+
+        :param circletag: XML tag object of the <circle> tag
+        :param list(str) context: Tags of the enclosing elements
+        """
+        if not 'plain' in context or circletag.attrib.get("layer") != "46":
+            return
+        milling = eo.EagleCircleMilling(
+            float(circletag.attrib["radius"]),
+            (float(circletag.attrib["x"]), float(circletag.attrib["y"]))
+        )
+        logger.debug("Found circle milling %s", milling)
+        self.circleMillings.append(milling)
+
+
+    # handlers called with the element and the tags of its ancestors when an element starts (attributes only)
+    _startHandlers = {
+        'library':_startLibrary,
+        'package':_startPackage
+    }
+
+    # handlers called with the element and the tags of its ancestors when an element is complete
+    _endHandlers = {
+        'library':_endLibrary,
+        'package':_endPackage,
+        'pad':_readPad,
+        'element':_readDevicePosition,
+        'hole':_readHole,
+        'via':_readVia,
+        'wire':_readLineMilling,
+        'circle':_readCircleMilling
+    }
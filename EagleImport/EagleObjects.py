@@ -5,6 +5,7 @@ Created on 31.01.2018
 """
 
 import math
+import numpy as np
 
 class EagleDrill(object):
     """
@@ -149,6 +150,8 @@ class EagleDevice(object):
         """
         self.name = name
         self.drills = []
+        # drill arrays, see getDrillArrays()
+        self._drillArrays = None
         
         
     def addDrill(self, size, position):
@@ -161,6 +164,20 @@ class EagleDevice(object):
         """
         eagledrill = EagleDrill(size, position)
         self.drills.append(eagledrill)
+        self._drillArrays = None
+        
+        
+    def getDrillArrays(self):
+        """
+        :returns: drill sizes (k,) and drill positions (k, 2) relative to the device position
+        :rtype: tuple(np.array, np.array)
+        """
+        if self._drillArrays is None:
+            self._drillArrays = (
+                np.array([drill.drillsize for drill in self.drills], dtype=float),
+                np.array([drill.position for drill in self.drills], dtype=float).reshape(-1, 2)
+            )
+        return self._drillArrays
         
     
         
@@ -0,0 +1,242 @@
+"""
+Created on 19.10.2026
+"""
+
+# setup logging
+import logging
+logger = logging.getLogger(__name__)
+
+import numpy as np
+
+from GerberImport.Tokenizer import splitWords, parseNumber
+
+
+# characters of blocks containing only coordinates (most blocks of a drill file)
+_coordinateChars = str.maketrans('', '', 'XY0123456789.+-')
+
+
+class ExcellonDrill(object):
+    """
+    Represents the drills of an Excellon drill file (\\*.drl, \\*.xln, \\*.txt)
+
+    The file is read line by line. Supported are the tool definitions of header and body (T..C..), metric
+    and inch units, coordinates with decimal point or in fixed point format with leading or trailing zero
+    suppression, absolute and incremental mode (G90/G91) and repeated holes (R..). Routed paths and slots
+    (G00-G03, G85) are skipped.
+    """
+
+    def __init__(self):
+        """
+        Constructor
+        """
+        self.tools = {}
+        self.drillsizes = []
+        self.positions = []
+        # state of the reader
+        self.scale = 1
+        self.integers = 3
+        self.decimals = 3
+        self.omitLeading = True
+        self.formatDefined = False
+        self.incremental = False
+        self.routing = False
+        self.tool = None
+        self.position = [0, 0]
+        self.skipped = 0
+
+
+    def importDrl(self, filepath):
+        """
+        Import Excellon drill file, the drills will be added to the ExcellonDrill object
+
+        :param str filepath: Absolute path to the drill file
+        """
+        logger.info("Parsing Excellon drill file %s", filepath)
+        header = False
+        with open(filepath, 'r') as fhnd:
+            for line in fhnd:
+                line = line.strip().upper()
+                if len(line) == 0:
+                    continue
+                if line[0] == ';':
+                    self._readComment(line)
+                elif line == 'M48':
+                    header = True
+                elif line in ('%', 'M95'):
+                    header = False
+                elif header:
+                    self._readHeader(line)
+                elif line in ('M30', 'M00'):
+                    break
+                else:
+                    self._readBlock(line)
+        if self.skipped:
+            logger.warning("Skipped %s routed paths and slots.", self.skipped)
+        logger.info("Found %s tools, %s drills", len(self.tools), len(self.drillsizes))
+
+
+    def getDrills(self):
+        """
+        :returns: drill sizes (n,) and drill positions (n, 2) in mm
+        :rtype: tuple(np.array, np.array)
+        """
+        return np.array(self.drillsizes, dtype=float), np.array(self.positions, dtype=float).reshape(-1, 2)
+
+
+    def _setUnits(self, units, options):
+        """
+        Sets units and number format from a header line, e.g. "METRIC,TZ,000.000"
+
+        :param str units: "METRIC" or "INCH"
+        :param list(str) options: Zero suppression ("LZ": leading zeros present, "TZ": trailing zeros present)
+                                  and number format
+        """
+        self.scale = 1 if units == 'METRIC' else 25.4
+        if not self.formatDefined:
+            self.integers, self.decimals = (3, 3) if units == 'METRIC' else (2, 4)
+        for option in options:
+            if option == 'LZ':
+                self.omitLeading = False
+            elif option == 'TZ':
+                self.omitLeading = True
+            elif '.' in option:
+                integers, decimals = option.split('.')
+                self.integers, self.decimals = len(integers), len(decimals)
+                self.formatDefined = True
+
+
+    def _readComment(self, line):
+        """
+        Reads the number format from comments written by common CAD programs, e.g. ";FILE_FORMAT=4:4"
+        """
+        if 'FILE_FORMAT=' in line:
+            integers, sep, decimals = line.split('FILE_FORMAT=')[1].partition(':')
+            if integers.strip().isdigit() and decimals.strip().isdigit():
+                self.integers, self.decimals = int(integers), int(decimals)
+                self.formatDefined = True
+
+
+    def _readHeader(self, line):
+        """
+        Reads a header line (units and tool definitions)
+        """
+        fields = line.split(',')
+        if fields[0] in ('METRIC', 'INCH'):
+            self._setUnits(fields[0], fields[1:])
+        elif line == 'M71':
+            self._setUnits('METRIC', [])
+        elif line == 'M72':
+            self._setUnits('INCH', [])
+        elif line[0] == 'T':
+            self._readTool(splitWords(line))
+        elif line.startswith('ICI'):
+            self.incremental = line.endswith('ON')
+        else:
+            logger.debug("Ignored Excellon header line %s", line)
+
+
+    def _readTool(self, words):
+        """
+        Reads a tool definition (T..C..) and/or selects the tool
+        """
+        tool = int(words[0][1])
+        for code, value in words[1:]:
+            if code == 'C':
+                self.tools[tool] = float(value) * self.scale
+        self.tool = tool
+
+
+    def _readBlock(self, line):
+        """
+        Reads a body line (tool selection, modes, drill coordinates)
+        """
+        if not self.routing and line[0] in 'XY' and not line.translate(_coordinateChars):
+            # fast path for plain coordinates
+            x, sep, y = line.partition('Y')
+            words = [('X', x[1:])] if x else []
+            if sep:
+                words.append(('Y', y))
+            self.position = self._readPosition(words)
+            self._appendDrill(self.position)
+            return
+        if line in ('METRIC', 'INCH') or line.startswith(('METRIC,', 'INCH,')):
+            fields = line.split(',')
+            self._setUnits(fields[0], fields[1:])
+            return
+        words = splitWords(line)
+        if len(words) == 0:
+            return
+        codes = [code for code, value in words]
+        if 'T' in codes:
+            self._readTool(words[codes.index('T'):])
+            return
+        for code, value in words:
+            if code == 'G':
+                gcode = int(value)
+                if gcode == 90:
+                    self.incremental = False
+                elif gcode == 91:
+                    self.incremental = True
+                elif gcode == 5:
+                    self.routing = False
+                elif gcode in (0, 1, 2, 3):
+                    self.routing = True
+                elif gcode == 85:
+                    # slot, skip the whole block
+                    self.skipped += 1
+                    return
+            elif code == 'M':
+                mcode = int(value)
+                if mcode == 71:
+                    self._setUnits('METRIC', [])
+                elif mcode == 72:
+                    self._setUnits('INCH', [])
+        if not ('X' in codes or 'Y' in codes):
+            return
+        if 'R' in codes:
+            self._repeatDrill(int(words[codes.index('R')][1]), words)
+            return
+        self.position = self._readPosition(words)
+        if self.routing:
+            self.skipped += 1
+            return
+        self._appendDrill(self.position)
+
+
+    def _readPosition(self, words):
+        """
+        :returns: new position given by the X and Y words in mm
+        :rtype: list(float)
+        """
+        position = [0, 0] if self.incremental else self.position[:]
+        for code, value in words:
+            if code in ('X', 'Y'):
+                axis = 0 if code == 'X' else 1
+                position[axis] = parseNumber(value, self.integers, self.decimals, self.omitLeading) * self.scale
+        if self.incremental:
+            position = [self.position[0]+position[0], self.position[1]+position[1]]
+        return position
+
+
+    def _repeatDrill(self, count, words):
+        """
+        Adds drills repeated from the current position, the X and Y words give the step (R..X..Y..)
+        """
+        step = [0, 0]
+        for code, value in words:
+            if code in ('X', 'Y'):
+                axis = 0 if code == 'X' else 1
+                step[axis] = parseNumber(value, self.integers, self.decimals, self.omitLeading) * self.scale
+        for i in range(count):
+            self.position = [self.position[0]+step[0], self.position[1]+step[1]]
+            self._appendDrill(self.position)
+
+
+    def _appendDrill(self, position):
+        """
+        Adds a drill of the current tool
+        """
+        if not self.tool in self.tools:
+            raise ValueError("ExcellonDrill.importDrl: Undefined tool T{}.".format(self.tool))
+        self.drillsizes.append(self.tools[self.tool])
+        self.positions.append(position)
@@ -0,0 +1,221 @@
+"""
+Created on 19.10.2026
+"""
+
+# setup logging
+import logging
+logger = logging.getLogger(__name__)
+
+import math
+
+from GerberImport.Tokenizer import splitWords, parseNumber
+
+
+class GerberOutline(object):
+    """
+    Represents the board outline of a Gerber file (RS-274X, e.g. \\*.gko, \\*.gm1)
+
+    Every drawn segment (D01) of the file is read as milling, either as line or as circular arc
+    (G02/G03, single and multi quadrant mode). Flashes (D03) and the aperture definitions are ignored,
+    the outline is milled with the tool center on the drawn segments.
+
+    The file is read block by block without loading it completely. The millings are kept in
+    :attr:`lineMillings` [(start, end)] and :attr:`arcMillings` [(start, end, center, angle, ccw)]
+    with coordinates in mm and the opening angle in rad.
+    """
+
+    def __init__(self):
+        """
+        Constructor
+        """
+        self.lineMillings = []
+        self.arcMillings = []
+        # state of the reader
+        self.scale = 1
+        self.integers = 3
+        self.decimals = 6
+        self.omitLeading = True
+        self.incremental = False
+        self.interpolation = 1
+        self.multiQuadrant = False
+        self.operation = 2
+        self.position = (0, 0)
+
+
+    def importGbr(self, filepath):
+        """
+        Import Gerber file, the outline will be added to the GerberOutline object
+
+        :param str filepath: Absolute path to the Gerber file
+        """
+        logger.info("Parsing Gerber file %s", filepath)
+        with open(filepath, 'r') as fhnd:
+            for extended, block in self._readBlocks(fhnd):
+                if extended:
+                    self._readExtended(block)
+                elif block == 'M02':
+                    break
+                else:
+                    self._readBlock(block)
+        logger.info("Found %s line millings, %s arc millings", len(self.lineMillings), len(self.arcMillings))
+
+
+    @staticmethod
+    def _readBlocks(fhnd):
+        """
+        Splits the file into blocks terminated by "*".
+        Blocks enclosed in "%" are extended commands.
+
+        :param fhnd: Opened file
+        :returns: generator yielding (extended, block) tuples
+        """
+        extended = False
+        block = ""
+        for line in fhnd:
+            line = line.strip()
+            while line:
+                end = line.find('*')
+                percent = line.find('%')
+                if percent != -1 and (end == -1 or percent < end):
+                    block += line[:percent]
+                    if block.strip():
+                        yield extended, block.strip().upper()
+                    block = ""
+                    extended = not extended
+                    line = line[percent+1:]
+                elif end != -1:
+                    block += line[:end]
+                    if block.strip():
+                        yield extended, block.strip().upper()
+                    block = ""
+                    line = line[end+1:]
+                else:
+                    block += line
+                    line = ""
+
+
+    def _readExtended(self, block):
+        """
+        Reads an extended command (format and units)
+        """
+        if block.startswith('FS'):
+            # e.g. FSLAX24Y24: leading zeros omitted, absolute, 2 integer and 4 decimal digits
+            self.omitLeading = block[2] != 'T'
+            self.incremental = block[3] == 'I'
+            xpos = block.find('X')
+            if xpos != -1 and block[xpos+1:xpos+3].isdigit():
+                self.integers, self.decimals = int(block[xpos+1]), int(block[xpos+2])
+        elif block.startswith('MO'):
+            self.scale = 25.4 if block[2:4] == 'IN' else 1
+        else:
+            logger.debug("Ignored Gerber extended command %s", block)
+
+
+    def _readBlock(self, block):
+        """
+        Reads a data block (interpolation modes and operations)
+        """
+        if block.startswith('G04'):
+            # comment
+            return
+        words = splitWords(block)
+        position = list(self.position) if not self.incremental else [0, 0]
+        offset = [0, 0]
+        coordinates = False
+        operation = None
+        for code, value in words:
+            if code == 'G':
+                gcode = int(value)
+                if gcode in (1, 2, 3):
+                    self.interpolation = gcode
+                elif gcode == 74:
+                    self.multiQuadrant = False
+                elif gcode == 75:
+                    self.multiQuadrant = True
+                elif gcode == 70:
+                    self.scale = 25.4
+                elif gcode == 71:
+                    self.scale = 1
+            elif code == 'D':
+                dcode = int(value)
+                if dcode in (1, 2, 3):
+                    operation = dcode
+            elif code in ('X', 'Y', 'I', 'J'):
+                number = parseNumber(value, self.integers, self.decimals, self.omitLeading) * self.scale
+                if code == 'X':
+                    position[0] = number
+                elif code == 'Y':
+                    position[1] = number
+                elif code == 'I':
+                    offset[0] = number
+                else:
+                    offset[1] = number
+                coordinates = True
+        if self.incremental:
+            position = [self.position[0]+position[0], self.position[1]+position[1]]
+        position = tuple(position)
+        # operation codes are modal in older files
+        if operation is None:
+            if not coordinates:
+                return
+            operation = self.operation
+        self.operation = operation
+        if operation == 1:
+            if self.interpolation == 1:
+                self._appendLine(self.position, position)
+            else:
+                self._appendArc(self.position, position, offset, self.interpolation == 3)
+        self.position = position
+
+
+    def _appendLine(self, start, end):
+        """
+        Adds a line milling
+        """
+        if start == end:
+            return
+        self.lineMillings.append((start, end))
+        logger.debug("Found line milling from %s to %s", start, end)
+
+
+    def _appendArc(self, start, end, offset, ccw):
+        """
+        Adds an arc milling, the center is given by its offset to the start point
+        """
+        if self.multiQuadrant:
+            center = (start[0]+offset[0], start[1]+offset[1])
+            angle = self._calculateAngle(start, end, center, ccw, start == end)
+        else:
+            # the offset is unsigned, use the center with matching radius and an angle up to 90 degree
+            candidates = []
+            for signx in (1, -1):
+                for signy in (1, -1):
+                    center = (start[0]+signx*abs(offset[0]), start[1]+signy*abs(offset[1]))
+                    angle = self._calculateAngle(start, end, center, ccw, False)
+                    mismatch = abs(math.hypot(start[0]-center[0], start[1]-center[1])
+                                   - math.hypot(end[0]-center[0], end[1]-center[1]))
+                    candidates.append((angle > math.pi/2 + 1e-6, mismatch, center, angle))
+            dummy, dummy, center, angle = min(candidates, key=lambda candidate: candidate[:2])
+        if angle == 0 or center == start:
+            return
+        self.arcMillings.append((start, end, center, angle, ccw))
+        logger.debug("Found arc milling from %s to %s, center %s, angle %s, ccw %s", start, end, center,
+                     angle, ccw)
+
+
+    @staticmethod
+    def _calculateAngle(start, end, center, ccw, fullCircle):
+        """
+        :returns: opening angle of the arc in rad
+        :rtype: float
+        """
+        vstart = (start[0]-center[0], start[1]-center[1])
+        vend = (end[0]-center[0], end[1]-center[1])
+        angle = math.atan2(vstart[0]*vend[1] - vstart[1]*vend[0], vstart[0]*vend[0] + vstart[1]*vend[1])
+        if not ccw:
+            angle = -angle
+        if angle < 0:
+            angle += 2*math.pi
+        if angle == 0 and fullCircle:
+            angle = 2*math.pi
+        return angle
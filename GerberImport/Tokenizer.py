@@ -0,0 +1,52 @@
+"""
+Created on 19.10.2026
+"""
+
+
+def splitWords(block):
+    """
+    Splits a data block into words. A word is a code letter followed by its value, e.g. "X1.5Y-2T01" is
+    split into [("X", "1.5"), ("Y", "-2"), ("T", "01")]. Characters in front of the first letter are ignored.
+
+    :param str block: Data block (upper case)
+    :returns: list of (code letter, value) tuples
+    :rtype: list(tuple(str, str))
+    """
+    words = []
+    code = None
+    start = 0
+    for index, char in enumerate(block):
+        if 'A' <= char <= 'Z':
+            if code is not None:
+                words.append((code, block[start:index]))
+            code = char
+            start = index + 1
+    if code is not None:
+        words.append((code, block[start:]))
+    return words
+
+
+def parseNumber(value, integers, decimals, omitLeading=True):
+    """
+    Converts a coordinate value. Values with decimal point are read directly, values without decimal
+    point are fixed point numbers with the given number of integer and decimal digits.
+
+    :param str value: Coordinate value
+    :param int integers: Number of integer digits
+    :param int decimals: Number of decimal digits
+    :param bool omitLeading: True if leading zeros are omitted, False if trailing zeros are omitted
+    :returns: value
+    :rtype: float
+    """
+    if '.' in value:
+        return float(value)
+    sign = 1
+    if value[:1] in ('+', '-'):
+        if value[0] == '-':
+            sign = -1
+        value = value[1:]
+    if not value.isdigit():
+        raise ValueError("Invalid number {}".format(value))
+    if not omitLeading:
+        value = value.ljust(integers + decimals, '0')
+    return sign * int(value) / 10**decimals
@@ -0,0 +1,769 @@
+"""
+Created on 19.10.2026
+"""
+
+import logging
+logger = logging.getLogger(__name__)
+
+from PyQt5 import QtCore, QtWidgets
+import numpy as np
+import time
+import pyqtgraph.parametertree.parameterTypes as ptypes
+
+import Base.Errors as errs
+from Algorithms import MotionEstimator as me
+from Machines.TinyG import TinyG, TinyGSender
+from Machines.GrblPlanner import GrblPlanner
+
+
+# Grbl machine states mapped to TinyG machine states (see :meth:`Machines.TinyG.TinyG.getStatusMessage`)
+STATES = {'Idle':1, 'Run':5, 'Hold':6, 'Jog':9, 'Alarm':2, 'Door':6, 'Check':1, 'Home':8, 'Sleep':3}
+
+# Grbl 1.1 error codes
+ERRORS = {
+    1:"Expected command letter", 2:"Bad number format", 3:"Invalid statement", 4:"Negative value",
+    5:"Homing disabled", 8:"Not idle", 9:"G-code locked out during alarm or jog state",
+    10:"Soft limits require homing", 11:"Line overflow", 15:"Jog travel exceeded", 16:"Invalid jog command",
+    20:"Unsupported command", 22:"Undefined feed rate", 24:"Command word repeated", 25:"Duplicate g-code",
+    26:"No axis words in plane",
+    33:"Invalid target"
+}
+
+# Grbl 1.1 alarm codes
+ALARMS = {
+    1:"Hard limit triggered", 2:"Soft limit exceeded", 3:"Reset while in motion", 4:"Probe fail",
+    5:"Probe fail", 6:"Homing fail (reset)", 7:"Homing fail (door)", 8:"Homing fail (pull off)",
+    9:"Homing fail (switch not found)"
+}
+
+# Grbl acknowledges $H after the homing cycle, so the response takes much longer than a query
+HOMING_TIMEOUT = 120
+
+
+def _number(value):
+    """
+    :param str value: number string
+    :returns: value as int if possible, as float otherwise (or the string if it is not a number)
+    """
+    try:
+        return int(value)
+    except ValueError:
+        try:
+            return float(value)
+        except ValueError:
+            return value
+
+
+
+class GrblSender(TinyGSender):
+    """
+    Sender implementing Grbl's streaming protocols
+    (See https://github.com/gnea/grbl/wiki/Grbl-v1.1-Interface#streaming-protocol-simple-send-response-vs-character-counting)
+
+    Grbl acknowledges every line with "ok" or "error:N". In character counting mode lines are sent as long as
+    the characters of all unacknowledged lines fit into Grbl's 128 byte serial receive buffer (maxchars 127),
+    in send-response (line) mode only maxlines lines are sent without response.
+    """
+
+    def _handleError(self, msg):
+        """
+        Logs error responses.
+        """
+        if msg['f'][1] != 0:
+            logger.error("Grbl response contains an error. Response %s, error %s (%s)",
+                         msg['r'], msg['f'][1], ERRORS.get(msg['f'][1], "Unknown"))
+
+
+    def _checkResponse(self, key, msg):
+        """
+        Grbl responses do not repeat the command, so every response matches.
+        """
+        return True
+
+
+    @QtCore.pyqtSlot()
+    def stop(self):
+        """
+        Resets the output buffers and sends a feedhold.
+        Grbl cannot flush its planner without a reset, which is sent by :meth:`Grbl.stop` when the feedhold
+        is completed.
+        """
+        self._clearSendbuffer()
+        self.tinyg.sendRaw("!")
+        self._emitBufferChanged()
+
+
+
+class Grbl(GrblPlanner, TinyG):
+    """
+    Implementation of MachineBase to control a Grbl (v1.1) board.
+
+    Grbl speaks a line based text protocol: g-code lines and system commands ("$$", "$H", "$110=1000") are
+    acknowledged with "ok" or "error:N", status reports are requested by the real-time command "?" and
+    answered with a single line (e.g. "<Run|MPos:1.000,2.000,0.000|Bf:12,96|FS:500,0>").
+
+    The driver reuses the TinyG spooling infrastructure (sender and receiver threads, queries, planner,
+    checkpoints, status store and telemetry). Received lines are translated into TinyG shaped messages:
+    responses to {"r":..., "f":[1, error, 0]}, status reports to {"sr":...} and the planner state of the
+    status report ("Bf") to queue reports {"qr":...}. Status reports are polled by the receiver thread.
+
+    The g-code program is planned by :class:`Machines.GrblPlanner.GrblPlanner`.
+
+    Commands are dictionaries as for the TinyG: {"gc":line} for g-code, {"$$":None} for system commands and
+    {"$110":1000} for settings.
+
+    Positions are reported in machine coordinates (status report mask $10=3), G54 is set to machine
+    coordinates and G55 to the workpiece origin.
+    Grbl's machine space is negative after homing, the soft limits range from -max travel to 0.
+    """
+
+    senderClass = GrblSender
+
+    def __init__(self):
+        """
+        Constructor
+        """
+        super().__init__()
+        # Grbl 1.1 reports 15 available planner blocks if the planner is empty
+        self.plannerslots = 15
+        self.pollinterval = 0.2
+        self.nextPoll = 0.0
+        self.responseData = {}
+        self.workCoordinateOffset = np.zeros(3)
+        self.stopped = False
+        self.version = None
+
+
+    def initialize(self, comparams, transport=None):
+        """
+        Initialize Grbl communication and settings.
+        Default communication parameters: 115200 baud, 8 data bits, no parity, 1 stop bit, no flow control
+
+        See :meth:´Machines.TinyG.TinyG.initialize´
+        """
+        self.nextPoll = 0.0
+        self.responseData = {}
+        super().initialize(comparams, transport)
+
+
+    def setupBoard(self):
+        """
+        See :meth:´Machines.TinyG.TinyG.setupBoard´
+        """
+        self.workpieceOffset = np.array(self.getDefaultOrigin())
+        self.reset()
+        # report machine positions and buffer states
+        settings = self.executeQuery({'$$':None})['r']
+        if settings.get('$10') != 3:
+            self.executeQuery({'$10':3})
+        # initialize last status report
+        if not self._waitForState(STATES.keys()):
+            raise errs.CommunicationError("?", "No status report received")
+        if self.lastStatus['stat'] == 2:
+            logger.warning("Grbl is in alarm state, homing or unlocking ($X) required.")
+        # set G54 system to absolute (machine) coordinates
+        self.executeCommand({'gc':'g10l2p1x0y0z0'})
+        # set G55 system to default board origin
+        self.executeCommand({'gc':'g10l2p2x{}y{}z{}'.format(*self.getDefaultOrigin())})
+
+
+    def _waitForState(self, states, timeout=None):
+        """
+        Waits for a new status report with one of the given states.
+
+        :param states: Grbl state names (e.g. "Idle", "Hold:0")
+        :type states: iterable(str)
+        :param float timeout: Timeout in s, defaults to the query timeout
+        :returns: False on timeout
+        :rtype: bool
+        """
+        states = set(states)
+        if timeout is None:
+            timeout = self.querytimeout if self.querytimeout > 0 else 10
+        # use timer for timeout
+        timer = QtCore.QTimer()
+        timer.setSingleShot(True)
+        # use local event loop to wait for the status report
+        localloop = QtCore.QEventLoop()
+        def statusReceived(msg):
+            if self.lastStatus.get('state') in states or self.lastStatus.get('state', '').split(":")[0] in states:
+                localloop.quit()
+        self.receiver.sigStatusReportReceived.connect(statusReceived)
+        timer.timeout.connect(localloop.quit)
+        timer.start(int(timeout*1000))
+        localloop.exec()
+        self.receiver.sigStatusReportReceived.disconnect(statusReceived)
+        return timer.isActive()
+
+
+    def stop(self):
+        """
+        Stops the current cycle: a feedhold is sent and Grbl is reset as soon as the machine is holding.
+        A reset during motion would trigger an alarm (position lost).
+
+        See :meth:´Base.MachineBase.MachineBase.stop´
+        """
+        self.stopped = True
+        self.sigStop.emit()
+        if self._waitForState(('Idle', 'Hold:0', 'Door:0', 'Alarm', 'Check', 'Sleep')):
+            homed = self.homed
+            self.reset()
+            self.homed = homed
+        else:
+            logger.error("Grbl feedhold timeout error.")
+
+
+    def isProgramEnd(self):
+        """
+        See :meth:´Machines.TinyG.TinyG.isProgramEnd´
+        """
+        # Grbl has no program end state, the machine is idle if the program was not stopped
+        return not self.stopped and self.lastStatus.get('state') == 'Idle'
+
+
+    def executeCycle(self):
+        """
+        See :meth:´Base.MachineBase.MachineBase.executeCycle´
+        """
+        self.stopped = False
+        super().executeCycle()
+
+
+    def homingCycle(self):
+        """
+        See :meth:´Base.MachineBase.MachineBase.homingCycle´
+        """
+        logger.info("Grbl homing cycle started.")
+        self.homed = False
+        response = self.executeQueries([{'$H':None}], HOMING_TIMEOUT)[0]
+        if response['f'][1] != 0:
+            raise errs.CommunicationError("$H", "Homing failed: {}".format(ERRORS.get(response['f'][1], "Unknown")))
+        self.homed = True
+        logger.info("Grbl homing cycle finished.")
+
+
+    def unlock(self):
+        """
+        Clears the alarm state without homing.
+        """
+        logger.warning("Grbl alarm lock cleared, machine position may be invalid.")
+        self.executeCommand({'$X':None})
+
+
+    def estimateCycleTime(self, program=None):
+        """
+        Estimates the duration of a g-code program from the Grbl axis settings (maximal rates and accelerations,
+        junction deviation) and the basic feeds.
+        Grbl plans constant acceleration (trapezoidal) profiles, which are approximated by jerk limited profiles
+        with the same ramp time at the axis' maximal rate (jerk = 4 a^2 / v).
+
+        See :meth:´Base.MachineBase.MachineBase.estimateCycleTime´
+
+        :param program: g-code lines, defaults to the planner buffer
+        :type program: list(str)
+        """
+        if program is None:
+            program = self.plannerBuffer
+        settings = self.settings
+        if settings is None:
+            settings = self.getParameters().child('axis').getValues()
+        start = (0, 0, 0)
+        if self.isInitialized():
+            start = self.getPosition(False)
+        rates = [settings['$11'+str(i)][0] for i in range(3)]
+        accelerations = [settings['$12'+str(i)][0]*60**2 for i in range(3)]
+        return me.estimateCycleTime(
+            program,
+            rates,
+            [4*a**2/v for a, v in zip(accelerations, rates)],
+            deviation=settings['$11'][0],
+            acceleration=min(accelerations),
+            jogspeed=self.jogspeedXY,
+            start=start
+        )
+
+
+    @staticmethod
+    def serialize(command):
+        """
+        Serializes a command dictionary to a line which can be sent to Grbl:
+        {"gc":line} to the g-code line, {"$$":None} to "$$" and {"$110":1000} to "$110=1000".
+
+        :param dict command: command to serialize
+        :returns: serialized command
+        :rtype: bytes
+        """
+        key, value = next(iter(command.items()))
+        if key == 'gc':
+            line = value
+        elif key.startswith("$"):
+            line = key if value is None else "{}={}".format(key, value)
+        else:
+            raise errs.InvalidArgument("command", "unsupported Grbl command {}".format(key))
+        return (line + "\n").encode('ascii')
+
+
+    def sendRaw(self, message):
+        """
+        Low level function to send real-time commands (e.g. "!", "~", Ctrl-x) to Grbl.
+        Real-time commands are sent without line feed, an empty line would be acknowledged by Grbl.
+        Only the currently active sender object should call this function.
+
+        :param str message: Message to send
+        """
+        logger.debug("Send: %s", message)
+        self.transport.write(message.encode('ascii'))
+
+
+    def receive(self):
+        """
+        Low level function which receives messages from Grbl.
+        Requests a status report every poll interval and blocks until data is available (or the next poll
+        is due). Complete lines are translated into TinyG shaped messages, incomplete lines are kept until
+        the next call.
+        Only the currently active receiver object should call this function.
+
+        :returns: Received messages (empty on timeout)
+        :rtype: list(dict)
+        """
+        transport = self.transport
+        if transport is None:
+            time.sleep(self.comtimeout)
+            return []
+        now = time.perf_counter()
+        if now >= self.nextPoll:
+            self.nextPoll = now + self.pollinterval
+            # status report request, real-time commands do not use the receive buffer
+            transport.write(b"?")
+        data = transport.read(min(self.comtimeout, self.nextPoll - now))
+        if len(data) == 0:
+            return []
+        lines = (self.rxbuffer + data).split(b"\n")
+        self.rxbuffer = lines.pop()
+        messages = []
+        for line in lines:
+            line = line.strip().decode('ascii', errors='replace')
+            if len(line) > 0:
+                messages.extend(self.parseLine(line))
+        return messages
+
+
+    def parseLine(self, line):
+        """
+        Translates a line received from Grbl into TinyG shaped messages.
+        Setting ("$110=1000.000") and feedback ("[GC:G0 G54 ...]") lines are collected and returned with the
+        next response.
+
+        :param str line: received line without line ending
+        :returns: messages
+        :rtype: list(dict)
+        """
+        if line == "ok":
+            response = {'r':self.responseData, 'f':[1, 0, 0]}
+            self.responseData = {}
+            return [response]
+        if line.startswith("error:"):
+            response = {'r':self.responseData, 'f':[1, _number(line[6:]), 0]}
+            self.responseData = {}
+            return [response]
+        if line.startswith("<") and line.endswith(">"):
+            return self.parseStatusReport(line[1:-1])
+        if line.startswith("Grbl "):
+            # welcome message after reset
+            self.responseData = {}
+            self.version = line.split()[1]
+            return [{'r':{'msg':'SYSTEM READY', 'fv':self.version}}]
+        if line.startswith("ALARM:"):
+            code = _number(line[6:])
+            logger.error("Grbl alarm %s: %s", code, ALARMS.get(code, "Unknown"))
+            return [{'sr':{'state':'Alarm', 'stat':STATES['Alarm']}}]
+        if line.startswith("[") and line.endswith("]"):
+            key, _, value = line[1:-1].partition(":")
+            if key == "MSG":
+                logger.info("Grbl message: %s", value)
+            else:
+                self.responseData[key] = value
+            return []
+        if line.startswith("$") and "=" in line:
+            key, _, value = line.partition("=")
+            self.responseData[key] = _number(value)
+            return []
+        logger.warning("Unknown Grbl message received: %s", line)
+        return []
+
+
+    def parseStatusReport(self, report):
+        """
+        Translates a Grbl status report (without brackets) into a status report and a queue report.
+
+        :param str report: status report, e.g. "Idle|MPos:0.000,0.000,0.000|Bf:15,128|FS:0,0"
+        :returns: messages
+        :rtype: list(dict)
+        """
+        fields = report.split("|")
+        status = {'state':fields[0], 'stat':STATES.get(fields[0].split(":")[0], 0), 'coor':1}
+        messages = [{'sr':status}]
+        position = None
+        for field in fields[1:]:
+            key, _, value = field.partition(":")
+            values = value.split(",")
+            try:
+                if key == 'MPos':
+                    position = np.array([float(v) for v in values[:3]])
+                elif key == 'WPos':
+                    position = np.array([float(v) for v in values[:3]]) + self.workCoordinateOffset
+                elif key == 'WCO':
+                    self.workCoordinateOffset = np.array([float(v) for v in values[:3]])
+                elif key == 'Bf':
+                    messages.append({'qr':int(values[0])})
+                elif key in ('FS', 'F'):
+                    status['vel'] = float(values[0])
+            except ValueError:
+                logger.warning("Invalid Grbl status report field: %s", field)
+        if position is not None:
+            status.update({'posx':float(position[0]), 'posy':float(position[1]), 'posz':float(position[2])})
+        return messages
+
+
+    def getStatusText(self):
+        """
+        See :meth:´Machines.TinyG.TinyG.getStatusText´
+        """
+        return "{} (Grbl state: {})".format(
+            self.getStatusMessage('stat', self.lastStatus['stat']),
+            self.lastStatus['state']
+        )
+
+
+    def applyParameters(self, params, hiddenparams=None):
+        """
+        Applies the given machine parameters to the hardware.
+        Grbl stores settings in its EEPROM, so only changed settings are written.
+
+        :param pyqtgraph.GroupParameter params: GroupParameter containing the machine parameters
+        :param pyqtgraph.GroupParameter hiddenparams: GroupParameter containing the hidden parameters
+        """
+        self.pollinterval = params.child('general').child('si').value()/1000
+        self.settings = params.child('motor').getValues()
+        self.settings.update(params.child('axis').getValues())
+        self.settings.update(params.child('homing').getValues())
+        current = self.executeQuery({'$$':None})['r']
+        self.executeQueries([{key:val[0]} for key, val in self.settings.items() if current.get(key) != val[0]])
+        logger.info("Grbl parameters applied.")
+
+
+    def retrieveParameters(self):
+        """
+        See :meth:`Base.MachineBase.MachineBase.retrieveParameters`
+        """
+        params = self.getParameters()
+        values = self.executeQuery({'$$':None})['r']
+        for grp in params.children():
+            for param in grp.children():
+                if param.name() in values:
+                    param.setValue(values[param.name()])
+        return params
+
+
+    def calculateMaxSteps(self, directions):
+        """
+        See :meth:´Machines.TinyG.TinyG.calculateMaxSteps´
+        """
+        if self.settings['$20'][0] == 0:
+            return [1000, 1000, 1000]
+        steps = [0, 0, 0]
+        for i, direction in enumerate(directions):
+            if direction < 0:
+                steps[i] = -self.settings['$13'+str(i)][0]+1
+            else:
+                steps[i] = -1
+        return steps
+
+
+    def getMachineMenu(self):
+        """
+        See :meth:´Base.MachineBase.MachineBase.getMachineMenu´
+        """
+        menu = QtWidgets.QMenu("Grbl")
+        testpanelaction = menu.addAction("Com Testpanel")
+        testpanelaction.triggered.connect(self.mnuTestpanel_triggered)
+        resetaction = menu.addAction("Reset")
+        resetaction.triggered.connect(self.mnuReset_triggered)
+        unlockaction = menu.addAction("Unlock")
+        unlockaction.triggered.connect(self.mnuGrblUnlock_triggered)
+        return menu
+
+
+    @QtCore.pyqtSlot()
+    def mnuGrblUnlock_triggered(self):
+        """
+        Slot triggered when the unlock menu entry is clicked
+        """
+        if not self.isInitialized():
+            QtWidgets.QMessageBox.critical(None, "Not initialized",
+                "Machine communication is not initialized!")
+            return
+        self.unlock()
+
+
+    @staticmethod
+    def getComParameters():
+        """
+        See :meth:´Base.MachineBase.MachineBase.getComParameters´
+        """
+        params = TinyG.getComParameters()
+        params.setName('GrblComSettings')
+        params.child('streaming').setOpts(default=1, value=1)
+        params.child('maxlines').setOpts(limits=(1, 4), default=1, value=1)
+        params.child('maxchars').setOpts(limits=(32, 127), default=127, value=127)
+        return params
+
+
+    @staticmethod
+    def getParameters():
+        """
+        See :meth:´Base.MachineBase.MachineBase.getParameters´
+        """
+        params = {
+            'name':'GrblSettings', 'type':'group', 'children':[
+                {
+                    'name':'general', 'title':'General settings', 'type':'group', 'children':[
+                        {
+                            'name':'si',
+                            'title':'Status report poll interval (ms)',
+                            'type':'int',
+                            'min':50,
+                            'max':1000,
+                            'default':200,
+                            'value':200
+                        }
+                    ]
+                },
+                {
+                    'name':'motor', 'title':'Motor settings', 'type':'group', 'children':[
+                        {
+                            'name':'$0',
+                            'title':'Step pulse time (us)',
+                            'type':'int',
+                            'min':3,
+                            'default':10,
+                            'value':10
+                        },
+                        {
+                            'name':'$1',
+                            'title':'Step idle delay (ms, 255: always on)',
+                            'type':'int',
+                            'limits':(0, 255),
+                            'default':25,
+                            'value':25
+                        },
+                        {
+                            'name':'$2',
+                            'title':'Step port invert mask',
+                            'type':'int',
+                            'limits':(0, 7),
+                            'default':0,
+                            'value':0
+                        },
+                        {
+                            'name':'$3',
+                            'title':'Direction port invert mask',
+                            'type':'int',
+                            'limits':(0, 7),
+                            'default':0,
+                            'value':0
+                        },
+                        {
+                            'name':'$100',
+                            'title':'X axis steps per mm',
+                            'type':'float',
+                            'min':0,
+                            'decimals':5,
+                            'default':157.48,
+                            'value':157.48
+                        },
+                        {
+                            'name':'$101',
+                            'title':'Y axis steps per mm',
+                            'type':'float',
+                            'min':0,
+                            'decimals':5,
+                            'default':157.48,
+                            'value':157.48
+                        },
+                        {
+                            'name':'$102',
+                            'title':'Z axis steps per mm',
+                            'type':'float',
+                            'min':0,
+                            'decimals':5,
+                            'default':157.48,
+                            'value':157.48
+                        }
+                    ]
+                },
+                {
+                    'name':'axis', 'title':'Axis settings', 'type':'group', 'children':[
+                        {
+                            'name':'$110',
+                            'title':'X axis maximal rate (mm/min)',
+                            'type':'float',
+                            'min':0,
+                            'default':1000,
+                            'value':1000
+                        },
+                        {
+                            'name':'$111',
+                            'title':'Y axis maximal rate (mm/min)',
+                            'type':'float',
+                            'min':0,
+                            'default':1000,
+                            'value':1000
+                        },
+                        {
+                            'name':'$112',
+                            'title':'Z axis maximal rate (mm/min)',
+                            'type':'float',
+                            'min':0,
+                            'default':1000,
+                            'value':1000
+                        },
+                        {
+                            'name':'$120',
+                            'title':'X axis acceleration (mm/s^2)',
+                            'type':'float',
+                            'min':0,
+                            'default':10,
+                            'value':10
+                        },
+                        {
+                            'name':'$121',
+                            'title':'Y axis acceleration (mm/s^2)',
+                            'type':'float',
+                            'min':0,
+                            'default':10,
+                            'value':10
+                        },
+                        {
+                            'name':'$122',
+                            'title':'Z axis acceleration (mm/s^2)',
+                            'type':'float',
+                            'min':0,
+                            'default':10,
+                            'value':10
+                        },
+                        {
+                            'name':'$11',
+                            'title':'Junction deviation (mm)',
+                            'type':'float',
+                            'min':0,
+                            'decimals':4,
+                            'default':0.01,
+                            'value':0.01
+                        },
+                        {
+                            'name':'$12',
+                            'title':'Arc tolerance (mm)',
+                            'type':'float',
+                            'min':0,
+                            'decimals':4,
+                            'default':0.002,
+                            'value':0.002
+                        },
+                        {
+                            'name':'$20',
+                            'title':'Enable soft limits',
+                            'type':'list',
+                            'values':{'No':0, 'Yes':1},
+                            'default':0,
+                            'value':0
+                        },
+                        {
+                            'name':'$21',
+                            'title':'Enable hard limits',
+                            'type':'list',
+                            'values':{'No':0, 'Yes':1},
+                            'default':0,
+                            'value':0
+                        },
+                        {
+                            'name':'$130',
+                            'title':'X axis maximal travel (mm)',
+                            'type':'float',
+                            'min':0,
+                            'default':300,
+                            'value':300
+                        },
+                        {
+                            'name':'$131',
+                            'title':'Y axis maximal travel (mm)',
+                            'type':'float',
+                            'min':0,
+                            'default':300,
+                            'value':300
+                        },
+                        {
+                            'name':'$132',
+                            'title':'Z axis maximal travel (mm)',
+                            'type':'float',
+                            'min':0,
+                            'default':300,
+                            'value':300
+                        }
+                    ]
+                },
+                {
+                    'name':'homing', 'title':'Homing settings', 'type':'group', 'children':[
+                        {
+                            'name':'$22',
+                            'title':'Enable homing cycle',
+                            'type':'list',
+                            'values':{'No':0, 'Yes':1},
+                            'default':0,
+                            'value':0
+                        },
+                        {
+                            'name':'$23',
+                            'title':'Homing direction invert mask',
+                            'type':'int',
+                            'limits':(0, 7),
+                            'default':0,
+                            'value':0
+                        },
+                        {
+                            'name':'$24',
+                            'title':'Homing locate feed rate (mm/min)',
+                            'type':'float',
+                            'min':0,
+                            'default':25,
+                            'value':25
+                        },
+                        {
+                            'name':'$25',
+                            'title':'Homing search seek rate (mm/min)',
+                            'type':'float',
+                            'min':0,
+                            'default':500,
+                            'value':500
+                        },
+                        {
+                            'name':'$26',
+                            'title':'Homing switch debounce delay (ms)',
+                            'type':'int',
+                            'min':0,
+                            'default':250,
+                            'value':250
+                        },
+                        {
+                            'name':'$27',
+                            'title':'Homing switch pull-off distance (mm)',
+                            'type':'float',
+                            'min':0,
+                            'default':1,
+                            'value':1
+                        }
+                    ]
+                }
+            ]
+        }
+        return ptypes.GroupParameter(**params)
@@ -0,0 +1,29 @@
+"""
+Created on 19.10.2026
+"""
+
+import logging
+logger = logging.getLogger(__name__)
+
+from Machines.TinyGPlanner import TinyGPlanner
+
+
+class GrblPlanner(TinyGPlanner):
+    """
+    G-code planner of the Grbl board.
+
+    Grbl rejects arcs without an axis word in the selected plane (error 26), so arcs are always planned
+    with their end point. Grbl mills a full circle if the end point equals the start point.
+    """
+
+    # firmware name written to exported programs
+    firmware = "Grbl"
+
+
+    def planMillArc(self, startposition, endposition, center, ccw=True):
+        """
+        See :meth:´Base.MachineBase.MachineBase.planMillArc´
+        """
+        offset = (center[0]-startposition[0], center[1]-startposition[1])
+        command = "g3" if ccw else "g2"
+        self.plannerBuffer.append(command + "x{}y{}i{}j{}f{}".format(*endposition, *offset, self.millspeedXY))
@@ -0,0 +1,546 @@
+"""
+Created on 19.10.2026
+"""
+
+import logging
+logger = logging.getLogger(__name__)
+
+import collections
+import re
+import threading
+import time
+
+import numpy as np
+import pyqtgraph.parametertree.parameterTypes as ptypes
+
+from Algorithms import MotionEstimator as me
+from Base import Transports
+from Machines.Grbl import Grbl
+
+
+# g-code word (letter followed by a number)
+_WORD = re.compile(r'([a-z])([-+]?(?:\d+\.?\d*|\.\d+))')
+
+
+class GrblBoard(object):
+    """
+    Simulated Grbl (v1.1) firmware speaking the text protocol on a :class:`Base.Transports.PipeTransport`
+    (loopback test double for the :class:`Machines.Grbl.Grbl` driver).
+
+    The simulation models
+    - the 128 byte serial receive buffer,
+    - the planner buffer (15 blocks, reported by the "Bf" field of status reports),
+    - constant acceleration (trapezoidal) motion in scaled real time using the settings (maximal rates and
+      accelerations, junction deviation); a block's exit velocity is planned from the next queued block,
+    - status reports requested by "?", settings ("$$", "$n=v") and the system commands $G, $I, $H and $X,
+    - feedhold ("!"), resume ("~") and soft reset (Ctrl-x), a reset during motion raises alarm 3.
+
+    Lines are parsed (and acknowledged with "ok") when the planner has a free block, so the acknowledgements
+    are delayed as long as the planner is full. Overflows of the receive buffer are counted but no data is
+    discarded.
+    """
+
+    def __init__(self, transport, timescale=1.0, rxbuffer=128, plannerslots=15, parameters=None):
+        """
+        Constructor
+
+        :param Base.Transports.PipeTransport transport: Board end of the connection
+        :param float timescale: Simulation speed (e.g. 10 runs motions ten times faster than real time)
+        :param int rxbuffer: Size of the serial receive buffer in bytes
+        :param int plannerslots: Number of planner blocks
+        :param dict parameters: Initial settings {"$n": value}
+        """
+        self.transport = transport
+        self.timescale = timescale
+        self.rxbuffer = rxbuffer
+        self.plannerslots = plannerslots
+        self.settings = {'$10':1, '$11':0.01, '$20':0, '$22':0}
+        for axis in range(3):
+            self.settings.update({'$11'+str(axis):1000, '$12'+str(axis):10, '$13'+str(axis):300})
+        if parameters is not None:
+            self.settings.update(parameters)
+        self.thread = None
+        self.running = False
+        self.alarm = None
+        self.reports = 0
+        # statistics
+        self.linesParsed = 0
+        self.overflows = 0
+        self._reset()
+
+
+    def _reset(self):
+        """
+        Resets the firmware state (machine position and coordinate offsets are kept).
+        """
+        self.rx = b""
+        self.planner = collections.deque()
+        self.block = None
+        self.hold = None
+        self.homing = False
+        self.machinePosition = getattr(self, 'machinePosition', np.zeros(3))
+        self.plannedPosition = self.machinePosition.copy()
+        self.offsets = getattr(self, 'offsets', {1:np.zeros(3), 2:np.zeros(3)})
+        self.coor = 1
+        self.absolute = True
+        self.motionmode = 0
+        self.feed = 0.0
+        self.exitVelocity = 0.0
+        self.clock = time.perf_counter()
+        self.simtime = 0.0
+
+
+    def start(self):
+        """
+        Starts the board in a separate thread.
+        """
+        self.transport.open()
+        self.running = True
+        self.thread = threading.Thread(target=self._run, name="GrblBoard", daemon=True)
+        self.thread.start()
+
+
+    def stop(self):
+        """
+        Stops the board thread.
+        """
+        self.running = False
+        self.transport.close()
+        if self.thread is not None:
+            self.thread.join(2)
+            self.thread = None
+        logger.info("Simulated Grbl stopped (%s lines parsed, %s buffer overflows).", self.linesParsed, self.overflows)
+
+
+    def _run(self):
+        """
+        Board main loop. Waits for data or the end of the current block.
+        """
+        while self.running:
+            try:
+                data = self.transport.read(self._waitTime())
+            except Exception:
+                break
+            self._advance()
+            if len(data) > 0:
+                self._receive(data)
+            self._parse()
+            self._advance()
+
+
+    def _now(self):
+        """
+        :returns: scaled simulation time in s
+        :rtype: float
+        """
+        now = time.perf_counter()
+        self.simtime += (now - self.clock)*self.timescale
+        self.clock = now
+        return self.simtime
+
+
+    def _waitTime(self):
+        """
+        :returns: real time (in s) until the next event
+        :rtype: float
+        """
+        wait = 0.05
+        if self.block is not None and self.hold is None:
+            wait = min(wait, max(self.block['end'] - self._now(), 0)/self.timescale)
+        return wait
+
+
+    def _send(self, *lines):
+        """
+        :param str lines: lines to send to the host
+        """
+        self.transport.write("".join(line + "\r\n" for line in lines).encode('ascii'))
+
+
+    def _state(self):
+        """
+        :returns: Grbl state name
+        :rtype: str
+        """
+        if self.alarm is not None:
+            return "Alarm"
+        if self.hold is not None:
+            return "Hold:0"
+        if self.block is not None:
+            return "Home" if self.block['type'] == 'home' else "Run"
+        return "Idle"
+
+
+    def _receive(self, data):
+        """
+        Handles received data: real-time commands are executed immediately, other data is appended to the
+        receive buffer.
+
+        :param bytes data: received data
+        """
+        for char in (b"?", b"!", b"~", b"\x18"):
+            if char in data:
+                data = data.replace(char, b"")
+                self._realtime(char)
+        self.rx += data
+        if len(self.rx) > self.rxbuffer:
+            self.overflows += 1
+            logger.warning("Simulated Grbl receive buffer overflow (%s bytes).", len(self.rx))
+
+
+    def _realtime(self, char):
+        """
+        Executes a real-time command.
+
+        :param bytes char: command character
+        """
+        now = self._now()
+        if char == b"?":
+            self._send(self._statusReport())
+        elif char == b"!" and self.hold is None and self.block is not None:
+            self.hold = now
+            self.machinePosition = self._position(now)
+        elif char == b"~" and self.hold is not None:
+            # continue the current block after the hold
+            delay = now - self.hold
+            self.block['start'] += delay
+            self.block['end'] += delay
+            self.hold = None
+        elif char == b"\x18":
+            if self.block is not None and self.hold is None:
+                self.machinePosition = self._position(now)
+                self.alarm = 3
+                self._send("ALARM:3")
+            self._reset()
+            self._send("", "Grbl 1.1h ['$' for help]")
+            if self.alarm is not None:
+                self._send("[MSG:'$H'|'$X' to unlock]")
+
+
+    def _parse(self):
+        """
+        Parses lines from the receive buffer as long as the planner has free blocks.
+        Like Grbl, no lines are parsed during the homing cycle.
+        """
+        while b"\n" in self.rx and not self.homing:
+            if len(self.planner) + (self.block is not None) >= self.plannerslots:
+                break
+            line, self.rx = self.rx.split(b"\n", 1)
+            line = line.strip().decode('ascii', errors='replace').lower().replace(" ", "")
+            self.linesParsed += 1
+            error = self._system(line) if line.startswith("$") else self._gcode(line)
+            # $h is acknowledged when the homing block is finished (see _advance)
+            if not self.homing:
+                self._send("ok" if error == 0 else "error:{}".format(error))
+
+
+    def _system(self, line):
+        """
+        Executes a system command.
+
+        :param str line: command line (lower case, without whitespace)
+        :returns: error code (0 if successful)
+        :rtype: int
+        """
+        if line == "$$":
+            self._send(*("{}={}".format(key, value) for key, value in sorted(self.settings.items(),
+                                                                            key=lambda item: int(item[0][1:]))))
+        elif line == "$g":
+            self._send("[GC:G{} G{} G17 G21 G{} G94 M5 M9 T0 F{} S0]".format(
+                self.motionmode, 53+self.coor, 90 if self.absolute else 91, self.feed))
+        elif line == "$i":
+            self._send("[VER:1.1h.simulator:]", "[OPT:V,15,128]")
+        elif line == "$x":
+            if self.alarm is not None:
+                self.alarm = None
+                self._send("[MSG:Caution: Unlocked]")
+        elif line == "$h":
+            if self.settings.get('$22', 0) == 0:
+                return 5
+            self.alarm = None
+            self.homing = True
+            self.planner.append({'type':'home', 'target':np.zeros(3), 'duration':1.0})
+            self.plannedPosition = np.zeros(3)
+        elif "=" in line:
+            if self._state() not in ("Idle", "Alarm"):
+                return 8
+            key, _, value = line.partition("=")
+            try:
+                value = float(value)
+            except ValueError:
+                return 2
+            self.settings[key] = int(value) if value.is_integer() else value
+        else:
+            return 3
+        return 0
+
+
+    def _gcode(self, line):
+        """
+        Interprets a g-code line and queues resulting motion blocks.
+
+        :param str line: g-code line (lower case, without whitespace)
+        :returns: error code (0 if successful)
+        :rtype: int
+        """
+        if len(line) == 0:
+            return 0
+        if self.alarm is not None:
+            return 9
+        words = [(letter, float(number)) for letter, number in _WORD.findall(line)]
+        if len(words) == 0:
+            return 1
+        values = {letter:number for letter, number in words if letter != 'g' and letter != 'm'}
+        motion = None
+        for letter, number in words:
+            if letter == 'g':
+                if number in (0, 1, 2, 3):
+                    self.motionmode = int(number)
+                    motion = self.motionmode
+                elif number == 4:
+                    self.planner.append({'type':'dwell', 'duration':values.get('p', 0)})
+                    return 0
+                elif number == 10 and values.get('l') == 2:
+                    offset = self.offsets.setdefault(int(values.get('p', 1)), np.zeros(3))
+                    for i, axis in enumerate('xyz'):
+                        if axis in values:
+                            offset[i] = values[axis]
+                    return 0
+                elif number == 53 or number == 54:
+                    self.coor = 1
+                elif number == 55:
+                    self.coor = 2
+                elif number == 90:
+                    self.absolute = True
+                elif number == 91:
+                    self.absolute = False
+                elif not number in (17, 21, 94):
+                    return 20
+            elif letter == 'm':
+                if number in (2, 30):
+                    # program end resets the modal state
+                    self.coor = 1
+                    self.absolute = True
+                    self.motionmode = 1
+                elif not number in (3, 4, 5, 7, 8, 9):
+                    return 20
+        if 'f' in values:
+            self.feed = values['f']
+        if motion is None and any(axis in values for axis in 'xyz'):
+            motion = self.motionmode
+        if motion is None:
+            return 0
+        if motion != 0 and self.feed <= 0:
+            return 22
+        if motion in (2, 3) and not ('x' in values or 'y' in values):
+            return 26
+        start = self.plannedPosition.copy()
+        target = start.copy()
+        offset = self.offsets.get(self.coor, np.zeros(3))
+        for i, axis in enumerate('xyz'):
+            if axis in values:
+                target[i] = offset[i] + values[axis] if self.absolute else start[i] + values[axis]
+        center = start[:2] + np.array([values.get('i', 0), values.get('j', 0)])
+        segment = {
+            'start':start[None, :], 'end':target[None, :], 'center':center[None, :],
+            'mode':np.array([motion]), 'feed':np.array([np.inf if motion == 0 else self.feed])
+        }
+        lengths, entry, exit, direction = me.segmentGeometry(segment)
+        if lengths[0] <= 0:
+            return 0
+        rates = [self.settings['$11'+str(i)] for i in range(3)]
+        accelerations = [self.settings['$12'+str(i)] for i in range(3)]
+        self.planner.append({
+            'type':'move', 'target':target, 'length':lengths[0], 'entry':entry[0], 'exit':exit[0],
+            'cruise':min(segment['feed'][0], me.axisLimit(direction, rates)[0])/60,
+            'acceleration':me.axisLimit(direction, accelerations)[0]
+        })
+        self.plannedPosition = target
+        return 0
+
+
+    def _advance(self):
+        """
+        Executes planner blocks up to the current simulation time.
+        """
+        now = self._now()
+        if self.hold is not None:
+            return
+        while True:
+            if self.block is not None:
+                if now < self.block['end']:
+                    return
+                # block finished
+                if 'target' in self.block:
+                    self.machinePosition = self.block['target']
+                if self.block['type'] == 'home':
+                    self.homing = False
+                    self._send("ok")
+                starttime = self.block['end']
+                self.block = None
+            else:
+                starttime = now
+            if len(self.planner) == 0:
+                self.exitVelocity = 0.0
+                return
+            self._startBlock(self.planner.popleft(), starttime)
+
+
+    def _startBlock(self, block, starttime):
+        """
+        Starts the execution of a planner block.
+
+        :param dict block: planner block
+        :param float starttime: simulation time the block starts at
+        """
+        duration = block.get('duration', 0)
+        if block['type'] == 'move':
+            length, a, vc = block['length'], block['acceleration'], block['cruise']
+            v0 = min(self.exitVelocity, vc)
+            v1 = 0.0
+            following = self.planner[0] if len(self.planner) > 0 else None
+            if following is not None and following['type'] == 'move':
+                vj = me.junctionVelocities(
+                    np.array([block['exit'], following['exit']]),
+                    np.array([block['entry'], following['entry']]),
+                    np.array([vc, following['cruise']]),
+                    self.settings['$11'],
+                    min(a, following['acceleration'])
+                )
+                v1 = min(vj[1], np.sqrt(v0**2 + 2*a*length))
+            # trapezoidal profile, the peak velocity is reduced on short blocks
+            vp = max(min(vc, np.sqrt((2*a*length + v0**2 + v1**2)/2)), v0, v1)
+            ramps = (2*vp**2 - v0**2 - v1**2)/(2*a)
+            duration = (2*vp - v0 - v1)/a + max(length - ramps, 0)/vp
+            self.exitVelocity = v1
+            block['velocity'] = length/duration*60 if duration > 0 else 0
+        else:
+            self.exitVelocity = 0.0
+        block['origin'] = self.machinePosition.copy()
+        block['start'] = starttime
+        block['end'] = starttime + duration
+        self.block = block
+
+
+    def _position(self, now):
+        """
+        :param float now: simulation time
+        :returns: machine position at the given time (interpolated linearly within the current block)
+        :rtype: np.ndarray(float)
+        """
+        block = self.block
+        if block is None or not 'target' in block:
+            return self.machinePosition.copy()
+        duration = block['end'] - block['start']
+        fraction = 1.0 if duration <= 0 else min(max((now - block['start'])/duration, 0), 1)
+        return block['origin'] + (block['target'] - block['origin'])*fraction
+
+
+    def _statusReport(self):
+        """
+        :returns: status report line (according to the status report mask $10)
+        :rtype: str
+        """
+        now = self._now() if self.hold is None else self.hold
+        position = self._position(now)
+        offset = self.offsets.get(self.coor, np.zeros(3))
+        fields = [self._state()]
+        if self.settings.get('$10', 1) & 1:
+            fields.append("MPos:{:.3f},{:.3f},{:.3f}".format(*position))
+        else:
+            fields.append("WPos:{:.3f},{:.3f},{:.3f}".format(*(position - offset)))
+        if self.settings.get('$10', 1) & 2:
+            fields.append("Bf:{},{}".format(self.plannerslots - len(self.planner) - (self.block is not None),
+                                            max(self.rxbuffer - len(self.rx), 0)))
+        velocity = self.block.get('velocity', 0) if self.block is not None and self.hold is None else 0
+        fields.append("FS:{:.0f},0".format(velocity))
+        # work coordinate offset is reported every 10th report
+        if self.reports % 10 == 0:
+            fields.append("WCO:{:.3f},{:.3f},{:.3f}".format(*offset))
+        self.reports += 1
+        return "<" + "|".join(fields) + ">"
+
+
+
+class GrblSimulator(Grbl):
+    """
+    Simulated Grbl machine. Uses the :class:`Machines.Grbl.Grbl` driver connected to a :class:`GrblBoard` by an
+    in-memory pipe, so complete cycles can be run (dry run) without hardware.
+    """
+
+    def __init__(self):
+        """
+        Constructor
+        """
+        super().__init__()
+        self.board = None
+
+
+    def initialize(self, comparams, transport=None):
+        """
+        Starts the simulated board and initializes the Grbl communication.
+
+        :param pyqtgraph.GroupParameter comparams: GroupParameter containing the communication parameters
+        :param Base.Transports.Transport transport: ignored, the simulator always uses an in-memory pipe
+        """
+        hostend, boardend = Transports.PipeTransport.createPair()
+        parameters = {}
+        for group in self.getParameters().children():
+            parameters.update({param.name():param.value() for param in group.children()
+                               if param.name().startswith("$")})
+        self.board = GrblBoard(boardend, timescale=comparams.child('timescale').value(), parameters=parameters)
+        self.board.start()
+        logger.info("Simulated Grbl started (time scale %s).", self.board.timescale)
+        try:
+            super().initialize(comparams, hostend)
+        except Exception:
+            # Grbl.initialize finalizes on errors, which already stops the board
+            if self.board is not None:
+                self.board.stop()
+                self.board = None
+            raise
+
+
+    def finalize(self):
+        """
+        Finalizes the communication and stops the simulated board.
+        """
+        try:
+            super().finalize()
+        finally:
+            if self.board is not None:
+                self.board.stop()
+                self.board = None
+
+
+    @staticmethod
+    def getComParameters():
+        """
+        See :meth:´Base.MachineBase.MachineBase.getComParameters´
+        """
+        params = {
+            'name':'GrblSimulatorComSettings', 'type':'group', 'children':[
+                {
+                    'name':'timescale',
+                    'title':'Time Scale',
+                    'type':'float',
+                    'limits':(0.01, 1000),
+                    'default':1,
+                    'value':1
+                }
+            ]
+        }
+        params = ptypes.GroupParameter(**params)
+        # use Grbl's protocol settings, the connection settings are not needed
+        for param in Grbl.getComParameters().children():
+            if param.name() in ('timeout', 'streaming', 'maxlines', 'maxchars', 'telemetry', 'telemetryfile'):
+                params.addChild(param.saveState())
+        return params
+
+
+    @staticmethod
+    def updateComParameters(params):
+        """
+        See :meth:´Base.MachineBase.MachineBase.updateComParameters´
+        """
+        pass
@@ -10,55 +10,77 @@ logger = logging.getLogger(__name__)
 from PyQt5 import QtCore, QtWidgets
 import numpy as np
 import json
+import collections
 #import io
-import serial
 import serial.tools.list_ports as slp
 import time
 import pyqtgraph.parametertree.parameterTypes as ptypes
 
 import Base.Errors as errs
+from Base import GCode
+from Base import Telemetry
+from Base import Transports
+from Base.LazyImport import lazyImport
 from Base.MachineBase import MachineBase
-from ui.TinyGCycleControl import TinyGCycleControl
-from ui.TinyGTestpanel import TinyGTestpanel
+from Machines.TinyGPlanner import TinyGPlanner
+from Algorithms import MotionEstimator as me
+# dialogs are only imported when opened
+cyclecontrol = lazyImport('ui.TinyGCycleControl')
+testpanel = lazyImport('ui.TinyGTestpanel')
 
 
 class TinyGSender(QtCore.QObject):
     """
     Worker class which sends commands to the TinyG board. Will be run in a separate thread.
 
-    This class manages a command buffer to implement TinyG's linemode protocol.
+    This class manages a command buffer to implement TinyG's linemode protocol or character counting
     (See https://github.com/synthetos/TinyG/wiki/Tinyg-Communications-Programming)
 
+    In line mode at most maxlines lines are sent to the board without response. In character mode lines are
+    sent as long as the characters of all lines without response fit into the board's serial receive buffer,
+    which keeps the planner queue filled with short lines.
+
     Inherits from QObject to support Qt's threading and signal/slot mechanisms.
 
     ===================  ===================================================================================
     **Signals**
     ===================  ===================================================================================
     sigQueryReceived     Emitted when the answer to a query command is received.
-                         Carries a command response dictionary.
+                         Carries the query id and a command response dictionary.
     sigBufferChanged     Emitted when the output buffer content changed.
-                         Carries a dictionary {'sendbuffersize', 'usedlines'}
+                         Carries a dictionary {'sendbuffersize', 'usedlines', 'usedchars', 'programlines',
+                         'programacked'} where programlines is the number of sent lines of the current program
+                         and programacked the number of its lines acknowledged by the board.
     ===================  ===================================================================================
     """
     
-    sigQueryReceived = QtCore.pyqtSignal(dict)
+    sigQueryReceived = QtCore.pyqtSignal(int, dict)
     sigBufferChanged = QtCore.pyqtSignal(dict)
     
-    def __init__(self, tinyg, receiver, maxlines=4, parent=None):
+    def __init__(self, tinyg, receiver, maxlines=4, charmode=False, maxchars=254, parent=None):
         """
         Constructor
 
         :param TinyG tinyg: TinyG object using the sender.
         :param TinyGReciever receiver: Currently active TinyGSender object.
-        :param int maxlines: Maximal number of lines to be stored in the TinyG board's linebuffer.
+        :param int maxlines: Maximal number of lines to be stored in the TinyG board's linebuffer (line mode).
+        :param bool charmode: Use character counting instead of line mode.
+        :param int maxchars: Maximal number of characters to be stored in the TinyG board's serial receive
+                             buffer (character mode).
         """
         super().__init__(parent)
         
         self.tinyg = tinyg
         self.receiver = receiver
         self.maxlines = maxlines
+        self.charmode = charmode
+        self.maxchars = maxchars
         self.sendbuffer = []
-        self.querybuffer = ""
+        self.nextmessage = None
+        self.pendinglines = collections.deque()
+        self.usedchars = 0
+        self.programlines = 0
+        self.programacked = 0
         self.lastQueryResult = None
         self.freelines = maxlines
         self.testpanel = None
@@ -66,12 +88,14 @@ class TinyGSender(QtCore.QObject):
         self.cycledlg = None
         
         self.tinyg.sigCommand.connect(self.appendCommand)
-        self.tinyg.sigQuery.connect(self.appendQuery)
+        self.tinyg.sigQuery.connect(self.appendQueries)
+        self.tinyg.sigCancelQuery.connect(self.cancelQueries)
+        self.tinyg.sigProgram.connect(self.appendProgram)
         self.tinyg.sigFeedhold.connect(self.feedhold)
         self.tinyg.sigResume.connect(self.resume)
         self.tinyg.sigStop.connect(self.stop)
         self.tinyg.sigReset.connect(self.reset)
-        self.receiver.sigResponseReceived.connect(self.signalReceived)
+        self.receiver.sigResponsesReceived.connect(self.responsesReceived)
             
     
     def getLastQueryResult(self):
@@ -82,21 +106,97 @@ class TinyGSender(QtCore.QObject):
         return self.lastQueryResult
     
     
+    def _nextMessage(self):
+        """
+        Takes the next serialized command from the command buffer.
+
+        :returns: serialized command, (key, query id) for queries or None for other commands and
+                  True for program lines (or None if the command buffer is empty)
+        :rtype: tuple(bytes, tuple(str, int), bool)
+        """
+        while len(self.sendbuffer) > 0:
+            cmd = self.sendbuffer[0]
+            if isinstance(cmd, bytes):
+                self.sendbuffer.pop(0)
+                return (cmd, None, False)
+            if isinstance(cmd, tuple):
+                # query: (serialized command, key, query id)
+                self.sendbuffer.pop(0)
+                return (cmd[0], cmd[1:], False)
+            # program: pull next line from the iterator
+            cmd = next(cmd, None)
+            if cmd is None:
+                self.sendbuffer.pop(0)
+                continue
+            self.programlines += 1
+            return (cmd, None, True)
+        return None
+    
+    
     def _work(self):
         """
         Handles sending lines to the board to keep the linebuffer filled.
+        All lines fitting into the linebuffer are written at once.
         Should not be called directy.
         """
-        while len(self.sendbuffer) > 0 and self.freelines > 0:
-            self.tinyg.send(self.sendbuffer.pop(0))
-            self.freelines -= 1
-            logger.debug("Free line buffers: %s", self.freelines)
-            # check if linebuffer is in sync
-            if self.freelines < 0:
-                logger.warning("freelines < 0! Linebuffer out of sync?")
-                self.freelines = 0
+        batch = []
+        now = time.perf_counter()
+        while self.charmode or self.freelines > 0:
+            if self.nextmessage is None:
+                self.nextmessage = self._nextMessage()
+                if self.nextmessage is None:
+                    break
+            message, query, program = self.nextmessage
+            # character mode: wait until the line fits into the receive buffer
+            if self.charmode and len(self.pendinglines) > 0 and \
+                    self.usedchars + len(message) > self.maxchars:
+                break
+            batch.append(message)
+            self.pendinglines.append((len(message), query, now, program))
+            self.usedchars += len(message)
+            self.nextmessage = None
+            # the line counter is only used in line mode
+            if not self.charmode:
+                self.freelines -= 1
+                # check if linebuffer is in sync
+                if self.freelines < 0:
+                    logger.warning("freelines < 0! Linebuffer out of sync?")
+                    self.freelines = 0
+        if len(batch) > 0:
+            data = b"".join(batch)
+            self.tinyg.write(data)
+            logger.debug("Free line buffers: %s, used characters: %s", self.freelines, self.usedchars)
+            telemetry = self.tinyg.telemetry
+            if telemetry is not None:
+                telemetry.record(Telemetry.SEND, len(data), len(batch))
+                telemetry.record(Telemetry.LINEBUFFER, len(self.pendinglines), self.usedchars)
                 
                 
+    def _clearSendbuffer(self):
+        """
+        Clears the command buffer, closes pending programs and resets the linebuffer state.
+        """
+        for cmd in self.sendbuffer:
+            if hasattr(cmd, 'close'):
+                cmd.close()
+        self.sendbuffer.clear()
+        self.nextmessage = None
+        self.pendinglines.clear()
+        self.usedchars = 0
+        self.freelines = self.maxlines
+    
+    
+    def _emitBufferChanged(self):
+        """
+        Emits the sigBufferChanged signal with the current buffer state.
+        """
+        self.sigBufferChanged.emit({'sendbuffersize':len(self.sendbuffer), 
+                                    'usedlines':len(self.pendinglines),
+                                    'usedchars':self.usedchars,
+                                    'programlines':self.programlines,
+                                    'programacked':self.programacked})
+    
+    
     def _handleError(self, msg):
         """
         Filters and logs error responses.
@@ -104,9 +204,21 @@ class TinyGSender(QtCore.QObject):
         if msg['f'][1] != 0:
             # filter lesser warnings (currently only 201 "MINIMUM_LENGTH_MOVE"
             if msg['f'][1] in (201,):
-                logger.debug("TinyG response contains a warning. Command %s, error %s", msg['r'], msg['f'][1])
+                logger.debug("%s response contains a warning. Command %s, error %s", self.tinyg.getName(), msg['r'], msg['f'][1])
             else:
-                logger.error("TinyG response contains an error. Command %s, error %s", msg['r'], msg['f'][1])
+                logger.error("%s response contains an error. Command %s, error %s", self.tinyg.getName(), msg['r'], msg['f'][1])
+    
+    
+    def _checkResponse(self, key, msg):
+        """
+        Checks if a response answers the query command with the given key.
+
+        :param str key: key of the query command
+        :param dict msg: response
+        :returns: True if the response matches the query
+        :rtype: bool
+        """
+        return key in msg['r'].keys()
                 
     
     @QtCore.pyqtSlot(dict)
@@ -118,28 +230,65 @@ class TinyGSender(QtCore.QObject):
         :param dict cmd: command
         """
         logger.debug("Appended command: %s", cmd)
-        self.sendbuffer.append(cmd)
+        self.sendbuffer.append(self.tinyg.serialize(cmd))
         self._work()
     
     
-    @QtCore.pyqtSlot(dict)
-    def appendQuery(self, cmd):
+    @QtCore.pyqtSlot(object)
+    def appendProgram(self, program):
         """
-        Append a query command to the command buffer.
-        Queries can only be processed one at a time - use :meth:`TinyG.executeQuery` for synchronous processing.
-        The answer to queries is returned via the sigQueryReceived signal and also stored in the
+        Append a g-code program to the command buffer. The program lines are pulled from the iterator
+        when there is space in the linebuffer, so programs can be streamed from files.
+        Not meant to be called directly, programs should be passed by the :attr:`TinyG.sigProgram` signal.
+
+        :param program: serialized g-code commands (see :meth:`TinyG.serializeProgram`)
+        :type program: iterator(bytes)
+        """
+        logger.debug("Appended program.")
+        self.sendbuffer.append(program)
+        self.programlines = 0
+        self.programacked = 0
+        self._work()
+    
+    
+    @QtCore.pyqtSlot(int, list)
+    def appendQueries(self, queryid, cmds):
+        """
+        Append query commands to the command buffer.
+        Multiple queries can be in flight at once, the responses are matched to the queries by their position
+        in the linebuffer and checked by key - use :meth:`TinyG.executeQueries` for synchronous processing.
+        The answers to queries are returned via the sigQueryReceived signal and also stored in the
         lastQueryResult field.
 
         Not meant to be called directly, commands should be passed by the :attr:`TinyG.sigQuery` signal.
 
-        :parmam dict cmd: command
+        :param int queryid: id to identify the responses
+        :param list(dict) cmds: commands
         """
-        logger.debug("Appended query: %s", cmd)
-        self.sendbuffer.append(cmd)
-        self.querybuffer = list(cmd.keys())[0]
+        logger.debug("Appended queries: %s", cmds)
+        for cmd in cmds:
+            self.sendbuffer.append((self.tinyg.serialize(cmd), list(cmd.keys())[0], queryid))
         self._work()
         
         
+    @QtCore.pyqtSlot(int)
+    def cancelQueries(self, queryid):
+        """
+        Removes the not yet sent commands of a query from the command buffer.
+        Commands which are already sent will still be answered by the board.
+
+        Not meant to be called directly, use :meth:`TinyG.cancelQueries`.
+
+        :param int queryid: id of the query to cancel
+        """
+        size = len(self.sendbuffer)
+        self.sendbuffer = [cmd for cmd in self.sendbuffer if not (isinstance(cmd, tuple) and cmd[2] == queryid)]
+        if self.nextmessage is not None and self.nextmessage[1] is not None and self.nextmessage[1][1] == queryid:
+            self.nextmessage = None
+            size += 1
+        logger.debug("Canceled query %s (%s commands not sent).", queryid, size-len(self.sendbuffer))
+        
+        
     @QtCore.pyqtSlot()
     def feedhold(self):
         """
@@ -161,11 +310,9 @@ class TinyGSender(QtCore.QObject):
         """
         Sends a stop command and resets output buffers.
         """
-        self.sendbuffer.clear()
+        self._clearSendbuffer()
         self.tinyg.sendRaw("!%")
-        self.freelines = self.maxlines
-        self.sigBufferChanged.emit({'sendbuffersize':len(self.sendbuffer), 
-                                    'usedlines':(self.maxlines-self.freelines)})
+        self._emitBufferChanged()
 
 
     @QtCore.pyqtSlot()
@@ -173,36 +320,50 @@ class TinyGSender(QtCore.QObject):
         """
         Sends a reset command and resets output buffers.
         """
-        self.sendbuffer.clear()
+        self._clearSendbuffer()
         self.tinyg.sendRaw("\x18")  # reset: Cancel character (Ctrl-x)
-        self.freelines = self.maxlines
-        self.sigBufferChanged.emit({'sendbuffersize':len(self.sendbuffer), 
-                                    'usedlines':(self.maxlines-self.freelines)})
+        self._emitBufferChanged()
     
     
-    @QtCore.pyqtSlot(dict)
-    def signalReceived(self, msg):
+    @QtCore.pyqtSlot(list)
+    def responsesReceived(self, msgs):
         """
-        When a response is received by the :class:`TinyGReceiver` object it is then passed to this slot.
+        When responses are received by the :class:`TinyGReceiver` object they are passed to this slot
+        in batches.
 
-        :param dict msg: message
-        """
-        self.freelines += 1
-        logger.debug("Free line buffers: %s", self.freelines)
+        :param list(dict) msgs: messages
+        """
+        telemetry = self.tinyg.telemetry
+        now = time.perf_counter()
+        for msg in msgs:
+            if not self.charmode:
+                self.freelines += 1
+            query = None
+            if len(self.pendinglines) > 0:
+                length, query, sent, program = self.pendinglines.popleft()
+                self.usedchars -= length
+                if program:
+                    self.programacked += 1
+                if telemetry is not None:
+                    telemetry.record(Telemetry.ACK, now-sent)
+            # check if the response contains an error
+            self._handleError(msg)
+            # check if response belongs to a query
+            if query is not None:
+                key, queryid = query
+                if not self._checkResponse(key, msg):
+                    logger.warning("Query response does not match key %s: %s", key, msg)
+                self.lastQueryResult = msg
+                self.sigQueryReceived.emit(queryid, msg)
+        logger.debug("Free line buffers: %s, used characters: %s", self.freelines, self.usedchars)
         # check if linebuffer is in sync
         if self.freelines > self.maxlines:
             logger.warning("maxlines exceeded! Linebuffer out of sync?")
             self.freelines = self.maxlines
-        # check if the response contains an error
-        self._handleError(msg)
-        # check if response is in querybuffer
-        if list(msg["r"].keys())[0] == self.querybuffer:
-            self.querybuffer = ""
-            self.lastQueryResult = msg
-            self.sigQueryReceived.emit(msg)
+        if telemetry is not None:
+            telemetry.record(Telemetry.LINEBUFFER, len(self.pendinglines), self.usedchars)
         self._work()
-        self.sigBufferChanged.emit({'sendbuffersize':len(self.sendbuffer), 
-                                    'usedlines':(self.maxlines-self.freelines)})
+        self._emitBufferChanged()
     
     
     
@@ -210,30 +371,33 @@ class TinyGReceiver(QtCore.QObject):
     """
     Worker class which receives responses from the TinyG board. Will be run in a separate thread.
 
-    Until the thread is stopped, this class waits for received messages and passes the answers to the
-    sender thread where they will be processed and eventually passed to the main thread.
+    Until the thread is stopped, this class blocks on the serial port waiting for data. All available data
+    is read at once, split into lines and parsed in batches. The answers are passed to the sender thread where
+    they will be processed and eventually passed to the main thread.
+    Status and queue reports of one batch are coalesced into a single signal.
 
     Inherits from QObject to support Qt's threading and signal/slot mechanisms.
 
     =========================  ===============================================================================
     **Signals**
     =========================  ===============================================================================
-    sigResponseReceived        Emitted when a response is received from the TinyG board.
+    sigResponsesReceived       Emitted when responses are received from the TinyG board.
                                This signal's purpose is to pass the raw responses to the active TinyGSender
                                object which runs in a separate thread.
-                               Carries a dictionary containing the response.
+                               Carries a list of dictionaries containing the responses.
     sigSystemReadyReceived     Emitted when a system ready response is received.
                                Carries a dictionary containing the response.
     sigStatusReportReceived    Emitted when a status report is received from the TinyG board.
-                               Carries a dictionary containing the status report.
+                               Carries a dictionary containing the status report (merged from all status
+                               reports of a batch).
     sigQueueReportReceived     Emitted when a queue report is received from the TinyG board.
-                               Carries a dictionary containing the queue report.
+                               Carries a dictionary containing the latest queue report of a batch.
     sigUnknownMessageReceived  Emitted when a unknown message is received.
                                Carries a dictionary containing the message.
     =========================  ===============================================================================
     """
     
-    sigResponseReceived = QtCore.pyqtSignal(dict)
+    sigResponsesReceived = QtCore.pyqtSignal(list)
     sigSystemReadyReceived = QtCore.pyqtSignal(dict)
     sigStatusReportReceived = QtCore.pyqtSignal(dict)
     sigQueueReportReceived = QtCore.pyqtSignal(dict)
@@ -250,23 +414,29 @@ class TinyGReceiver(QtCore.QObject):
         
         self.tinyg = tinyg
         self.running = False
-        self.timer = None
         self.tinyg.sigInitialize.connect(self._run)
-        self.tinyg.sigFinalize.connect(self._quit)
+        # the receiver loop blocks the thread's event loop, so stop it directly from the calling thread
+        self.tinyg.sigFinalize.connect(self._quit, QtCore.Qt.DirectConnection)
         
     
     @QtCore.pyqtSlot()
     def _run(self):
         """
-        Starts the receiver loop. Should not be called directly.
+        Receiver loop. Should not be called directly.
         """
         self.running = True
-        # QTimers with timeout=0 will timeout as soon as all events are processed
-        self.timer = QtCore.QTimer(self)
-        self.timer.setInterval(0)
-        self.timer.timeout.connect(self._work)
-        self.timer.start()
         logger.debug("TinyGReceiver main loop started.")
+        while self.running:
+            try:
+                messages = self.tinyg.receive()
+            except Exception as e:
+                if not self.running:
+                    break
+                logger.error("%s receive error: %s", self.tinyg.getName(), e)
+                continue
+            if len(messages) > 0:
+                self._dispatch(messages)
+        logger.debug("TinyGReceiver stopped.")
         
         
     @QtCore.pyqtSlot()
@@ -274,41 +444,58 @@ class TinyGReceiver(QtCore.QObject):
         """
         Stops the receiver loop. Should not be called directly.
         """
-        self.timer.stop()
-        self.timer = None
         self.running = False
-        logger.debug("TinyGReceiver stopped.")
     
     
-    @QtCore.pyqtSlot()
-    def _work(self):
+    def _dispatch(self, messages):
         """
-        Receiver loop. Should not be called directly.
+        Sorts a batch of messages and emits the corresponding signals. Should not be called directly.
+
+        :param list(dict) messages: received messages
         """
-        response = self.tinyg.receive()
-        if response is not None:
-            if "r" in response.keys():
+        responses = []
+        statusreport = None
+        queuereport = None
+        for message in messages:
+            if "r" in message.keys():
                 # special case: SYSTEM READY message after reset
-                if "msg" in response['r'].keys() and response['r']['msg'] == "SYSTEM READY":
-                    self.sigSystemReadyReceived.emit(response['r'])
-                    logger.info("TinyG reboot complete: %s", response['r'])
+                if "msg" in message['r'].keys() and message['r']['msg'] == "SYSTEM READY":
+                    self.sigSystemReadyReceived.emit(message['r'])
+                    logger.info("%s reboot complete: %s", self.tinyg.getName(), message['r'])
+                else:
+                    responses.append(message)
+            elif "sr" in message.keys():
+                if statusreport is None:
+                    statusreport = message
                 else:
-                    self.sigResponseReceived.emit(response)
-            elif "sr" in response.keys():
-                self.sigStatusReportReceived.emit(response)
-            elif "qr" in response.keys():
-                self.sigQueueReportReceived.emit(response)
-            elif "rx" in response.keys():
-                logger.debug("RX received: %s", response)
+                    statusreport['sr'].update(message['sr'])
+            elif "qr" in message.keys():
+                queuereport = message
+            elif "rx" in message.keys():
+                logger.debug("RX received: %s", message)
             else:
-                logger.warning("Unknown response received: %s", response)
-                self.sigUnknownMessageReceived.emit(response)
+                logger.warning("Unknown response received: %s", message)
+                self.sigUnknownMessageReceived.emit(message)
+        if len(responses) > 0:
+            self.sigResponsesReceived.emit(responses)
+        if statusreport is not None:
+            self.sigStatusReportReceived.emit(statusreport)
+        if queuereport is not None:
+            self.sigQueueReportReceived.emit(queuereport)
+        telemetry = self.tinyg.telemetry
+        if telemetry is not None:
+            if statusreport is not None and 'stat' in statusreport['sr']:
+                telemetry.record(Telemetry.STATUS, statusreport['sr']['stat'], statusreport['sr'].get('vel', np.nan))
+            if queuereport is not None:
+                telemetry.record(Telemetry.PLANNER, self.tinyg.plannerslots-queuereport['qr'],
+                                 self.tinyg.plannerslots)
 
 
 
-class TinyG(MachineBase):
+class TinyG(TinyGPlanner, MachineBase):
     """
     Implementation of MachineBase to control a TinyG board.
+    The g-code program is planned by :class:`Machines.TinyGPlanner.TinyGPlanner`.
 
     The TinyG board directly understands the g-code language but can only hold up to 8 lines of code.
     Therefore the g-code program has to be spooled to the board.
@@ -319,6 +506,9 @@ class TinyG(MachineBase):
     - as long as freelines > 0, send lines and decrement freelines
     - do this until the whole programm has been spooled
 
+    In character counting mode (see com parameters) the number of characters sent without response is
+    limited instead of the number of lines.
+
     Sending of commands and recieving responses is done asynchronously.
 
     ===================  ===================================================================================
@@ -328,10 +518,18 @@ class TinyG(MachineBase):
                          This signal's purpose is to pass commands to the active TinyGSender
                          object which runs in a separate thread.
                          Carries a dictionary containing the command with parameters.
-    sigQuery             Emitted when a query command is to be sent by the active TinyGSender object.
+    sigQuery             Emitted when query commands are to be sent by the active TinyGSender object.
                          This signal's purpose is to pass query commands to the active TinyGSender
                          object which runs in a separate thread.
-                         Carries a dictionary containing the command with parameters.
+                         Carries a query id and a list of dictionaries containing the commands with
+                         parameters.
+    sigCancelQuery       Emitted when the not yet sent commands of a query are to be discarded by the active
+                         TinyGSender object.
+                         Carries the query id.
+    sigProgram           Emitted when a g-code program is to be spooled by the active TinyGSender object.
+                         This signal's purpose is to pass programs to the active TinyGSender
+                         object which runs in a separate thread.
+                         Carries an iterator yielding the serialized g-code commands.
     sigFeedhold          Emitted when a feedhold is to be performed by the active TinyGSender object.
                          This signal's purpose is to pass commands to the active TinyGSender
                          object which runs in a separate thread.
@@ -354,7 +552,9 @@ class TinyG(MachineBase):
     """
     
     sigCommand = QtCore.pyqtSignal(dict)
-    sigQuery = QtCore.pyqtSignal(dict)
+    sigQuery = QtCore.pyqtSignal(int, list)
+    sigCancelQuery = QtCore.pyqtSignal(int)
+    sigProgram = QtCore.pyqtSignal(object)
     sigFeedhold = QtCore.pyqtSignal()
     sigResume = QtCore.pyqtSignal()
     sigStop = QtCore.pyqtSignal()
@@ -363,6 +563,9 @@ class TinyG(MachineBase):
     sigInitialize = QtCore.pyqtSignal()
     sigFinalize = QtCore.pyqtSignal()
     
+    # sender implementing the streaming protocol of the board
+    senderClass = TinyGSender
+    
 
     def __init__(self):
         """
@@ -373,41 +576,58 @@ class TinyG(MachineBase):
         self.receiverThread = None
         self.sender = None
         self.senderThread = None
-        self.port = None
-        self.io = None
+        self.transport = None
+        self.rxbuffer = b""
         self.comtimeout = 1
         self.querytimeout = 10
+        self.queryid = 0
+        self.pendingQueries = {}
         self.cycleRunning = False
-        self.plannerBuffer = []
         self.workpieceOffset = None
         self.lastStatus = {}
+        self.settings = None
         self.homed = False;
+        self.telemetry = None
+        # number of planner queue slots of the board
+        self.plannerslots = 32
+        # checkpoints (program line, object index, object count, description) of the running program
+        self.cycleCheckpoints = []
+        self.cycleLines = 0
+        self.checkpoint = None
+        self.sigCycleCompleted.connect(self._cycleCompleted)
+        self.status.subscribe(('programacked', 'qr'), self.status_programProgress)
         
         
-    def initialize(self, comparams):
+    def initialize(self, comparams, transport=None):
         """
         Initialize TinyG communication and settings.
         Default communication parameters: 115200 baud, 8 data bits, no parity, 1 stop bit, XonXoff flow control
 
         :param pyqtgraph.GroupParameter comparams: GroupParameter containing the communication parameters
+        :param Base.Transports.Transport transport: Connection to use instead of the one configured in the
+                                                    communication parameters (e.g. an in-memory pipe)
         """
         try:
             self.homed = False
             
+            if transport is None:
+                transport = Transports.createTransport(comparams)
             self.querytimeout = comparams.child('timeout').value()
-            logger.info("Connecting to TinyG at port %s (%s baud, %ss com timeout, %ss query timeout)...", 
-                        comparams.child('com').value(), comparams.child('baud').value(), 
-                        self.comtimeout, self.querytimeout)
-                    
-            self.port = serial.Serial(
-                port=comparams.child('com').value(),
-                baudrate=comparams.child('baud').value(),
-                timeout=self.comtimeout,
-                xonxoff=comparams.child('flowctrl').value()==1,
-                rtscts=comparams.child('flowctrl').value()==2
-            )
-            self.port.reset_input_buffer()
-            self.port.reset_output_buffer()
+            logger.info("Connecting to %s at %s (%ss com timeout, %ss query timeout, %s)...", 
+                        self.getName(), transport, self.comtimeout, self.querytimeout,
+                        "character counting" if comparams.child('streaming').value()==1 else "line mode")
+            
+            transport.open()
+            self.transport = transport
+            self.transport.resetInputBuffer()
+            self.transport.resetOutputBuffer()
+            self.rxbuffer = b""
+            
+            self.telemetry = None
+            if comparams.child('telemetry').value():
+                filepath = comparams.child('telemetryfile').value()
+                self.telemetry = Telemetry.TelemetryRecorder(filepath if filepath != "" else None)
+                logger.info("Recording telemetry%s.", " to "+filepath if filepath != "" else "")
             
             # start sender and receiver threads
             self.receiver = TinyGReceiver(self)
@@ -416,40 +636,27 @@ class TinyG(MachineBase):
             self.receiverThread.start()
             self.receiver.sigStatusReportReceived.connect(self.receiver_sigStatusReportReceived)
             
-            self.sender = TinyGSender(self, self.receiver)
+            self.sender = self.senderClass(
+                self, self.receiver,
+                maxlines=comparams.child('maxlines').value(),
+                charmode=comparams.child('streaming').value()==1,
+                maxchars=comparams.child('maxchars').value()
+            )
             self.senderThread = QtCore.QThread()
             self.sender.moveToThread(self.senderThread)
             self.senderThread.start()
+            self.sender.sigQueryReceived.connect(self.sender_sigQueryReceived)
+            
+            # buffer states and queue reports are displayed via the status store
+            self.status.clear()
+            self.sender.sigBufferChanged.connect(self.status.update)
+            self.receiver.sigQueueReportReceived.connect(self.status.update)
             
             self.sigInitialize.emit()
             
-            # reset TinyG
-            self.reset()
-            # set strict JSON syntax mode
-            self.executeCommand({'js':1})
-            # set JSON verbosity to verbose
-            self.executeCommand({'jv':5})
-            # enable all status messages
-            self.executeQuery({'sr':{
-                'posx':True, 'posy':True, 'posz':True, 'posa':True, 'feed':True, 'vel':True,
-                'unit':True, 'coor':True, 'dist':True, 'frmo':True, 'stat':True, 'momo':True
-            }})
-            # enable queue reports
-            self.executeCommand({'qv':1})
-            # enable filtered automatic status reports
-            self.executeCommand({'sv':1})
-            # set status report interval
-            self.executeCommand({'si':200})
-            # initialize last status report
-            report = self.executeQuery({'sr':None})
-            self.lastStatus = report['r']['sr']
-            # set G54 system to absolute (machine) coordinates
-            self.executeCommand({'gc':'g10l2p1x0y0z0'})
-            # set G55 system to default board origin
-            self.executeCommand({'gc':'g10l2p2x{}y{}z{}'.format(*self.getDefaultOrigin())})
-            self.workpieceOffset = np.array(self.getDefaultOrigin())
+            self.setupBoard()
             self.startCoordinateTimer()
-            logger.info("Connected to TinyG.")
+            logger.info("Connected to %s.", self.getName())
         except Exception as e:
             try:
                 self.finalize()
@@ -458,6 +665,39 @@ class TinyG(MachineBase):
             raise e
         
         
+    def setupBoard(self):
+        """
+        Resets the board and sets up the communication protocol (status and queue reports) and the
+        coordinate systems. Called by :meth:`initialize` after the sender and receiver threads are started.
+        """
+        # reset TinyG
+        self.reset()
+        # set strict JSON syntax mode
+        self.executeCommand({'js':1})
+        # set JSON verbosity to verbose
+        self.executeCommand({'jv':5})
+        # enable all status messages
+        self.executeQuery({'sr':{
+            'posx':True, 'posy':True, 'posz':True, 'posa':True, 'feed':True, 'vel':True,
+            'unit':True, 'coor':True, 'dist':True, 'frmo':True, 'stat':True, 'momo':True
+        }})
+        # enable queue reports
+        self.executeCommand({'qv':1})
+        # enable filtered automatic status reports
+        self.executeCommand({'sv':1})
+        # set status report interval
+        self.executeCommand({'si':200})
+        # initialize last status report
+        report = self.executeQuery({'sr':None})
+        self.lastStatus = report['r']['sr']
+        self.status.update(self.lastStatus)
+        # set G54 system to absolute (machine) coordinates
+        self.executeCommand({'gc':'g10l2p1x0y0z0'})
+        # set G55 system to default board origin
+        self.executeCommand({'gc':'g10l2p2x{}y{}z{}'.format(*self.getDefaultOrigin())})
+        self.workpieceOffset = np.array(self.getDefaultOrigin())
+    
+    
     def finalize(self):
         """
         Deinitalizes the hardware and finalizes the communication interface.
@@ -472,10 +712,13 @@ class TinyG(MachineBase):
             self.senderThread.wait(2000)
             self.receiverThread.quit()
             self.receiverThread.wait(2000)
-            self.port.close()
-            logger.info("TinyG connection closed.")
+            self.transport.close()
+            logger.info("%s connection closed.", self.getName())
         finally:
-            self.port = None
+            self.transport = None
+            if self.telemetry is not None:
+                self.telemetry.close()
+                self.telemetry = None
             
             
     def reset(self):
@@ -506,7 +749,7 @@ class TinyG(MachineBase):
         """
         See :meth:´Base.MachineBase.MachineBase.isInitialized´
         """
-        return (self.port is not None)
+        return (self.transport is not None)
         
         
     def getPosition(self, absolute=True):
@@ -624,7 +867,7 @@ class TinyG(MachineBase):
         """
         See :meth:´Base.MachineBase.MachineBase.homingCycle´
         """
-        logger.info("TinyG homing cycle started.")
+        logger.info("%s homing cycle started.", self.getName())
         self.executeCommand({"gc":"g28.2x0y0z0"})
         self.homed = True;
         
@@ -636,74 +879,23 @@ class TinyG(MachineBase):
         return self.homed;
     
     
-    def preparePlanner(self):
-        """
-        See :meth:´Base.MachineBase.MachineBase.preparePlanner´
+    def isIdle(self):
         """
-        self.plannerBuffer = [
-            "g21",      # use mm
-            "g90",      # absolute position mode
-            "g55",      # use workpiece coordinate system
-            "g17",      # select XY plane for arcs
-            "m3",       # enable spindle
-            "g1f{}z{}".format(self.jogspeedZ, 0)   # go to working distance
-        ]
-        
-    def finalizePlanner(self):
+        See :meth:´Base.MachineBase.MachineBase.isIdle´
         """
-        See :meth:´Base.MachineBase.MachineBase.finalizePlanner´
-        """
-        self.plannerBuffer.extend([
-            "m2"        # program end
-        ])
+        # machine states ready (1), stop (3) and end (4)
+        return self.lastStatus.get('stat') in (1, 3, 4)
     
-    def planJog(self, position):
-        """
-        See :meth:´Base.MachineBase.MachineBase.planJog´
-        """
-        self.plannerBuffer.append("g1f{}x{}y{}".format(self.jogspeedXY, *position))
-        
-    def planMill(self, position):
-        """
-        See :meth:´Base.MachineBase.MachineBase.planMill´
-        """
-        self.plannerBuffer.append("g1f{}x{}y{}".format(self.millspeedXY, *position))
     
-    def planMillArc(self, startposition, endposition, center, ccw=True):
+    def isProgramEnd(self):
         """
-        See :meth:´Base.MachineBase.MachineBase.planMillArc´
+        :returns: True if the board reached the end of the program (m2) and is not moving anymore
+        :rtype: bool
         """
-        offset = (center[0]-startposition[0], center[1]-startposition[1])
-        command = None
-        if ccw:
-            command = "g3"
-        else:
-            command = "g2"
-        if not np.all(startposition == endposition):
-            command = command + "x{}y{}".format(*endposition)
-        self.plannerBuffer.append(command + "i{}j{}f{}".format(*offset, self.millspeedXY))
+        # machine state end (4)
+        return self.lastStatus.get('stat') == 4
     
-    def planInfeed(self):
-        """
-        See :meth:´Base.MachineBase.MachineBase.planInfeed´
-        """
-        self.plannerBuffer.extend([
-            "g91", 
-            "g1f{}z{}".format(self.infeedspeed, -self.infeeddepth),
-            "g90"
-        ])
     
-    def planOutfeed(self):
-        """
-        See :meth:´Base.MachineBase.MachineBase.planOutfeed´
-        """
-        self.plannerBuffer.extend([
-            "g91",
-            "g1f{}z{}".format(self.outfeedspeed, self.infeeddepth),
-            "g90"
-        ])
-        
-        
     def setWorkpieceOrigin(self, offset=(0, 0)):
         """
         See :meth:´Base.MachineBase.MachineBase.setWorkpieceOrigin´
@@ -730,14 +922,65 @@ class TinyG(MachineBase):
         if len(self.plannerBuffer) == 0:
             pass
         # open cycle control dialog
-        logger.info("Executing TinyG cycle with %s commands.", len(self.plannerBuffer))
-        self.cycledlg = TinyGCycleControl(self, self.plannerBuffer)
-        for cmd in self.plannerBuffer:
-            self.executeCommand({'gc':cmd})
+        logger.info("Executing %s cycle with %s commands.", self.getName(), len(self.plannerBuffer))
+        estimate = None
+        # programs loaded from files are streamed and therefore not estimated
+        if isinstance(self.plannerBuffer, list):
+            estimate = self.estimateCycleTime()
+            logger.info("Estimated cycle time %s (%s).", me.formatDuration(estimate['total']),
+                        ", ".join("{} {}".format(phase, me.formatDuration(time))
+                                  for phase, time in estimate['phases'].items()))
+        self.cycledlg = cyclecontrol.TinyGCycleControl(self, self.plannerBuffer, estimate)
+        # checkpoints refer to the lines of the planned program
+        self.cycleCheckpoints = self.plannerCheckpoints if isinstance(self.plannerBuffer, list) else []
+        self.cycleLines = len(self.plannerBuffer)
+        self.plannerCheckpoints = []
+        self.checkpoint = None
+        if self.telemetry is not None:
+            self.telemetry.startCycle()
+        self.sigProgram.emit(iter(self.serializeProgram(self.plannerBuffer)))
         self.cycledlg.show()
-        self.plannerBuffer.clear()
-        
-        
+        self.plannerBuffer = []
+    
+    
+    def loadProgram(self, filepath):
+        """
+        See :meth:´Base.MachineBase.MachineBase.loadProgram´
+        """
+        self.plannerBuffer = GCode.ProgramFile(filepath)
+        logger.info("Loaded %s program %s with %s commands.", self.getName(), filepath, len(self.plannerBuffer))
+
+
+    def estimateCycleTime(self, program=None):
+        """
+        Estimates the duration of a g-code program from the TinyG axis settings (feed rate and jerk limits,
+        junction deviation and acceleration) and the basic feeds.
+        If no parameters have been applied yet, the default parameters are used.
+
+        See :meth:´Base.MachineBase.MachineBase.estimateCycleTime´
+
+        :param program: g-code lines, defaults to the planner buffer
+        :type program: list(str)
+        """
+        if program is None:
+            program = self.plannerBuffer
+        settings = self.settings
+        if settings is None:
+            settings = self.getParameters().child('axis').getValues()
+        start = (0, 0, 0)
+        if self.isInitialized():
+            start = self.getPosition(False)
+        return me.estimateCycleTime(
+            program,
+            [settings[axis+'fr'][0] for axis in 'xyz'],
+            [settings[axis+'jm'][0]*1e6 for axis in 'xyz'],
+            deviation=min(settings[axis+'jd'][0] for axis in 'xyz'),
+            acceleration=settings['ja'][0],
+            jogspeed=self.jogspeedXY,
+            start=start
+        )
+
+
     def executeCommand(self, command):
         """
         Executes a single command asynchonously.
@@ -755,24 +998,113 @@ class TinyG(MachineBase):
         :returns: Response
         :rtype: dict
         """
+        return self.executeQueries([command])[0]
+    
+    
+    def executeQueries(self, commands, timeout=None):
+        """
+        Executes several commands pipelined and returns the responses (as dicts) synchronously.
+        All commands are passed to the sender at once, so as many commands as fit into the linebuffer
+        are in flight at the same time.
+
+        :param list(dict) commands: Commands to send
+        :param float timeout: Timeout in s, defaults to the query timeout (no timeout if <= 0)
+        :returns: Responses in the order of the commands
+        :rtype: list(dict)
+        """
+        if len(commands) == 0:
+            return []
+        if timeout is None:
+            timeout = self.querytimeout
+        responses = None
         # use timer for timeout
         timer = QtCore.QTimer()
         timer.setSingleShot(True)
-        # use local event loop to wait for "query received" signal
+        # use local event loop to wait until all responses are received
         localloop = QtCore.QEventLoop()
-        self.sender.sigQueryReceived.connect(localloop.quit)
+        def queryFinished(result):
+            nonlocal responses
+            responses = result
+            localloop.quit()
         timer.timeout.connect(localloop.quit)
-        if self.querytimeout > 0:
-            timer.start(self.querytimeout*1100)
-        # send command and start loop
-        self.sigQuery.emit(command)
-        localloop.exec()
+        if timeout > 0:
+            timer.start(int(timeout*1100))
+        # send commands and start loop
+        queryid = self.submitQueries(commands, queryFinished)
+        if responses is None:
+            localloop.exec()
         # check for timeout
-        if self.querytimeout > 0 and not timer.isActive():
+        if responses is None:
+            received = len(self.pendingQueries[queryid][1])
+            self.cancelQueries(queryid)
             logger.error("Query timeout error.")
-            raise errs.CommunicationError(command, "Timeout")
-        # retrieve and return query data
-        return self.sender.getLastQueryResult()
+            raise errs.CommunicationError(commands[received], "Timeout")
+        return responses
+    
+    
+    def submitQueries(self, commands, callback):
+        """
+        See :meth:´Base.MachineBase.MachineBase.submitQueries´
+        """
+        self.queryid += 1
+        self.pendingQueries[self.queryid] = (len(commands), [], callback)
+        self.sigQuery.emit(self.queryid, commands)
+        return self.queryid
+    
+    
+    def cancelQueries(self, queryid):
+        """
+        See :meth:´Base.MachineBase.MachineBase.cancelQueries´
+        """
+        if self.pendingQueries.pop(queryid, None) is not None:
+            self.sigCancelQuery.emit(queryid)
+    
+    
+    @QtCore.pyqtSlot(int, dict)
+    def sender_sigQueryReceived(self, queryid, msg):
+        """
+        Slot triggered when a query response is received.
+
+        :param int queryid: id of the query
+        :param dict msg: response
+        """
+        if not queryid in self.pendingQueries:
+            # canceled query
+            return
+        count, responses, callback = self.pendingQueries[queryid]
+        responses.append(msg)
+        if len(responses) == count:
+            del self.pendingQueries[queryid]
+            callback(responses)
+    
+    
+    @staticmethod
+    def serialize(command):
+        """
+        Serializes a command dictionary {command:value} to a line which can be sent to the TinyG.
+
+        :param dict command: command to serialize
+        :returns: serialized command
+        :rtype: bytes
+        """
+        return (json.dumps(command, separators=(',', ':')) + "\n").encode('utf-8')
+    
+    
+    @classmethod
+    def serializeProgram(cls, program):
+        """
+        Serializes g-code lines as {"gc":line} commands.
+        Planned programs (lists) are serialized at once, so spooling does not need to encode them.
+        Other programs (e.g. :class:`Base.GCode.ProgramFile`) are serialized lazily while streaming.
+
+        :param program: g-code lines
+        :type program: iterable(str)
+        :returns: serialized commands
+        :rtype: iterable(bytes)
+        """
+        if isinstance(program, list):
+            return [cls.serialize({'gc':line}) for line in program]
+        return (cls.serialize({'gc':line}) for line in program)
     
     
     def send(self, command):
@@ -782,7 +1114,18 @@ class TinyG(MachineBase):
 
         :param dict command: command to send
         """
-        self.sendRaw(json.dumps(command))
+        self.write(self.serialize(command))
+    
+    
+    def write(self, data):
+        """
+        Low level function to write serialized commands to the TinyG.
+        Only the currently active TinyGSender object should call this function.
+
+        :param bytes data: serialized commands (see :meth:`serialize`)
+        """
+        logger.debug("Send: %s", data)
+        self.transport.write(data)
     
     
     def sendRaw(self, message):
@@ -795,28 +1138,44 @@ class TinyG(MachineBase):
         logger.debug("Send: %s", message)
         if message[-1] != "\n":
             message += "\n"
-        #self.io.write(message)
-        self.port.write(message.encode('utf-8'))
+        self.transport.write(message.encode('utf-8'))
     
     
     def receive(self):
         """
         Low level function which receives messages from the TinyG.
-        Returns a dictionary with the received message or None on timeout.
+        Blocks until data is available (or the com timeout elapsed), then reads all waiting data at once.
+        Complete lines are parsed and returned, incomplete lines are kept until the next call.
         Only the currently active TinyGReceiver object should call this function.
 
-        :returns: Recieved message (or None on timeout)
-        :rtype: dict
-        """
-        #line = self.io.readline()
-        if not self.isInitialized():
-            return None
-        line = self.port.readline().decode('utf-8').strip()
-        if line != "":
-            logger.debug("Received: %s", line)
-            return json.loads(line)
-        #logger.debug("Read operation timeout.")
-        return None 
+        :returns: Received messages (empty on timeout)
+        :rtype: list(dict)
+        """
+        transport = self.transport
+        if transport is None:
+            time.sleep(self.comtimeout)
+            return []
+        data = transport.read(self.comtimeout)
+        if len(data) == 0:
+            return []
+        lines = (self.rxbuffer + data).split(b"\n")
+        self.rxbuffer = lines.pop()
+        lines = [line.strip() for line in lines]
+        lines = [line for line in lines if len(line) > 0]
+        if len(lines) == 0:
+            return []
+        logger.debug("Received: %s", lines)
+        try:
+            # parse whole batch at once
+            return json.loads(b"[" + b",".join(lines) + b"]")
+        except ValueError:
+            messages = []
+            for line in lines:
+                try:
+                    messages.append(json.loads(line))
+                except ValueError:
+                    logger.warning("Invalid message received: %s", line)
+            return messages
     
     
     def applyParameters(self, params, hiddenparams=None):
@@ -829,9 +1188,8 @@ class TinyG(MachineBase):
         self.settings = params.child('motor').getValues()
         self.settings.update(params.child('axis').getValues())
         self.settings.update(params.child('homing').getValues())
-        for key, val in self.settings.items():
-            self.executeQuery({key:val[0]})
-        logger.info("TinyG parameters applied.")
+        self.executeQueries(self.groupParameters({key:val[0] for key, val in self.settings.items()}))
+        logger.info("%s parameters applied.", self.getName())
             
             
     def retrieveParameters(self):
@@ -839,14 +1197,57 @@ class TinyG(MachineBase):
         See :meth:`Base.MachineBase.MachineBase.retrieveParameters`
         """
         params = self.getParameters()
+        names = [param.name() for grp in params.children() for param in grp.children()]
+        values = {}
+        for result in self.executeQueries(self.groupParameters({name:None for name in names})):
+            for key, value in result['r'].items():
+                if isinstance(value, dict):
+                    # group response
+                    values.update({key+subkey:subvalue for subkey, subvalue in value.items()})
+                else:
+                    values[key] = value
         for grp in params.children():
             for param in grp.children():
-                cmd = param.name()
-                result = self.executeQuery({cmd:None})
-                param.setValue(result['r'][cmd])
+                param.setValue(values[param.name()])
         return params
     
     
+    @staticmethod
+    def groupParameters(values, maxlength=200):
+        """
+        Groups motor (e.g. "1ma") and axis (e.g. "xfr") parameters into multi-key group requests
+        (e.g. {"x":{"fr":800, "jm":20}}) which TinyG processes in a single line. Other parameters are
+        requested individually.
+        Requests with value None are read as whole group (e.g. {"x":None}).
+
+        :param dict values: Parameter names and values (None to read the parameter)
+        :param int maxlength: Maximal length of a serialized group write request in bytes
+        :returns: Requests
+        :rtype: list(dict)
+        """
+        requests = []
+        groups = {}
+        for key, value in values.items():
+            if len(key) == 3 and key[0] in "123456xyzabc":
+                groups.setdefault(key[0], {})[key[1:]] = value
+            else:
+                requests.append({key:value})
+        for group, members in groups.items():
+            if all(value is None for value in members.values()):
+                requests.append({group:None})
+                continue
+            # split writes which do not fit into a single line
+            request = {}
+            for subkey, value in members.items():
+                request[subkey] = value
+                if len(TinyG.serialize({group:request})) > maxlength and len(request) > 1:
+                    del request[subkey]
+                    requests.append({group:request})
+                    request = {subkey:value}
+            requests.append({group:request})
+        return requests
+    
+    
     def calculateMaxSteps(self, directions):
         """
         Calculates the maximal possible step per direction (in mm) without exceeding soft limits.
@@ -880,11 +1281,69 @@ class TinyG(MachineBase):
         :param dict msg: status report
         """
         self.lastStatus.update(msg['sr'])
-        statusmsg = "{} (current coordinate system: {})".format(
+        self.status.update(msg['sr'])
+        if 'posx' in msg['sr'] or 'posy' in msg['sr'] or 'posz' in msg['sr'] or 'coor' in msg['sr']:
+            self.status.update({'absolute':self.getPosition(True), 'workpiece':self.getPosition(False)})
+        self.sigStatusUpdate.emit(self.getStatusText())
+    
+    
+    def getStatusText(self):
+        """
+        :returns: readable machine state of the last status report
+        :rtype: str
+        """
+        return "{} (current coordinate system: {})".format(
             self.getStatusMessage('stat', self.lastStatus['stat']),
             self.getStatusMessage('coor', self.lastStatus['coor'])
         )
-        self.sigStatusUpdate.emit(statusmsg)
+    
+    
+    def status_programProgress(self, status):
+        """
+        Status store subscription tracking the machining object executed by the board.
+        Lines acknowledged by the board may still be waiting in the planner queue, so the executed line
+        is estimated conservatively from the acknowledged lines and the planner queue depth.
+
+        :param dict status: status snapshot
+        """
+        if len(self.cycleCheckpoints) == 0 or not 'programacked' in status:
+            return
+        executed = status['programacked'] - (self.plannerslots - status.get('qr', self.plannerslots))
+        current = None
+        for checkpoint in self.cycleCheckpoints:
+            if checkpoint[0] > executed:
+                break
+            current = checkpoint
+        if current is not None and (self.checkpoint is None or self.checkpoint['index'] != current[1]):
+            self.checkpoint = {'index':current[1], 'count':current[2], 'description':current[3], 'completed':False}
+            logger.debug("Checkpoint %s/%s: %s", current[1]+1, current[2], current[3])
+            self.sigCheckpoint.emit(dict(self.checkpoint))
+    
+    
+    @QtCore.pyqtSlot()
+    def _cycleCompleted(self):
+        """
+        Slot triggered when a cycle is finished. Ends the telemetry cycle (logs the cycle summary) and
+        emits the final checkpoint.
+        """
+        if self.telemetry is not None:
+            self.telemetry.endCycle()
+        if len(self.cycleCheckpoints) > 0:
+            completed = self.isProgramEnd() and \
+                self.status.value('programacked', 0) >= self.cycleLines
+            if completed:
+                checkpoint = self.cycleCheckpoints[-1]
+            elif self.checkpoint is None:
+                # interrupted before the first machining object was started
+                checkpoint = self.cycleCheckpoints[0]
+            if completed or self.checkpoint is None:
+                self.checkpoint = {'index':checkpoint[1], 'count':checkpoint[2], 'description':checkpoint[3]}
+            self.checkpoint['completed'] = completed
+            if not completed:
+                logger.warning("Cycle interrupted at %s/%s: %s", self.checkpoint['index']+1,
+                               self.checkpoint['count'], self.checkpoint['description'])
+            self.sigCheckpoint.emit(dict(self.checkpoint))
+            self.cycleCheckpoints = []
     
     
     @staticmethod
@@ -967,16 +1426,16 @@ class TinyG(MachineBase):
         """
         menu = QtWidgets.QMenu("TinyG")
         testpanelaction = menu.addAction("Com Testpanel")
-        testpanelaction.triggered.connect(self.mnuTinyGTestpanel_triggered)
+        testpanelaction.triggered.connect(self.mnuTestpanel_triggered)
         resetaction = menu.addAction("Reset")
-        resetaction.triggered.connect(self.mnuTinyGReset_triggered)
+        resetaction.triggered.connect(self.mnuReset_triggered)
         clearaction = menu.addAction("Clear")
-        clearaction.triggered.connect(self.mnuTinyGClear_triggered)
+        clearaction.triggered.connect(self.mnuClear_triggered)
         return menu
         
     
     @QtCore.pyqtSlot()
-    def mnuTinyGTestpanel_triggered(self):
+    def mnuTestpanel_triggered(self):
         """
         Slot triggered when the testpanel menu entry is clicked
         """
@@ -984,11 +1443,11 @@ class TinyG(MachineBase):
             QtWidgets.QMessageBox.critical(None, "Not initialized", 
                 "Machine communication is not initialized!")
             return
-        self.testpanel = TinyGTestpanel(self)
+        self.testpanel = testpanel.TinyGTestpanel(self)
         self.testpanel.show()
         
     @QtCore.pyqtSlot()
-    def mnuTinyGReset_triggered(self):
+    def mnuReset_triggered(self):
         """
         Slot triggered when the reset menu entry is clicked
         """
@@ -999,7 +1458,7 @@ class TinyG(MachineBase):
         self.reset()
     
     @QtCore.pyqtSlot()
-    def mnuTinyGClear_triggered(self):
+    def mnuClear_triggered(self):
         """
         Slot triggered when the clear menu entry is clicked
         """
@@ -1017,6 +1476,7 @@ class TinyG(MachineBase):
         """
         params = {
             'name':'TinyGComSettings', 'type':'group', 'children':[
+                *Transports.getTransportParameters(),
                 {
                     'name':'com',
                     'title':'Com Port', 
@@ -1044,6 +1504,42 @@ class TinyG(MachineBase):
                     'min':0,
                     'default':1,
                     'value':1
+                },
+                {
+                    'name':'streaming',
+                    'title':'Streaming Mode',
+                    'type':'list',
+                    'values':{'Line Mode':0, 'Character Counting':1},
+                    'value':'Line Mode'
+                },
+                {
+                    'name':'maxlines',
+                    'title':'Line Mode Lines',
+                    'type':'int',
+                    'limits':(1, 8),
+                    'default':4,
+                    'value':4
+                },
+                {
+                    'name':'maxchars',
+                    'title':'Character Counting Buffer (bytes)',
+                    'type':'int',
+                    'limits':(32, 254),
+                    'default':200,
+                    'value':200
+                },
+                {
+                    'name':'telemetry',
+                    'title':'Record Telemetry',
+                    'type':'bool',
+                    'default':False,
+                    'value':False
+                },
+                {
+                    'name':'telemetryfile',
+                    'title':'Telemetry File (optional)',
+                    'type':'str',
+                    'value':''
                 }
             ]
         }
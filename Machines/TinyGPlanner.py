@@ -0,0 +1,136 @@
+"""
+Created on 19.10.2026
+"""
+
+import logging
+logger = logging.getLogger(__name__)
+
+import time
+import numpy as np
+
+from Base import GCode
+
+
+class TinyGPlanner(object):
+    """
+    G-code planner of the TinyG board (also used by the Grbl board which understands the same g-code subset).
+
+    The planner only depends on the basic feeds and the tool diameter and does not need Qt or a board
+    connection. It is the planner part of :class:`Machines.TinyG.TinyG` and can be used on its own to
+    plan and export programs without a GUI (see :mod:`Base.Batch`).
+
+    The planned program is kept in :attr:`plannerBuffer` (list of g-code lines), the checkpoints in
+    :attr:`plannerCheckpoints` (program line, object index, object count, description).
+    """
+
+    # firmware name written to exported programs
+    firmware = "TinyG"
+
+    def __init__(self):
+        """
+        Constructor
+        """
+        super().__init__()
+        self.jogspeedXY = 0
+        self.jogspeedZ = 0
+        self.millspeedXY = 0
+        self.infeedspeed = 0
+        self.outfeedspeed = 0
+        self.infeeddepth = 0
+        self.tooldiameter = 0
+        self.plannerBuffer = []
+        self.plannerCheckpoints = []
+
+
+    def getToolDiameter(self):
+        """
+        :returns: tooldiameter in mm
+        :rtype: float
+        """
+        return self.tooldiameter
+
+
+    def preparePlanner(self):
+        """
+        See :meth:´Base.MachineBase.MachineBase.preparePlanner´
+        """
+        self.plannerCheckpoints = []
+        self.plannerBuffer = [
+            "g21",      # use mm
+            "g90",      # absolute position mode
+            "g55",      # use workpiece coordinate system
+            "g17",      # select XY plane for arcs
+            "m3",       # enable spindle
+            "g1f{}z{}".format(self.jogspeedZ, 0)   # go to working distance
+        ]
+
+    def finalizePlanner(self):
+        """
+        See :meth:´Base.MachineBase.MachineBase.finalizePlanner´
+        """
+        self.plannerBuffer.extend([
+            "m2"        # program end
+        ])
+
+    def planCheckpoint(self, index, count, description):
+        """
+        See :meth:´Base.MachineBase.MachineBase.planCheckpoint´
+        """
+        self.plannerCheckpoints.append((len(self.plannerBuffer), index, count, description))
+
+    def planJog(self, position):
+        """
+        See :meth:´Base.MachineBase.MachineBase.planJog´
+        """
+        self.plannerBuffer.append("g1f{}x{}y{}".format(self.jogspeedXY, *position))
+
+    def planMill(self, position):
+        """
+        See :meth:´Base.MachineBase.MachineBase.planMill´
+        """
+        self.plannerBuffer.append("g1f{}x{}y{}".format(self.millspeedXY, *position))
+
+    def planMillArc(self, startposition, endposition, center, ccw=True):
+        """
+        See :meth:´Base.MachineBase.MachineBase.planMillArc´
+        """
+        offset = (center[0]-startposition[0], center[1]-startposition[1])
+        command = None
+        if ccw:
+            command = "g3"
+        else:
+            command = "g2"
+        if not np.all(startposition == endposition):
+            command = command + "x{}y{}".format(*endposition)
+        self.plannerBuffer.append(command + "i{}j{}f{}".format(*offset, self.millspeedXY))
+
+    def planInfeed(self):
+        """
+        See :meth:´Base.MachineBase.MachineBase.planInfeed´
+        """
+        self.plannerBuffer.extend([
+            "g91",
+            "g1f{}z{}".format(self.infeedspeed, -self.infeeddepth),
+            "g90"
+        ])
+
+    def planOutfeed(self):
+        """
+        See :meth:´Base.MachineBase.MachineBase.planOutfeed´
+        """
+        self.plannerBuffer.extend([
+            "g91",
+            "g1f{}z{}".format(self.outfeedspeed, self.infeeddepth),
+            "g90"
+        ])
+
+
+    def exportProgram(self, filepath):
+        """
+        See :meth:´Base.MachineBase.MachineBase.exportProgram´
+        """
+        count = GCode.writeProgram(filepath, self.plannerBuffer, comments=(
+            "ESCMillPCB {} program".format(self.firmware),
+            "Created {}".format(time.strftime("%Y-%m-%d %H:%M:%S")),
+        ))
+        logger.info("Exported %s program with %s commands to %s.", self.firmware, count, filepath)
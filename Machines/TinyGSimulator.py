@@ -0,0 +1,591 @@
+"""
+Created on 19.10.2026
+"""
+
+import logging
+logger = logging.getLogger(__name__)
+
+import collections
+import json
+import re
+import threading
+import time
+
+import numpy as np
+import pyqtgraph.parametertree.parameterTypes as ptypes
+
+from Algorithms import MotionEstimator as me
+from Base import Transports
+from Machines.TinyG import TinyG
+
+
+# g-code word (letter followed by a number)
+_WORD = re.compile(r'([a-z])([-+]?(?:\d+\.?\d*|\.\d+))')
+
+
+class TinyGBoard(object):
+    """
+    Simulated TinyG board firmware speaking the JSON protocol on a :class:`Base.Transports.PipeTransport`.
+
+    The simulation models
+    - the serial linebuffer (received but not yet parsed lines),
+    - the planner queue (32 slots, reported by queue reports if enabled with {"qv":1}),
+    - jerk limited motion in scaled real time using the axis parameters (feed rate and jerk limits,
+      junction deviation and acceleration); a block's exit velocity is planned from the next queued block,
+      so a starved planner slows the machine down like the real board,
+    - filtered automatic status reports (enabled with {"sv":1}, interval {"si":ms}),
+    - feedhold ("!"), resume ("~"), queue flush ("%") and reset (Ctrl-x).
+
+    Lines are parsed (and acknowledged with a response) when they reach the planner, so the acknowledgements
+    are delayed as long as the planner queue is full.
+    Overflows of the linebuffer or serial receive buffer are counted but no data is discarded.
+    """
+
+    def __init__(self, transport, timescale=1.0, linebuffer=8, rxbuffer=254, plannerslots=32, parameters=None):
+        """
+        Constructor
+
+        :param Base.Transports.PipeTransport transport: Board end of the connection
+        :param float timescale: Simulation speed (e.g. 10 runs motions ten times faster than real time)
+        :param int linebuffer: Number of lines the linebuffer can hold
+        :param int rxbuffer: Size of the serial receive buffer in bytes
+        :param int plannerslots: Number of planner queue slots
+        :param dict parameters: Initial board parameters {name: value}
+        """
+        self.transport = transport
+        self.timescale = timescale
+        self.linebuffer = linebuffer
+        self.rxbuffer = rxbuffer
+        self.plannerslots = plannerslots
+        self.parameters = {'si':200, 'qv':0, 'sv':0, 'js':1, 'jv':5}
+        if parameters is not None:
+            self.parameters.update(parameters)
+        self.thread = None
+        self.running = False
+        # statistics
+        self.linesParsed = 0
+        self.overflows = 0
+        # real time (in s) the planner ran empty between motions
+        self.starvedTime = 0.0
+        self._reset()
+
+
+    def _reset(self):
+        """
+        Resets the firmware state (machine position and coordinate offsets are kept).
+        """
+        self.rx = b""
+        self.planner = collections.deque()
+        self.block = None
+        self.hold = None
+        self.machinePosition = getattr(self, 'machinePosition', np.zeros(3))
+        self.plannedPosition = self.machinePosition.copy()
+        self.offsets = getattr(self, 'offsets', {1:np.zeros(3), 2:np.zeros(3)})
+        self.coor = 1
+        self.absolute = True
+        self.motionmode = 0
+        self.feed = 0.0
+        self.exitVelocity = 0.0
+        self.stat = 1
+        self.programEnd = False
+        self.starvedSince = None
+        self.srFields = ['posx', 'posy', 'posz', 'vel', 'stat', 'coor']
+        self.lastReport = {}
+        self.nextReport = 0.0
+        self.lastQueueReport = None
+        self.clock = time.perf_counter()
+        self.simtime = 0.0
+
+
+    def start(self):
+        """
+        Starts the board in a separate thread.
+        """
+        self.transport.open()
+        self.running = True
+        self.thread = threading.Thread(target=self._run, name="TinyGBoard", daemon=True)
+        self.thread.start()
+
+
+    def stop(self):
+        """
+        Stops the board thread.
+        """
+        self.running = False
+        self.transport.close()
+        if self.thread is not None:
+            self.thread.join(2)
+            self.thread = None
+        logger.info("Simulated TinyG stopped (%s lines parsed, %s buffer overflows, %.1f s planner starved).",
+                    self.linesParsed, self.overflows, self.starvedTime)
+
+
+    def _run(self):
+        """
+        Board main loop. Waits for data or the next motion/report event.
+        """
+        while self.running:
+            try:
+                data = self.transport.read(self._waitTime())
+            except Exception:
+                break
+            self._advance()
+            if len(data) > 0:
+                self._receive(data)
+            self._parse()
+            self._checkOverflow()
+            self._advance()
+            self._report()
+
+
+    def _now(self):
+        """
+        :returns: scaled simulation time in s
+        :rtype: float
+        """
+        now = time.perf_counter()
+        self.simtime += (now - self.clock)*self.timescale
+        self.clock = now
+        return self.simtime
+
+
+    def _waitTime(self):
+        """
+        :returns: real time (in s) until the next event
+        :rtype: float
+        """
+        wait = 0.05
+        if self.block is not None and self.hold is None:
+            wait = min(wait, max(self.block['end'] - self._now(), 0)/self.timescale)
+        if self.stat in (5, 9) and self.parameters['sv'] > 0:
+            wait = min(wait, max(self.nextReport - time.perf_counter(), 0))
+        return wait
+
+
+    def _send(self, message):
+        """
+        :param dict message: message to send to the host
+        """
+        self.transport.write((json.dumps(message, separators=(',', ':')) + "\n").encode('utf-8'))
+
+
+    def _receive(self, data):
+        """
+        Handles received data: single character commands are executed immediately, other data is
+        appended to the receive buffer.
+
+        :param bytes data: received data
+        """
+        for char in (b"!", b"~", b"%", b"\x18"):
+            if char in data:
+                data = data.replace(char, b"")
+                self._control(char)
+        self.rx += data
+
+
+    def _checkOverflow(self):
+        """
+        Counts an overflow if more data is waiting for the planner than the receive buffers can hold.
+        """
+        lines = self.rx.count(b"\n")
+        if len(self.rx) > self.rxbuffer or lines > self.linebuffer:
+            self.overflows += 1
+            logger.warning("Simulated TinyG receive buffer overflow (%s bytes, %s lines).", len(self.rx), lines)
+
+
+    def _control(self, char):
+        """
+        Executes a single character command.
+
+        :param bytes char: command character
+        """
+        now = self._now()
+        if char == b"!" and self.hold is None:
+            self.hold = now
+            if self.block is not None:
+                self.machinePosition = self._position(now)
+            self.stat = 6
+        elif char == b"~" and self.hold is not None:
+            if self.block is not None:
+                # continue the current block after the hold
+                delay = now - self.hold
+                self.block['start'] += delay
+                self.block['end'] += delay
+            self.hold = None
+            self.stat = 5 if self.block is not None else 3
+        elif char == b"%":
+            # queue flush
+            if self.block is not None:
+                self.machinePosition = self._position(now)
+            self.planner.clear()
+            self.block = None
+            self.hold = None
+            self.plannedPosition = self.machinePosition.copy()
+            self.starvedSince = None
+            self.stat = 3
+        elif char == b"\x18":
+            if self.block is not None:
+                self.machinePosition = self._position(now)
+            self._reset()
+            self._send({'r':{'fv':0.97, 'fb':440.2, 'hp':1, 'hv':8, 'id':'simulator', 'msg':'SYSTEM READY'},
+                        'f':[1, 0, 0]})
+
+
+    def _parse(self):
+        """
+        Parses lines from the linebuffer as long as the planner queue has free slots.
+        """
+        while b"\n" in self.rx:
+            if len(self.planner) + (self.block is not None) >= self.plannerslots:
+                break
+            line, self.rx = self.rx.split(b"\n", 1)
+            line = line.strip()
+            if len(line) == 0:
+                continue
+            self.linesParsed += 1
+            try:
+                command = json.loads(line)
+            except ValueError:
+                self._send({'r':{}, 'f':[1, 108, len(line)+1]})
+                continue
+            response = {}
+            for key, value in command.items():
+                response[key] = self._execute(key, value)
+            self._send({'r':response, 'f':[1, 0, len(line)+1]})
+
+
+    def _execute(self, key, value):
+        """
+        Executes a JSON command.
+
+        :param str key: command key
+        :param value: command value
+        :returns: response value
+        """
+        if key == 'gc':
+            self._gcode(value.lower())
+            return value
+        if key == 'sr':
+            if isinstance(value, dict):
+                self.srFields = [field for field, enabled in value.items() if enabled]
+            return self._status(full=True)
+        if key == 'qr':
+            return self._freeSlots()
+        if key == 'clear':
+            if self.stat in (2, 10):
+                self.stat = 3
+            return value
+        if isinstance(value, dict):
+            # group write
+            for subkey, subvalue in value.items():
+                if subvalue is not None:
+                    self.parameters[key+subkey] = subvalue
+            return {subkey:self.parameters.get(key+subkey, 0) for subkey in value.keys()}
+        if value is None:
+            if key in self.parameters:
+                return self.parameters[key]
+            # group read
+            group = {name[len(key):]:val for name, val in self.parameters.items()
+                     if name.startswith(key) and len(name) == len(key)+2}
+            return group if len(group) > 0 else 0
+        self.parameters[key] = value
+        return value
+
+
+    def _gcode(self, line):
+        """
+        Interprets a g-code line and queues resulting motion blocks.
+
+        :param str line: g-code line (lower case, without whitespace)
+        """
+        words = [(letter, float(number)) for letter, number in _WORD.findall(line.replace(" ", ""))]
+        values = {letter:number for letter, number in words if letter != 'g' and letter != 'm'}
+        motion = None
+        for letter, number in words:
+            if letter == 'g':
+                if number in (0, 1, 2, 3):
+                    self.motionmode = int(number)
+                    motion = self.motionmode
+                elif number == 4:
+                    self.planner.append({'type':'dwell', 'duration':values.get('p', 0)})
+                    return
+                elif number == 10 and values.get('l') == 2:
+                    offset = self.offsets.setdefault(int(values.get('p', 1)), np.zeros(3))
+                    for i, axis in enumerate('xyz'):
+                        if axis in values:
+                            offset[i] = values[axis]
+                    return
+                elif number == 28.2:
+                    target = self.plannedPosition.copy()
+                    for i, axis in enumerate('xyz'):
+                        if axis in values:
+                            target[i] = 0
+                    self.planner.append({'type':'home', 'target':target, 'duration':1.0})
+                    self.plannedPosition = target
+                    return
+                elif number == 53 or number == 54:
+                    self.coor = 1
+                elif number == 55:
+                    self.coor = 2
+                elif number == 90:
+                    self.absolute = True
+                elif number == 91:
+                    self.absolute = False
+            elif letter == 'm' and number in (2, 30):
+                self.planner.append({'type':'end', 'duration':0})
+        if 'f' in values:
+            self.feed = values['f']
+        if motion is None and any(axis in values for axis in 'xyz'):
+            motion = self.motionmode
+        if motion is None:
+            return
+        start = self.plannedPosition.copy()
+        target = start.copy()
+        offset = self.offsets.get(self.coor, np.zeros(3))
+        for i, axis in enumerate('xyz'):
+            if axis in values:
+                target[i] = offset[i] + values[axis] if self.absolute else start[i] + values[axis]
+        center = start[:2] + np.array([values.get('i', 0), values.get('j', 0)])
+        segment = {
+            'start':start[None, :], 'end':target[None, :], 'center':center[None, :],
+            'mode':np.array([motion]), 'feed':np.array([np.inf if motion == 0 else self.feed])
+        }
+        lengths, entry, exit, direction = me.segmentGeometry(segment)
+        if lengths[0] <= 0:
+            return
+        feedlimits = [self.parameters.get(axis+'fr', 1000) for axis in 'xyz']
+        jerklimits = [self.parameters.get(axis+'jm', 20)*1e6 for axis in 'xyz']
+        self.planner.append({
+            'type':'move', 'target':target, 'length':lengths[0], 'entry':entry[0], 'exit':exit[0],
+            'cruise':min(segment['feed'][0], me.axisLimit(direction, feedlimits)[0])/60,
+            'jerk':me.axisLimit(direction, jerklimits)[0]/60**3
+        })
+        self.plannedPosition = target
+
+
+    def _advance(self):
+        """
+        Executes planner blocks up to the current simulation time.
+        """
+        now = self._now()
+        if self.hold is not None:
+            return
+        while True:
+            if self.block is not None:
+                if now < self.block['end']:
+                    return
+                # block finished
+                if 'target' in self.block:
+                    self.machinePosition = self.block['target']
+                if self.block['type'] == 'end':
+                    self.programEnd = True
+                starttime = self.block['end']
+                self.block = None
+            else:
+                starttime = now
+            if len(self.planner) == 0:
+                if self.stat in (5, 9):
+                    self.stat = 4 if self.programEnd else 3
+                    if not self.programEnd:
+                        self.starvedSince = starttime
+                    self.programEnd = False
+                self.exitVelocity = 0.0
+                return
+            if self.starvedSince is not None:
+                # planner ran empty before the end of the program (real time)
+                self.starvedTime += (starttime - self.starvedSince)/self.timescale
+                self.starvedSince = None
+            self._startBlock(self.planner.popleft(), starttime)
+
+
+    def _startBlock(self, block, starttime):
+        """
+        Starts the execution of a planner block.
+
+        :param dict block: planner block
+        :param float starttime: simulation time the block starts at
+        """
+        duration = block.get('duration', 0)
+        if block['type'] == 'move':
+            v0 = self.exitVelocity
+            v1 = 0.0
+            following = self.planner[0] if len(self.planner) > 0 else None
+            if following is not None and following['type'] == 'move':
+                vj = me.junctionVelocities(
+                    np.array([block['exit'], following['exit']]),
+                    np.array([block['entry'], following['entry']]),
+                    np.array([block['cruise'], following['cruise']]),
+                    min(self.parameters.get(axis+'jd', 0.05) for axis in 'xyz'),
+                    self.parameters.get('ja', 50000)/60**2
+                )
+                v1 = vj[1]
+            duration = me.profileTimes(np.array([block['length']]), np.array([v0]), np.array([block['cruise']]),
+                                       np.array([v1]), np.array([block['jerk']]))[0]
+            self.exitVelocity = min(v1, block['cruise'])
+            block['velocity'] = block['length']/duration*60 if duration > 0 else 0
+        else:
+            self.exitVelocity = 0.0
+        block['origin'] = self.machinePosition.copy()
+        block['start'] = starttime
+        block['end'] = starttime + duration
+        self.block = block
+        self.stat = 9 if block['type'] == 'home' else 5
+
+
+    def _position(self, now):
+        """
+        :param float now: simulation time
+        :returns: machine position at the given time (interpolated linearly within the current block)
+        :rtype: np.ndarray(float)
+        """
+        block = self.block
+        if block is None or not 'target' in block:
+            return self.machinePosition.copy()
+        duration = block['end'] - block['start']
+        fraction = 1.0 if duration <= 0 else min(max((now - block['start'])/duration, 0), 1)
+        return block['origin'] + (block['target'] - block['origin'])*fraction
+
+
+    def _freeSlots(self):
+        """
+        :returns: number of free planner queue slots
+        :rtype: int
+        """
+        return self.plannerslots - len(self.planner) - (self.block is not None)
+
+
+    def _status(self, full=False):
+        """
+        :param bool full: return all configured fields instead of the changed ones
+        :returns: status report fields
+        :rtype: dict
+        """
+        now = self._now() if self.hold is None else self.hold
+        position = self._position(now) - self.offsets.get(self.coor, np.zeros(3))
+        values = {
+            'posx':round(position[0], 3), 'posy':round(position[1], 3), 'posz':round(position[2], 3), 'posa':0,
+            'vel':round(self.block.get('velocity', 0), 2) if self.block is not None and self.hold is None else 0,
+            'feed':self.feed, 'stat':self.stat, 'coor':self.coor, 'unit':1, 'dist':0 if self.absolute else 1,
+            'frmo':1, 'momo':self.motionmode
+        }
+        report = {field:values[field] for field in self.srFields if field in values}
+        if not full:
+            report = {field:value for field, value in report.items() if self.lastReport.get(field) != value}
+        self.lastReport.update(report)
+        return report
+
+
+    def _report(self):
+        """
+        Sends queue and (filtered) status reports.
+        """
+        if self.parameters['qv'] > 0:
+            free = self._freeSlots()
+            if free != self.lastQueueReport:
+                self.lastQueueReport = free
+                self._send({'qr':free})
+        if self.parameters['sv'] > 0:
+            now = time.perf_counter()
+            statChanged = self.lastReport.get('stat') != self.stat
+            if statChanged or (self.stat in (5, 9) and now >= self.nextReport):
+                self.nextReport = now + self.parameters['si']/1000
+                report = self._status()
+                if len(report) > 0:
+                    self._send({'sr':report})
+
+
+
+class TinyGSimulator(TinyG):
+    """
+    Simulated TinyG machine. Uses the :class:`TinyG` driver connected to a :class:`TinyGBoard` by an in-memory
+    pipe, so complete cycles can be run (dry run) and the spooling throughput can be measured without hardware.
+    """
+
+    def __init__(self):
+        """
+        Constructor
+        """
+        super().__init__()
+        self.board = None
+
+
+    def initialize(self, comparams, transport=None):
+        """
+        Starts the simulated board and initializes the TinyG communication.
+
+        :param pyqtgraph.GroupParameter comparams: GroupParameter containing the communication parameters
+        :param Base.Transports.Transport transport: ignored, the simulator always uses an in-memory pipe
+        """
+        hostend, boardend = Transports.PipeTransport.createPair()
+        parameters = {}
+        for group in self.getParameters().children():
+            parameters.update({param.name():param.value() for param in group.children()})
+        self.board = TinyGBoard(
+            boardend,
+            timescale=comparams.child('timescale').value(),
+            linebuffer=comparams.child('linebuffer').value(),
+            parameters=parameters
+        )
+        self.board.start()
+        logger.info("Simulated TinyG started (time scale %s).", self.board.timescale)
+        try:
+            super().initialize(comparams, hostend)
+        except Exception:
+            # TinyG.initialize finalizes on errors, which already stops the board
+            if self.board is not None:
+                self.board.stop()
+                self.board = None
+            raise
+
+
+    def finalize(self):
+        """
+        Finalizes the communication and stops the simulated board.
+        """
+        try:
+            super().finalize()
+        finally:
+            if self.board is not None:
+                self.board.stop()
+                self.board = None
+
+
+    @staticmethod
+    def getComParameters():
+        """
+        See :meth:´Base.MachineBase.MachineBase.getComParameters´
+        """
+        params = {
+            'name':'TinyGSimulatorComSettings', 'type':'group', 'children':[
+                {
+                    'name':'timescale',
+                    'title':'Time Scale',
+                    'type':'float',
+                    'limits':(0.01, 1000),
+                    'default':1,
+                    'value':1
+                },
+                {
+                    'name':'linebuffer',
+                    'title':'Simulated Linebuffer (lines)',
+                    'type':'int',
+                    'limits':(4, 8),
+                    'default':8,
+                    'value':8
+                }
+            ]
+        }
+        params = ptypes.GroupParameter(**params)
+        # use TinyG's protocol settings, the connection settings are not needed
+        for param in TinyG.getComParameters().children():
+            if param.name() in ('timeout', 'streaming', 'maxlines', 'maxchars', 'telemetry', 'telemetryfile'):
+                params.addChild(param.saveState())
+        return params
+
+
+    @staticmethod
+    def updateComParameters(params):
+        """
+        See :meth:´Base.MachineBase.MachineBase.updateComParameters´
+        """
+        pass
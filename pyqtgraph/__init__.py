@@ -279,8 +279,12 @@ from .colormap import *
 from .ptime import time
 from .Qt import isQObjectAlive
 
-# import custom controls
-from . import CustomWidgets
+# import custom controls on first use, they pull in the flowchart library
+def __getattr__(name):
+    if name == 'CustomWidgets':
+        from . import CustomWidgets
+        return CustomWidgets
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
 
 
 ##############################################################
@@ -154,7 +154,7 @@ class ControlWidget(QtWidgets.QWidget, Ui_ControlWidget):
     def settings_sigMachineChanged(self):
         machine = AppBase.getMachine()
         self.setEnabled(machine is not None and machine.isInitialized())
-        machine.sigNewCoordinates.connect(self.machine_sigNewCoordinates)
+        machine.status.subscribe(('absolute', 'workpiece'), self.machine_coordinatesChanged)
     
     @QtCore.pyqtSlot()
     def mainwindow_sigNewWorkpiece(self):
@@ -165,8 +165,7 @@ class ControlWidget(QtWidgets.QWidget, Ui_ControlWidget):
         self.updateCorrectionStatus(status['origin_corrected'], status['rotation_corrected'])
         
     
-    @QtCore.pyqtSlot(dict)
-    def machine_sigNewCoordinates(self, coords):
+    def machine_coordinatesChanged(self, coords):
         self.txtCurrentAbsoluteX.setText("{:.3f}".format(coords['absolute'][0]))
         self.txtCurrentAbsoluteY.setText("{:.3f}".format(coords['absolute'][1]))
         self.txtCurrentAbsoluteZ.setText("{:.3f}".format(coords['absolute'][2]))
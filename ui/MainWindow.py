@@ -14,6 +14,7 @@ import webbrowser
 from Base.AppBase import AppBase
 from Base.LogHandlers import QListWidgetLogger
 from Base.ImportFactory import ImportFactory
+import Base.Errors as errs
 import Base.Utility as utils
 from ui.SettingsDialog import SettingsDialog
 
@@ -67,6 +68,9 @@ class MainWindow(QtWidgets.QMainWindow, Ui_MainWindow):
         
         # connect signals
         self.mnuOpenEagleBrd.triggered.connect(self.mnuOpenEagleBrd_triggered)
+        self.mnuExportGCode.triggered.connect(self.mnuExportGCode_triggered)
+        self.mnuRunGCode.triggered.connect(self.mnuRunGCode_triggered)
+        self.mnuResumeCycle.triggered.connect(self.mnuResumeCycle_triggered)
         self.mnuQuit.triggered.connect(QtWidgets.QApplication.quit)
         self.mnuSettings.triggered.connect(self.mnuSettings_triggered)
         self.mnuInitMachine.triggered.connect(self.mnuInitMachine_triggered)
@@ -86,7 +90,8 @@ class MainWindow(QtWidgets.QMainWindow, Ui_MainWindow):
         
         self.btnStartCycle.clicked.connect(self.btnStartCycle_clicked)
         
-        settings.sigSettingsChanged.connect(self.settings_sigSettingsChanged)
+        settings.subscribe([('MachineBase', 'laser_offset_x'), ('MachineBase', 'laser_offset_y')],
+                           self.settings_laserOffsetChanged)
         settings.sigMachineChanged.connect(self.settings_sigMachineChanged)
         
         # restore settings 
@@ -137,6 +142,7 @@ class MainWindow(QtWidgets.QMainWindow, Ui_MainWindow):
     
     def closeEvent(self, event):
         AppBase.closeMachine()
+        AppBase.closeDispatcher()
         settings = AppBase.getSettings()
         settings.storeQtGeometry(self, "UI", "mainWindow_geometry")
         settings.storeQtState(self.splitterRight, "UI", "splitterRight_state")
@@ -161,12 +167,90 @@ class MainWindow(QtWidgets.QMainWindow, Ui_MainWindow):
                 QtWidgets.qApp.restoreOverrideCursor()
         
     
+    @QtCore.pyqtSlot()
+    def mnuExportGCode_triggered(self):
+        if AppBase.getWorkpiece() is None:
+            QtWidgets.QMessageBox.warning(self, "No workpiece", "Open a board file first.")
+            return
+        file = QtWidgets.QFileDialog.getSaveFileName(
+            self,
+            'Export G-code',
+            '',
+            'G-code file (*.nc *.gcode);;All files (*.*)'
+        )
+        if file[0] != '':
+            QtWidgets.qApp.setOverrideCursor(QtCore.Qt.WaitCursor)
+            try:
+                AppBase.getWorkpiece().planMachining(AppBase.getMachine())
+                AppBase.getMachine().exportProgram(file[0])
+            except errs.ImplementationMissing:
+                QtWidgets.QMessageBox.warning(self, "Not supported", "The machine does not support G-code export.")
+            finally:
+                QtWidgets.qApp.restoreOverrideCursor()
+                
+    @QtCore.pyqtSlot()
+    def mnuRunGCode_triggered(self):
+        if not AppBase.getMachine().isHomed():
+            QtWidgets.QMessageBox.warning(self, "Machine not homed", "The machine is not homed! Perform homing cycle first.")
+            return
+        file = QtWidgets.QFileDialog.getOpenFileName(
+            self,
+            'Run G-code file',
+            '',
+            'G-code file (*.nc *.gcode);;All files (*.*)'
+        )
+        if file[0] != '':
+            try:
+                AppBase.getMachine().loadProgram(file[0])
+            except errs.ImplementationMissing:
+                QtWidgets.QMessageBox.warning(self, "Not supported", "The machine does not support G-code files.")
+                return
+            self.lastLaserActive = self.laserActive
+            self.wdgControl.enableLaserCrosshair(False)
+            AppBase.getMachine().executeCycle()
+        
+    
+    @QtCore.pyqtSlot()
+    def mnuResumeCycle_triggered(self):
+        if AppBase.getWorkpiece() is None:
+            return
+        if not AppBase.getMachine().isHomed():
+            QtWidgets.QMessageBox.warning(self, "Machine not homed", "The machine is not homed! Perform homing cycle first.")
+            return
+        if not self.btnStartCycle.isEnabled():
+            QtWidgets.QMessageBox.warning(self, "Board origin not set", "Set the board origin before resuming the cycle.")
+            return
+        objects = AppBase.getWorkpiece().getMachiningObjects()
+        if len(objects) == 0:
+            return
+        # preselect the machining object the last cycle was interrupted at
+        start = 0
+        checkpoint = AppBase.loadCheckpoint()
+        if checkpoint is not None:
+            if checkpoint['count'] == len(objects) and checkpoint['index'] < len(objects):
+                start = checkpoint['index']
+            else:
+                logger.warning("Checkpoint (%s) does not match the current workpiece.", checkpoint['description'])
+        items = ["{}: {}".format(index+1, obj) for index, obj in enumerate(objects)]
+        item, ok = QtWidgets.QInputDialog.getItem(self, "Resume cycle", "Resume machining at:", items, start, False)
+        if not ok:
+            return
+        start = items.index(item)
+        logger.info("Resuming cycle at %s", item)
+        self.lastLaserActive = self.laserActive
+        AppBase.getWorkpiece().planMachining(AppBase.getMachine(), start)
+        self.wdgControl.enableLaserCrosshair(False)
+        AppBase.getMachine().executeCycle()
+    
+    
     @QtCore.pyqtSlot()
     def mnuSettings_triggered(self):
         dlg = SettingsDialog()
         AppBase.getSettings().restoreQtGeometry(dlg, "UI", "settingsDialog_geometry")
         if dlg.exec():
-            AppBase.getSettings().updateSettings(dlg.settings, dlg.settingsChanged)
+            dlg.commitChanges()
+        else:
+            dlg.revertChanges()
         if dlg.machineChanged:
             AppBase.changeMachine(dlg.machineName, signal=True)
         AppBase.getSettings().storeQtGeometry(dlg, "UI", "settingsDialog_geometry")
@@ -294,20 +378,23 @@ class MainWindow(QtWidgets.QMainWindow, Ui_MainWindow):
         self.btnStartCycle.setEnabled(False)
         AppBase.getMachine().sigStatusUpdate.connect(self.machine_sigStatusUpdate)
         AppBase.getMachine().sigCycleCompleted.connect(self.machine_sigCycleCompleted)
+        AppBase.getMachine().sigCheckpoint.connect(self.machine_sigCheckpoint)
         
-    @QtCore.pyqtSlot(list)
-    def settings_sigSettingsChanged(self, changed):
-        if 'MachineBase' in changed:
-            self.laserOffset = np.array([
-                AppBase.getSettings().value('MachineBase', 'laser_offset_x'),
-                AppBase.getSettings().value('MachineBase', 'laser_offset_y')
-            ])
+    def settings_laserOffsetChanged(self, changes):
+        self.laserOffset = np.array([
+            AppBase.getSettings().value('MachineBase', 'laser_offset_x'),
+            AppBase.getSettings().value('MachineBase', 'laser_offset_y')
+        ])
         
         
     @QtCore.pyqtSlot(str)
     def machine_sigStatusUpdate(self, status):
         self.statusbar.showMessage(status)
         
+    @QtCore.pyqtSlot(dict)
+    def machine_sigCheckpoint(self, checkpoint):
+        AppBase.saveCheckpoint(checkpoint)
+        
     @QtCore.pyqtSlot()
     def machine_sigCycleCompleted(self):
         self.wdgControl.enableLaserCrosshair(self.lastLaserActive)
\ No newline at end of file
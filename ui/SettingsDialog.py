@@ -16,6 +16,9 @@ from ui.templates.Ui_SettingsDialog import Ui_SettingsDialog
 class SettingsDialog(QtWidgets.QDialog, Ui_SettingsDialog):
     """
     Main settings dialog.
+
+    The parameters of the application settings are edited directly, the values at opening the dialog are kept
+    to commit (:meth:`commitChanges`) or revert (:meth:`revertChanges`) the changes as change set.
     """
     
     def __init__(self, parent=None):
@@ -23,7 +26,8 @@ class SettingsDialog(QtWidgets.QDialog, Ui_SettingsDialog):
         self.setupUi(self)
         self.setWindowFlags(QtCore.Qt.CustomizeWindowHint | QtCore.Qt.WindowTitleHint);
         
-        self.settings = AppBase.getSettings().copySettings()
+        self.settings = AppBase.getSettings()
+        self.originals = self.settings.values()
         self.paramsSoftwareSettings.addParameters(self.settings.child("General"))
         self.paramsSoftwareSettings.addParameters(self.settings.child("Optimizers"))
         
@@ -32,14 +36,14 @@ class SettingsDialog(QtWidgets.QDialog, Ui_SettingsDialog):
         self.btnApplyMachineParams.clicked.connect(self.btnApplyMachineParams_clicked)
         self.btnReadMachineParams.clicked.connect(self.btnReadMachineParams_clicked)
         
-        self.settings.sigTreeStateChanged.connect(self.params_changed)
+        self.settings.settings.sigTreeStateChanged.connect(self.params_changed)
         
         machine = AppBase.getMachine()
         self.machineName = ""
         if machine is not None:
             self.machineName = machine.getName()
         
-        self.comboMachine.addItems(AppBase.getSettings().machines.keys())
+        self.comboMachine.addItems(self.settings.machines.keys())
         self.comboMachine.setCurrentText(self.machineName)
         self.comboMachine.currentTextChanged.connect(self.comboMachine_textChanged)
         
@@ -49,6 +53,33 @@ class SettingsDialog(QtWidgets.QDialog, Ui_SettingsDialog):
         self.updateMachineParams()
         
     
+    def getChanges(self):
+        """
+        :returns: change set {path: value} of the settings changed in the dialog
+        :rtype: dict
+        """
+        return {path: value for path, value in self.settings.values().items() if self.originals.get(path) != value}
+    
+    
+    def commitChanges(self):
+        """
+        Notifies the subscribers of the changed settings.
+        """
+        self.settings.notifyChanges(self.getChanges())
+    
+    
+    def revertChanges(self):
+        """
+        Restores the settings changed in the dialog.
+        """
+        self.settings.applyChanges({path: self.originals[path] for path in self.getChanges()}, signal=False)
+        
+    
+    def done(self, result):
+        self.settings.settings.sigTreeStateChanged.disconnect(self.params_changed)
+        super().done(result)
+        
+    
     def updateMachineParams(self):
         if self.machineName != "" and self.machineName != "None":
             logger.debug("Updating machine params for machine %s", self.machineName)
@@ -94,13 +125,14 @@ class SettingsDialog(QtWidgets.QDialog, Ui_SettingsDialog):
     @QtCore.pyqtSlot()
     def btnReadMachineParams_clicked(self):
         params = AppBase.getMachine().retrieveParameters()
-        self.settings.child('MachineParams').restoreState(params.saveState())
+        self.settings.child('MachineParams', self.machineName).restoreState(params.saveState(), addChildren=False,
+                                                                            removeChildren=False)
         
     
     @QtCore.pyqtSlot(object, object)
     def params_changed(self, param, changes):
         for param, change, data in changes:
-            path = self.settings.childPath(param)
+            path = self.settings.settings.childPath(param)
             if path is not None:
                 if not path[0] in self.settingsChanged:
                     self.settingsChanged.append(path[0])
\ No newline at end of file
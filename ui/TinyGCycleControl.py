@@ -8,32 +8,41 @@ import logging
 logger = logging.getLogger(__name__)
 
 from PyQt5 import QtCore, QtWidgets
+import itertools
+from Algorithms.MotionEstimator import formatDuration
 from ui.templates.Ui_TinyGCycleControl import Ui_TinyGCycleControl
 
 class TinyGCycleControl(QtWidgets.QDialog, Ui_TinyGCycleControl):
     """
     Control dialog for TinyG displayed during running cycle.
     """
+    
+    # maximal number of program lines displayed in the command list
+    maxlistlines = 10000
 
-    def __init__(self, tinyg, plannerBuffer, parent=None):
+    def __init__(self, tinyg, plannerBuffer, estimate=None, parent=None):
         """
         Constructor
 
         :param tinyg: TinyG object
-        :param plannerBuffer: Cycle planner buffer to display on the dialog.
+        :param plannerBuffer: Cycle planner buffer (list or :class:`Base.GCode.ProgramFile`) to display on the dialog.
+        :param dict estimate: Cycle time estimate (see :meth:`Machines.TinyG.TinyG.estimateCycleTime`)
         """
         super().__init__(parent)
         self.setupUi(self)
+        self.setWindowTitle("{} Cycle Control".format(tinyg.getName()))
         self.setWindowFlags(QtCore.Qt.CustomizeWindowHint | QtCore.Qt.WindowTitleHint)
 
         self.initComplete = False
         self.finished = False
+        self.canceled = False
         self.machine = tinyg
-        self.plannerBuffer = plannerBuffer[:]
-        self.plansize = len(self.plannerBuffer)
+        self.plansize = len(plannerBuffer)
         
-        self.machine.sender.sigBufferChanged.connect(self.machine_outputBufferChanged)
-        self.machine.receiver.sigQueueReportReceived.connect(self.machine_queueReport)
+        # progress displays are updated at the publication rate of the status store,
+        # status reports are handled unthrottled to detect the end of the cycle
+        self.machine.status.subscribe(('usedlines', 'programlines'), self.machine_outputBufferChanged)
+        self.machine.status.subscribe(('qr',), self.machine_queueReport)
         self.machine.receiver.sigStatusReportReceived.connect(self.machine_statusReport)
         
         self.prgLinebuffer.setValue(0)
@@ -45,21 +54,27 @@ class TinyGCycleControl(QtWidgets.QDialog, Ui_TinyGCycleControl):
         
         # display cycle program in list
         self.lstCommandBuffer.clear()
-        for cmd in plannerBuffer:
+        for cmd in itertools.islice(plannerBuffer, self.maxlistlines):
             self.lstCommandBuffer.addItem(cmd)
+        if self.plansize > self.maxlistlines:
+            self.lstCommandBuffer.addItem("... ({} more commands)".format(self.plansize-self.maxlistlines))
             
         self.prgLinebuffer.setValue(0)
         self.lblPlannerQueue.setText("Linebuffer: {} / {}".format(0, 8))
         self.prgOutputBuffer.setValue(0)
         self.lblOutputBuffer.setText("Command {} / {}".format(0, self.plansize))
         self.prgPlannerQueue.setValue(0)
-        self.lblPlannerQueue.setText("Planner Queue: {} / {}".format(0, 32))
+        self.lblPlannerQueue.setText("Planner Queue: {} / {}".format(0, self.machine.plannerslots))
+        if estimate is not None:
+            self.setWindowTitle("{} (estimated time {})".format(self.windowTitle(), formatDuration(estimate['total'])))
         logger.debug("Dialog created.")
 
 
     def closeEvent(self, event):
         logger.debug("Closing dialog.")
         self.finished = True
+        self.machine.status.unsubscribe(self.machine_outputBufferChanged)
+        self.machine.status.unsubscribe(self.machine_queueReport)
         self.deleteLater()
         super().closeEvent(event)
 
@@ -79,21 +94,23 @@ class TinyGCycleControl(QtWidgets.QDialog, Ui_TinyGCycleControl):
         # if machine has never been in running state set initComplete anyways to correctly close this dialog
         logger.warning("Cycle canceled by user.")
         self.initComplete = True
+        self.canceled = True
         self.machine.stop()
         self.machine.setSpindle(False)
     
         
     @QtCore.pyqtSlot(dict)
     def machine_outputBufferChanged(self, bufferstatus):
-        self.prgLinebuffer.setValue(bufferstatus['usedlines']/0.08)
+        self.prgLinebuffer.setValue(int(bufferstatus['usedlines']/0.08))
         self.lblLinebuffer.setText("Linebuffer: {} / {}".format(bufferstatus['usedlines'], 8))
-        self.prgOutputBuffer.setValue((self.plansize-bufferstatus['sendbuffersize'])*100/self.plansize)
-        self.lblOutputBuffer.setText("Command {} / {}".format(self.plansize-bufferstatus['sendbuffersize'], self.plansize))
+        self.prgOutputBuffer.setValue(int(bufferstatus['programlines']*100/max(self.plansize, 1)))
+        self.lblOutputBuffer.setText("Command {} / {}".format(bufferstatus['programlines'], self.plansize))
         
     @QtCore.pyqtSlot(dict)
     def machine_queueReport(self, report):
-        self.prgPlannerQueue.setValue((32-report['qr'])/0.32)
-        self.lblPlannerQueue.setText("Planner Queue: {} / {}".format(32-report['qr'], 32))
+        slots = self.machine.plannerslots
+        self.prgPlannerQueue.setValue(int((slots-report['qr'])*100/slots))
+        self.lblPlannerQueue.setText("Planner Queue: {} / {}".format(slots-report['qr'], slots))
         
     @QtCore.pyqtSlot(dict)
     def machine_statusReport(self, report):
@@ -101,7 +118,9 @@ class TinyGCycleControl(QtWidgets.QDialog, Ui_TinyGCycleControl):
             return
         if 'stat' in report['sr'].keys():
             # close dialog if machine is not running (stat=5) or holding (stat=6)
-            if self.initComplete and not report['sr']['stat'] in (5, 6):
+            # and the program is sent completely (otherwise the planner ran empty while spooling)
+            if self.initComplete and not report['sr']['stat'] in (5, 6) and \
+                    (self.canceled or report['sr']['stat'] == 4 or self.machine.status.value('programlines', 0) >= self.plansize):
                 self.machine.sigCycleCompleted.emit()
                 logger.info("Cycle completed.")
                 self.close()
@@ -109,4 +128,4 @@ class TinyGCycleControl(QtWidgets.QDialog, Ui_TinyGCycleControl):
         if not self.initComplete:
             if self.machine.lastStatus['stat'] in (5, 6):
                 self.initComplete = True
-                logger.info("TinyG cycle init complete.")
\ No newline at end of file
+                logger.info("%s cycle init complete.", self.machine.getName())
\ No newline at end of file
@@ -22,12 +22,13 @@ class TinyGTestpanel(QtWidgets.QDialog, Ui_TinyGTestpanel):
         """
         super().__init__(parent)
         self.setupUi(self)
+        self.setWindowTitle("{} Testpanel".format(tinyg.getName()))
         self.machine = tinyg
         
         self.btnSend.clicked.connect(self.btnSend_clicked)
         self.btnQuery.clicked.connect(self.btnQuery_clicked)
         
-        self.machine.receiver.sigResponseReceived.connect(self.machine_responseReceived)
+        self.machine.receiver.sigResponsesReceived.connect(self.machine_responsesReceived)
         self.machine.receiver.sigStatusReportReceived.connect(self.machine_responseReceived)
         self.machine.receiver.sigQueueReportReceived.connect(self.machine_responseReceived)
         
@@ -76,4 +77,9 @@ class TinyGTestpanel(QtWidgets.QDialog, Ui_TinyGTestpanel):
     QtCore.pyqtSlot(dict)
     def machine_responseReceived(self, msg):
         entry = "<< " + str(msg)
-        self.lstMessages.addItem(QtWidgets.QListWidgetItem(entry))
\ No newline at end of file
+        self.lstMessages.addItem(QtWidgets.QListWidgetItem(entry))
+        
+    @QtCore.pyqtSlot(list)
+    def machine_responsesReceived(self, msgs):
+        for msg in msgs:
+            self.machine_responseReceived(msg)
\ No newline at end of file
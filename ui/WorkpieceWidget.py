@@ -151,7 +151,8 @@ class WorkpieceWidget(pg.PlotWidget):
         #AppBase.getMainwindow().sigNewWorkpiece.connect(self.mainwindow_sigNewWorkpiece)
         AppBase.getMainwindow().sigCorrectionChanged.connect(self.mainwindow_sigCorrectionChanged)
         AppBase.getSettings().sigMachineChanged.connect(self.settings_sigMachineChanged)
-        AppBase.getSettings().sigSettingsChanged.connect(self.settings_sigSettingsChanged)
+        AppBase.getSettings().subscribe([('MachineBase', 'laser_offset_x'), ('MachineBase', 'laser_offset_y')],
+                                        self.settings_laserOffsetChanged)
         AppBase.getMainwindow().sigLaserCrosshairChanged.connect(self.mainwindow_sigLaserCrosshairChanged)
     
         
@@ -168,8 +169,7 @@ class WorkpieceWidget(pg.PlotWidget):
         self.sigRef2ActionTriggered.emit(data)
         
     
-    @QtCore.pyqtSlot(dict)
-    def machine_sigNewCoordinates(self, coords):
+    def machine_coordinatesChanged(self, coords):
         self.machinePosROI.setPos(coords['workpiece'])
         self.laserPosROI.setPos(coords['workpiece'][0]-self.laserOffset[0], coords['workpiece'][1]-self.laserOffset[1])
                  
@@ -188,12 +188,10 @@ class WorkpieceWidget(pg.PlotWidget):
     def settings_sigMachineChanged(self):
         machine = AppBase.getMachine()
         if machine is not None:
-            machine.sigNewCoordinates.connect(self.machine_sigNewCoordinates)
+            machine.status.subscribe(('absolute', 'workpiece'), self.machine_coordinatesChanged)
             
             
-    @QtCore.pyqtSlot(list)
-    def settings_sigSettingsChanged(self, changed):
-        if 'MachineBase' in changed:
-            self.laserOffset = (AppBase.getSettings().value('MachineBase', 'laser_offset_x'),
-                                AppBase.getSettings().value('MachineBase', 'laser_offset_y'))
+    def settings_laserOffsetChanged(self, changes):
+        self.laserOffset = (AppBase.getSettings().value('MachineBase', 'laser_offset_x'),
+                            AppBase.getSettings().value('MachineBase', 'laser_offset_y'))
         self.refresh()
\ No newline at end of file
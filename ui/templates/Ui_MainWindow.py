@@ -104,6 +104,12 @@ class Ui_MainWindow(object):
         self.mnuSettings.setObjectName("mnuSettings")
         self.mnuOpenEagleBrd = QtWidgets.QAction(MainWindow)
         self.mnuOpenEagleBrd.setObjectName("mnuOpenEagleBrd")
+        self.mnuExportGCode = QtWidgets.QAction(MainWindow)
+        self.mnuExportGCode.setObjectName("mnuExportGCode")
+        self.mnuRunGCode = QtWidgets.QAction(MainWindow)
+        self.mnuRunGCode.setObjectName("mnuRunGCode")
+        self.mnuResumeCycle = QtWidgets.QAction(MainWindow)
+        self.mnuResumeCycle.setObjectName("mnuResumeCycle")
         self.mnuQuit = QtWidgets.QAction(MainWindow)
         self.mnuQuit.setObjectName("mnuQuit")
         self.mnuAboutQt = QtWidgets.QAction(MainWindow)
@@ -120,6 +126,10 @@ class Ui_MainWindow(object):
         self.mnuDocumentation.setObjectName("mnuDocumentation")
         self.menufile.addAction(self.mnuOpenEagleBrd)
         self.menufile.addSeparator()
+        self.menufile.addAction(self.mnuExportGCode)
+        self.menufile.addAction(self.mnuRunGCode)
+        self.menufile.addAction(self.mnuResumeCycle)
+        self.menufile.addSeparator()
         self.menufile.addAction(self.mnuQuit)
         self.menuTools.addAction(self.mnuInitMachine)
         self.menuTools.addAction(self.mnuApplyMachineParams)
@@ -151,6 +161,9 @@ class Ui_MainWindow(object):
         self.mnuAbout.setText(_translate("MainWindow", "About..."))
         self.mnuSettings.setText(_translate("MainWindow", "Settings..."))
         self.mnuOpenEagleBrd.setText(_translate("MainWindow", "Open Eagle Board..."))
+        self.mnuExportGCode.setText(_translate("MainWindow", "Export G-code..."))
+        self.mnuRunGCode.setText(_translate("MainWindow", "Run G-code file..."))
+        self.mnuResumeCycle.setText(_translate("MainWindow", "Resume Cycle..."))
         self.mnuQuit.setText(_translate("MainWindow", "Quit"))
         self.mnuAboutQt.setText(_translate("MainWindow", "About Qt..."))
         self.mnuInitMachine.setText(_translate("MainWindow", "(Re-)Initialize machine"))